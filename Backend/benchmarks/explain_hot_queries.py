@@ -0,0 +1,179 @@
+"""
+Router sorgularının EXPLAIN ANALYZE karşılaştırması (migration 001 öncesi / sonrası).
+
+Seed'lenmiş bir test veritabanında her sıcak router sorgusunu önce
+migration 001 index'leri olmadan, sonra index'lerle çalıştırır ve
+plan tipi + çalışma süresini yan yana yazdırır.
+
+⚠️ Index'leri silip yeniden oluşturduğu için SADECE test veritabanında çalıştırın.
+
+Kullanım (Backend klasöründen):
+    python -m benchmarks.explain_hot_queries --db postgresql://.../webtoon_bench --seed
+    python -m benchmarks.explain_hot_queries --db postgresql://.../webtoon_bench --scale 4 --seed
+"""
+import argparse
+import json
+import os
+
+from sqlalchemy import asc, create_engine, desc, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+
+def seed(engine, scale: int):
+    """generate_series ile tutarlı (unique kısıtlara uyan) sahte veri üretir."""
+    w, n = 500 * scale, 200 * scale
+    statements = [
+        "TRUNCATE likes, favorites, comments, episode_images, webtoon_episodes, novel_chapter_contents, novel_chapters, "
+        "webtoon_categories, webtoons, novels, users RESTART IDENTITY CASCADE",
+        f"""INSERT INTO users (username, email, password, role, created_at, is_active)
+            SELECT 'user' || g, 'user' || g || '@example.com', 'x', 'user', NOW() - g * INTERVAL '1 minute', TRUE
+            FROM generate_series(1, {100 * w}) g""",
+        f"""INSERT INTO webtoons (title, slug, summary, status, view_count, created_at, is_featured, is_published, type)
+            SELECT 'Webtoon ' || g, 'webtoon-' || g, 'Özet ' || g, 'ongoing', (random() * 100000)::int,
+                   NOW() - g * INTERVAL '1 hour', g % 50 = 0, g % 10 <> 0, 'MANGA'
+            FROM generate_series(1, {w}) g""",
+        f"""INSERT INTO webtoon_episodes (webtoon_id, title, episode_number, view_count, likes_count, is_published, created_at)
+            SELECT wid, 'Bölüm ' || e, e, 0, 0, e % 20 <> 0, NOW() - (wid * 100 + e) * INTERVAL '1 minute'
+            FROM generate_series(1, {w}) wid, generate_series(1, 100) e""",
+        """INSERT INTO episode_images (episode_id, image_url, page_order)
+           SELECT ep.id, 'static/images/' || ep.webtoon_id || '/' || ep.id || '/page_' || p || '.jpg', p
+           FROM webtoon_episodes ep, generate_series(1, 10) p""",
+        f"""INSERT INTO novels (title, slug, summary, status, created_at, is_featured, is_published, view_count)
+            SELECT 'Novel ' || g, 'novel-' || g, 'Özet ' || g, 'ongoing', NOW() - g * INTERVAL '1 hour',
+                   g % 50 = 0, g % 10 <> 0, (random() * 100000)::int
+            FROM generate_series(1, {n}) g""",
+        f"""INSERT INTO novel_chapters (novel_id, chapter_number, title, is_published, created_at, view_count)
+            SELECT nid, c, 'Chapter ' || c, c % 25 <> 0, NOW() - (nid * 500 + c) * INTERVAL '1 minute', 0
+            FROM generate_series(1, {n}) nid, generate_series(1, 500) c""",
+        """INSERT INTO novel_chapter_contents (chapter_id, content)
+           SELECT id, repeat('lorem ipsum ', 200) FROM novel_chapters""",
+        f"""INSERT INTO comments (user_id, webtoon_episode_id, content, created_at)
+            SELECT 1 + (g % {100 * w}), 1 + (g % {w * 100}), 'yorum ' || g, NOW() - g * INTERVAL '1 second'
+            FROM generate_series(1, {400 * w}) g""",
+        f"""INSERT INTO comments (user_id, novel_chapter_id, content, created_at)
+            SELECT 1 + (g % {100 * w}), 1 + (g % {n * 500}), 'yorum ' || g, NOW() - g * INTERVAL '1 second'
+            FROM generate_series(1, {400 * n}) g""",
+        f"""INSERT INTO favorites (user_id, webtoon_id, added_at)
+            SELECT u, 1 + (u * 7) % {w}, NOW() FROM generate_series(1, {100 * w}) u""",
+        f"""INSERT INTO favorites (user_id, novel_id, added_at)
+            SELECT u, 1 + (u * 11) % {n}, NOW() FROM generate_series(1, {100 * w}) u""",
+        f"""INSERT INTO likes (user_id, episode_id)
+            SELECT u, 1 + (u * 13) % {w * 100} FROM generate_series(1, {100 * w}) u""",
+    ]
+    with engine.begin() as conn:
+        for sql in statements:
+            conn.execute(text(sql))
+    print(f"🌱 Seed tamam: {w} webtoon, {w * 100} bölüm, {n} roman, {n * 500} roman bölümü")
+
+
+def hot_queries(db: Session, models):
+    """Router'lardaki sorguların birebir ORM karşılıkları."""
+    wid = db.query(models.Webtoon.id).filter(models.Webtoon.is_published == True).order_by(models.Webtoon.id.desc()).first()[0]
+    nid = db.query(models.Novel.id).filter(models.Novel.is_published == True).order_by(models.Novel.id.desc()).first()[0]
+    ep_id = db.query(models.WebtoonEpisode.id).filter(models.WebtoonEpisode.webtoon_id == wid).order_by(models.WebtoonEpisode.id.desc()).first()[0]
+    ch_id = db.query(models.NovelChapter.id).filter(models.NovelChapter.novel_id == nid).order_by(models.NovelChapter.id.desc()).first()[0]
+    user_id = db.query(models.User.id).order_by(models.User.id.desc()).first()[0]
+    username = db.query(models.User.username).filter(models.User.id == user_id).scalar()
+
+    E, C, I = models.WebtoonEpisode, models.NovelChapter, models.EpisodeImage
+    return [
+        ("webtoons: liste (newest)", db.query(models.Webtoon).filter(models.Webtoon.is_published == True)
+            .order_by(desc(models.Webtoon.created_at)).limit(20)),
+        ("novels: liste", db.query(models.Novel).filter(models.Novel.is_published == True)
+            .order_by(desc(models.Novel.created_at)).limit(100)),
+        ("novel_detay: bölüm listesi", db.query(C).filter(C.novel_id == nid, C.is_published == True)
+            .order_by(asc(C.chapter_number))),
+        ("novel_bolum_oku: numara ile", db.query(C).filter(C.novel_id == nid, C.chapter_number == 250).limit(1)),
+        ("novel_bolum_oku: önceki", db.query(C).filter(C.novel_id == nid, C.chapter_number < 250)
+            .order_by(desc(C.chapter_number)).limit(1)),
+        ("novel_bolum_oku: sonraki", db.query(C).filter(C.novel_id == nid, C.chapter_number > 250)
+            .order_by(asc(C.chapter_number)).limit(1)),
+        ("bolum_oku: sonraki", db.query(E).filter(E.webtoon_id == wid, E.episode_number > 50, E.is_published == True)
+            .order_by(E.episode_number.asc()).limit(1)),
+        ("bolum_oku: önceki", db.query(E).filter(E.webtoon_id == wid, E.episode_number < 50, E.is_published == True)
+            .order_by(E.episode_number.desc()).limit(1)),
+        ("bolum_oku: resimler", db.query(I).filter(I.episode_id == ep_id).order_by(I.page_order)),
+        ("episodes/ekle: numara kontrolü", db.query(E).filter(E.webtoon_id == wid, E.episode_number == 50).limit(1)),
+        ("comments: webtoon", db.query(models.Comment).filter(models.Comment.webtoon_episode_id == ep_id)
+            .order_by(desc(models.Comment.created_at))),
+        ("comments: novel", db.query(models.Comment).filter(models.Comment.novel_chapter_id == ch_id)
+            .order_by(desc(models.Comment.created_at))),
+        ("favorites: webtoon kontrol", db.query(models.Favorite).filter(
+            models.Favorite.user_id == user_id, models.Favorite.webtoon_id == wid).limit(1)),
+        ("favorites: novel kontrol", db.query(models.Favorite).filter(
+            models.Favorite.user_id == user_id, models.Favorite.novel_id == nid).limit(1)),
+        ("likes: kontrol", db.query(models.Like).filter(
+            models.Like.user_id == user_id, models.Like.episode_id == ep_id).limit(1)),
+        ("auth: username", db.query(models.User).filter(models.User.username == username).limit(1)),
+    ]
+
+
+def explain_all(engine, models) -> dict:
+    results = {}
+    with Session(engine) as db:
+        for name, query in hot_queries(db, models):
+            sql = str(query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+            raw = db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")).scalar()
+            plan = (raw if isinstance(raw, list) else json.loads(raw))[0]
+            results[name] = {
+                "ms": plan["Execution Time"],
+                "node": _scan_summary(plan["Plan"]),
+            }
+    return results
+
+
+def _scan_summary(node: dict) -> str:
+    """Plan ağacındaki tablo erişim tiplerini kısa metne çevirir."""
+    scans = []
+
+    def walk(n):
+        if "Relation Name" in n:
+            scans.append(f"{n['Node Type']}({n['Relation Name']})")
+        for child in n.get("Plans", []):
+            walk(child)
+
+    walk(node)
+    return ", ".join(scans) or node["Node Type"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=os.getenv("EXPLAIN_DB_CONNECTION"), help="TEST veritabanı bağlantısı")
+    parser.add_argument("--seed", action="store_true", help="Tabloları boşaltıp sahte veriyle doldur")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--json", help="Sonuçları bu dosyaya da yaz")
+    args = parser.parse_args()
+    if not args.db:
+        parser.error("--db veya EXPLAIN_DB_CONNECTION gerekli")
+
+    os.environ.setdefault("DB_CONNECTION", args.db)
+    import models
+    from migrations import m001_hot_path_indexes as m001
+
+    engine = create_engine(args.db)
+    models.Base.metadata.create_all(bind=engine)
+    if args.seed:
+        seed(engine, args.scale)
+
+    m001.downgrade(engine)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    before = explain_all(engine, models)
+
+    m001.upgrade(engine)
+    after = explain_all(engine, models)
+
+    print(f"\n{'sorgu':<32} | {'önce (ms)':>10} | {'sonra (ms)':>10} | plan (sonra)")
+    print("-" * 110)
+    for name in before:
+        b, a = before[name], after[name]
+        print(f"{name:<32} | {b['ms']:>10.2f} | {a['ms']:>10.2f} | {a['node']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"before": before, "after": after}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
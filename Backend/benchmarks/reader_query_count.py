@@ -0,0 +1,106 @@
+"""
+Okuyucu uç noktaları için istek başına SQL sorgu sayısı kontrolü.
+
+Geçici bir veritabanı seed'lenir, her okuyucu isteği TestClient ile
+iki kez atılır (soğuk / sıcak bölüm indeksi) ve engine üzerinden geçen her
+statement sayılır. `_304` durumları aynı isteği ETag ile koşullu atar. Bütçe sıcak istek için uygulanır. Bütçeyi aşan
+uç nokta olursa script 1 ile çıkar (CI'da regresyon kapısı olarak kullanılabilir).
+
+Kullanım (Backend klasöründen):
+    python -m benchmarks.reader_query_count
+    python -m benchmarks.reader_query_count --db postgresql://.../webtoon_bench
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+# Bölüm indeksi ısındıktan sonra istek başına izin verilen en fazla sorgu
+BUDGETS = {
+    "bolum_oku": 2,          # bölüm + webtoon, resimler (navigasyon indeksten)
+    "novel_bolum_oku": 1,    # bölüm + metin + roman (slug/numara çözümü indeksten)
+    "bolum_oku_304": 1,      # If-None-Match: sadece sürüm sorgusu, resimler okunmaz
+    "novel_bolum_oku_304": 1,  # If-None-Match: sadece sürüm sorgusu, metin okunmaz
+}
+
+
+def seed(db, models):
+    w = models.Webtoon(title="Sayaç Webtoon", slug="sayac-webtoon", summary="s", is_published=True, view_count=0)
+    n = models.Novel(title="Sayaç Roman", slug="sayac-roman", summary="s", is_published=True, view_count=0)
+    db.add_all([w, n])
+    db.flush()
+    episodes = []
+    for number in range(1, 6):
+        ep = models.WebtoonEpisode(webtoon_id=w.id, title=f"Bölüm {number}", episode_number=number,
+                                   is_published=True, view_count=0)
+        db.add(ep)
+        db.flush()
+        episodes.append(ep.id)
+        for page in range(1, 4):
+            db.add(models.EpisodeImage(episode_id=ep.id, image_url=f"static/sayac/{ep.id}/{page}.jpg", page_order=page))
+        db.add(models.NovelChapter(novel_id=n.id, chapter_number=number, title=f"Bölüm {number}",
+                                   content="lorem ipsum " * 50, is_published=True, view_count=0))
+    db.commit()
+    return episodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", help="TEST veritabanı (varsayılan: geçici SQLite)")
+    args = parser.parse_args()
+
+    db_url = args.db or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'reader_query_count.db')}"
+    os.environ["DB_CONNECTION"] = db_url
+    os.environ.setdefault("SECRET_KEY", "reader-query-count")
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    import main as app_module
+    import models
+    from database import SessionLocal, engine
+
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        episodes = seed(db, models)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a, **k: statements.append(a[2]))
+
+    cases = [
+        ("bolum_oku", f"/episodes/{episodes[0]}"),
+        ("bolum_oku", f"/episodes/{episodes[2]}"),
+        ("bolum_oku", f"/episodes/{episodes[-1]}"),
+        ("novel_bolum_oku", "/novels/sayac-roman/chapters/1"),
+        ("novel_bolum_oku", "/novels/sayac-roman/chapters/3"),
+        ("novel_bolum_oku", "/novels/sayac-roman/chapters/5"),
+        ("bolum_oku_304", f"/episodes/{episodes[2]}"),
+        ("novel_bolum_oku_304", "/novels/sayac-roman/chapters/3"),
+    ]
+
+    client = TestClient(app_module.app)
+    failed = False
+    print(f"{'uç nokta':<18} | {'istek':<36} | soğuk | sıcak / bütçe")
+    print("-" * 80)
+    for name, path in cases:
+        conditional = name.endswith("_304")
+        headers = {"If-None-Match": client.get(path).headers["etag"]} if conditional else {}
+        counts = []
+        for _ in range(2):
+            statements.clear()
+            response = client.get(path, headers=headers)
+            counts.append(len(statements))
+        cold, count = counts
+        ok = response.status_code == (304 if conditional else 200) and count <= BUDGETS[name]
+        failed |= not ok
+        print(f"{name:<18} | {path:<36} | {cold:>5} | {count} / {BUDGETS[name]} {'✅' if ok else '❌'}")
+        if not ok:
+            for sql in statements:
+                print(f"    {' '.join(sql.split())[:140]}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Arama önerisi (typeahead) index'i gecikme benchmark'ı.
+
+Sentetik Türkçe başlıklarla (varsayılan 10k) `SuggestIndex` kurulur ve
+1-8 karakterlik rastgele prefix'lerle (tek ve iki kelime) `suggest` çağrı
+başına gecikmesi ölçülür; tek seri güncellemesinin (`upsert`) maliyeti de
+yazdırılır. p99 hedefi (varsayılan 10 ms) aşılırsa script 1 ile çıkar.
+
+Kullanım (Backend klasöründen):
+    python -m benchmarks.suggest_latency
+    python -m benchmarks.suggest_latency --sizes 10000 50000 --calls 50000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+WORDS = [
+    "kılıç", "ustası", "şövalye", "gölge", "ejderha", "iblis", "kral", "kraliçe", "savaşçı",
+    "büyücü", "dönüş", "yükseliş", "çağ", "ölümsüz", "kızıl", "ay", "güneş", "yıldız", "ruh",
+    "avcı", "sonsuz", "kule", "zindan", "seviye", "tanrı", "imparator", "akademi", "prenses",
+    "intikam", "karanlık", "ışık", "fırtına", "orman", "deniz", "dağ", "şehir", "son", "ilk",
+    "solo", "leveling", "the", "legend", "of", "return", "hunter", "omniscient", "reader",
+]
+
+
+def make_titles(size: int, rng: random.Random) -> list:
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 5))) + f" {i}" for i in range(size)]
+
+
+def make_queries(titles: list, calls: int, rng: random.Random) -> list:
+    from utils.suggest import normalize
+
+    queries = []
+    for n in range(calls):
+        words = normalize(rng.choice(titles))
+        if n % 3 == 0 and len(words) > 1:
+            # İki kelime: ilki tam, ikincisi yarım ("kilic us")
+            queries.append(f"{words[0]} {words[1][:rng.randint(1, len(words[1]))]}")
+        else:
+            word = rng.choice(words)
+            queries.append(word[:rng.randint(1, min(8, len(word)))])
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000])
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=8)
+    parser.add_argument("--target-ms", type=float, default=10.0, help="p99 hedefi (ms)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # utils.suggest modelleri import eder; benchmark DB'ye hiç bağlanmaz
+    os.environ.setdefault("DB_CONNECTION", "sqlite://")
+    os.environ.setdefault("SECRET_KEY", "suggest-latency")
+    from utils.suggest import SuggestIndex
+
+    rng = random.Random(args.seed)
+    failed = False
+    print(f"{'başlık':>8} | {'kurma (ms)':>10} | {'ort (µs)':>9} | {'p50 (µs)':>9} | {'p95 (µs)':>9} | {'p99 (µs)':>9} | {'upsert p99 (µs)':>15}")
+    print("-" * 90)
+    for size in args.sizes:
+        titles = make_titles(size, rng)
+        docs = {
+            ("webtoon" if i % 2 else "novel", i): {
+                "id": i, "title": title, "slug": f"s-{i}", "cover_image": None, "view_count": rng.randrange(100_000),
+            }
+            for i, title in enumerate(titles)
+        }
+        index = SuggestIndex()
+        t0 = time.perf_counter()
+        index.build(docs)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        samples = []
+        for query in make_queries(titles, args.calls, rng):
+            t0 = time.perf_counter_ns()
+            index.suggest(query, args.limit)
+            samples.append(time.perf_counter_ns() - t0)
+        samples.sort()
+
+        updates = []
+        for n in range(min(1000, size)):
+            ref = rng.choice(list(docs)) if n == 0 or n % 100 else ("webtoon", size + n)
+            doc = {**docs.get(ref, {"id": ref[1], "slug": "yeni", "cover_image": None, "view_count": 0}), "title": rng.choice(titles)}
+            t0 = time.perf_counter_ns()
+            index.upsert(ref, doc)
+            updates.append(time.perf_counter_ns() - t0)
+        updates.sort()
+
+        p50 = samples[len(samples) // 2] / 1000
+        p95 = samples[int(len(samples) * 0.95)] / 1000
+        p99 = samples[int(len(samples) * 0.99)] / 1000
+        upsert_p99 = updates[int(len(updates) * 0.99)] / 1000
+        mark = "" if p99 <= args.target_ms * 1000 else "  ❌ hedef aşıldı"
+        failed = failed or bool(mark)
+        print(f"{size:>8,} | {build_ms:>10.1f} | {statistics.fmean(samples) / 1000:>9.1f} | {p50:>9.1f} | {p95:>9.1f} | {p99:>9.1f} | {upsert_p99:>15.1f}{mark}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
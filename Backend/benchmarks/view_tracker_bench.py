@@ -0,0 +1,81 @@
+"""
+ViewTracker mikro-benchmark'ı.
+
+Takip edilen (ip, içerik) çifti sayısı 10k'dan 5M'a çıkarken
+`should_count_view` çağrı başına gecikmesinin sabit kaldığını gösterir.
+
+Kullanım (Backend klasöründen):
+    python -m benchmarks.view_tracker_bench
+    python -m benchmarks.view_tracker_bench --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from utils.view_tracker import ViewTracker
+
+
+class FakeClock:
+    """Doldurma sırasında zamanı ilerletmek için elle kontrol edilen saat."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def fill(tracker: ViewTracker, clock: FakeClock, size: int, ttl: float):
+    # Kayıtları TTL'in ilk yarısına yay ki ölçüm sırasında hepsi hâlâ canlı olsun
+    step = (ttl / 2) / size
+    for i in range(size):
+        clock.now = i * step
+        tracker.should_count_view(f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}", "episode", i % 5000)
+
+
+def measure(tracker: ViewTracker, clock: FakeClock, size: int, ttl: float, calls: int) -> list:
+    samples = []
+    clock.now = ttl * 0.75
+    for n in range(calls):
+        # Yarısı mevcut kayıt (tekrar izleme), yarısı yeni ziyaretçi
+        i = random.randrange(size)
+        if n & 1:
+            ip = f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"
+            cid = i % 5000
+        else:
+            ip = f"172.16.{n >> 8 & 255}.{n & 255}"
+            cid = size + n
+        clock.now += 0.0001
+        t0 = time.perf_counter_ns()
+        tracker.should_count_view(ip, "episode", cid)
+        samples.append(time.perf_counter_ns() - t0)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--ttl", type=float, default=3600.0)
+    args = parser.parse_args()
+
+    print(f"{'takip edilen':>14} | {'ort (ns)':>9} | {'p50 (ns)':>9} | {'p99 (ns)':>9} | {'doldurma (s)':>12}")
+    print("-" * 66)
+    for size in args.sizes:
+        clock = FakeClock()
+        tracker = ViewTracker(ttl_seconds=args.ttl, clock=clock)
+
+        t0 = time.perf_counter()
+        fill(tracker, clock, size, args.ttl)
+        fill_time = time.perf_counter() - t0
+
+        samples = sorted(measure(tracker, clock, size, args.ttl, args.calls))
+        p50 = samples[len(samples) // 2]
+        p99 = samples[int(len(samples) * 0.99)]
+        print(f"{size:>14,} | {statistics.fmean(samples):>9.0f} | {p50:>9} | {p99:>9} | {fill_time:>12.1f}")
+        del tracker
+
+
+if __name__ == "__main__":
+    main()
@@ -1133,10 +1133,16 @@ GÖREV: Aşağıdaki metni Türkçeye çevir:
             
             with engine.connect() as conn:
                 result = conn.execute(
+                    # Bölüm metni novel_chapter_contents tablosunda tutuluyor
                     text("""
-                        INSERT INTO novel_chapters (novel_id, chapter_number, title, content, view_count, is_published, created_at)
-                        VALUES (:nid, :cnum, :title, :content, 0, TRUE, NOW())
-                        ON CONFLICT (novel_id, chapter_number) DO NOTHING
+                        WITH yeni AS (
+                            INSERT INTO novel_chapters (novel_id, chapter_number, title, view_count, is_published, created_at)
+                            VALUES (:nid, :cnum, :title, 0, TRUE, NOW())
+                            ON CONFLICT (novel_id, chapter_number) DO NOTHING
+                            RETURNING id
+                        )
+                        INSERT INTO novel_chapter_contents (chapter_id, content)
+                        SELECT id, :content FROM yeni
                     """),
                     {
                         "nid": novel['id'],
@@ -12,7 +12,6 @@ from starlette.datastructures import UploadFile
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext
 from database import engine, get_db
-import random
 import models
 import os
 import signals
@@ -22,7 +21,7 @@ import uuid
 import shutil
 
 # --- ROUTERLARI ÇAĞIR ---
-from routers import auth, webtoon, episode, comments, favorites, likes, novel, admin as admin_router
+from routers import auth, webtoon, episode, comments, favorites, likes, novel, discover, sitemap, admin as admin_router
 
 # 1. Tabloları oluştur
 models.Base.metadata.create_all(bind=engine)
@@ -38,7 +37,43 @@ with engine.connect() as _conn:
     except Exception:
         pass  # Kolon zaten varsa sessizce geç
 
+    # ETag / Last-Modified için içerik tablolarında updated_at (eski satırlarda NULL → created_at kullanılır)
+    for _table in ("webtoons", "webtoon_episodes", "novels", "novel_chapters"):
+        try:
+            _conn.execute(sql_text(f"ALTER TABLE {_table} ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP"))
+            _conn.commit()
+        except Exception:
+            _conn.rollback()
+
+# Bölüm metinleri novel_chapter_contents'ten okunur: eski kolonda taşınmamış metin
+# varsa açılmayı reddet (yoksa okuma sayfaları metinsiz döner)
+from migrations.m002_split_chapter_contents import is_pending as chapter_contents_pending
+if chapter_contents_pending(engine):
+    raise RuntimeError(
+        "novel_chapters.content taşınmamış metin içeriyor. Önce migration'ı çalıştırın: "
+        "python -m migrations.m002_split_chapter_contents"
+    )
+
+# 3. Arka plan işleri (view sayaçlarının toplu yazımı, trending sıralaması)
+from contextlib import asynccontextmanager
+from utils.view_counter import view_counter
+from utils.view_tracker import view_tracker
+from utils.trending import trending_ranker
+from utils.showcase import showcase
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    view_counter.start(engine)
+    trending_ranker.start(engine)
+    yield
+    trending_ranker.stop()
+    # Kapanışta bekleyen view artışlarını son kez yaz
+    view_counter.stop()
+    # Paylaşımlı dedupe durumunu snapshot'la (warm restart)
+    view_tracker.close()
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Kaos Manga API",
     root_path="/api",
     docs_url="/docs",
@@ -54,6 +89,10 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 if not SECRET_KEY:
     raise RuntimeError("SECRET_KEY environment değişkeni bulunamadı!")
 
+# Public GET yanıt önbelleği: en içte kalsın diye ilk eklenir (CORS header'ları saklanmaz)
+from utils.response_cache import ResponseCacheMiddleware, response_cache
+app.add_middleware(ResponseCacheMiddleware, cache=response_cache)
+
 app.add_middleware(SessionMiddleware, secret_key=SECRET_KEY)
 
 app.add_middleware(
@@ -70,6 +109,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # ==========================================
@@ -218,7 +258,23 @@ class NovelChapterAdmin(ModelView, model=models.NovelChapter):
     name_plural = "Roman Bölümleri"
     icon = "fa-solid fa-file-word"
     column_list = [models.NovelChapter.novel, models.NovelChapter.chapter_number, models.NovelChapter.title]
-    form_overrides = {"content": TextAreaField}
+    form_excluded_columns = [models.NovelChapter.body]
+
+    async def scaffold_form(self, rules=None):
+        # Bölüm metni ayrı tabloda (novel_chapter_contents); formda düz bir alan olarak göster
+        form = await super().scaffold_form(rules)
+
+        class NovelChapterForm(form):
+            content = TextAreaField("İçerik")
+
+        return NovelChapterForm
+
+    async def on_model_change(self, data, model, is_created, request):
+        # `content` kolon değil association_proxy: sqladmin'e bırakılırsa boş değerde
+        # kolonun nullable'ına bakmaya çalışıp düşer; metni burada kendimiz yazıyoruz
+        if "content" in data:
+            model.content = data.pop("content") or None
+        return await super().on_model_change(data, model, is_created, request)
 
 # ==========================================
 # 🚀 BAŞLATMA VE KONFİGÜRASYON
@@ -256,6 +312,8 @@ app.include_router(comments.router)
 app.include_router(favorites.router)
 app.include_router(likes.router)
 app.include_router(novel.router)
+app.include_router(discover.router)
+app.include_router(sitemap.router)
 app.include_router(admin_router.router)
 
 @app.get("/")
@@ -263,31 +321,15 @@ def ana_sayfa():
     return {"durum": "Sistem Hazır", "mesaj": "Webtoon & Novel API Hazır! 🚀"}
 
 @app.get("/vitrin")
-def get_vitrin(db: Session = Depends(get_db)):
+def get_vitrin():
+    # Liste bellekte hazır (değişiklikte yeniden hazırlanır); istek başına sadece karıştırma
     try:
-        featured_webtoons = db.query(models.Webtoon).filter(models.Webtoon.is_featured == True).all()
-        featured_novels = db.query(models.Novel).filter(models.Novel.is_featured == True).all()
-    except Exception:
+        return showcase.items()
+    except Exception as e:
+        # Ana sayfa vitrin hazırlanamadı diye hata vermesin
+        print(f"⚠️ Vitrin hazırlanamadı: {e}")
         return []
 
-    vitrin_listesi = []
-    for w in featured_webtoons:
-        vitrin_listesi.append({
-            "id": w.id, "title": w.title, "slug": w.slug,
-            "banner_image": w.banner_image, "cover_image": w.cover_image,
-            "summary": w.summary, "view_count": w.view_count,
-            "status": w.status, "type": "webtoon", "typeLabel": "WEBTOON", "bg_color": "blue"
-        })
-    for n in featured_novels:
-        vitrin_listesi.append({
-            "id": n.id, "title": n.title, "slug": n.slug,
-            "banner_image": n.cover_image, "cover_image": n.cover_image,
-            "summary": n.summary, "view_count": getattr(n, 'view_count', 0) or 0,
-            "status": n.status or "ongoing", "type": "novel", "typeLabel": "NOVEL", "bg_color": "purple"
-        })
-    random.shuffle(vitrin_listesi)
-    return vitrin_listesi
-
 @app.get("/fix_db")
 def fix_database_episodes(db: Session = Depends(get_db)):
     try:
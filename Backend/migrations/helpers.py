@@ -0,0 +1,63 @@
+"""
+Migration scriptleri için ortak yardımcılar.
+
+Migration'lar Backend klasöründen modül olarak çalıştırılır:
+    python -m migrations.m001_hot_path_indexes
+    python -m migrations.m001_hot_path_indexes --downgrade
+"""
+import argparse
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+
+def index_exists(conn: Connection, name: str) -> bool:
+    return conn.execute(
+        text("SELECT 1 FROM pg_indexes WHERE indexname = :n"), {"n": name}
+    ).first() is not None
+
+
+def create_index_concurrently(engine: Engine, name: str, ddl: str) -> bool:
+    """
+    Index'i tabloyu kilitlemeden (CONCURRENTLY) oluşturur.
+    Unique index mükerrer kayıt yüzünden oluşturulamazsa yarım kalan (INVALID)
+    index silinir ve hata yazdırılır; diğer index'ler yine de oluşturulur.
+
+    Args:
+        engine: Veritabanı motoru
+        name: Index adı
+        ddl: "CREATE [UNIQUE] INDEX CONCURRENTLY IF NOT EXISTS ..." ifadesi
+
+    Returns:
+        True: Index mevcut / oluşturuldu
+        False: Oluşturulamadı
+    """
+    # CONCURRENTLY transaction içinde çalışamaz
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        try:
+            conn.execute(text(ddl))
+            print(f"✅ {name}")
+            return True
+        except Exception as e:
+            print(f"❌ {name} oluşturulamadı: {str(e).splitlines()[0]}")
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+            return False
+
+
+def drop_index_concurrently(engine: Engine, name: str):
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        print(f"🗑️ {name}")
+
+
+def run(upgrade, downgrade, description: str):
+    """Migration modülünün komut satırı girişi."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--downgrade", action="store_true", help="Migration'ı geri al")
+    args = parser.parse_args()
+
+    from database import engine
+    if args.downgrade:
+        downgrade(engine)
+    else:
+        upgrade(engine)
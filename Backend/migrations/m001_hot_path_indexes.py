@@ -0,0 +1,67 @@
+"""
+001 - Sıcak sorgu yolları için composite index'ler ve unique kısıtlar.
+
+models.py içindeki __table_args__ tanımlarının mevcut veritabanına
+uygulanmış halidir (create_all sadece yeni tablolarda index oluşturur).
+Unique index'ler mükerrer kayıt varsa oluşturulamaz; bu durumda
+`duplicates` sorgusu ile kayıtlar temizlenip migration tekrar çalıştırılmalıdır.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently, run
+
+# (index adı, tablo, kolonlar, unique)
+INDEXES = [
+    ("uq_users_username", "users", ("username",), True),
+    ("ix_webtoons_published_created", "webtoons", ("is_published", "created_at"), False),
+    ("uq_webtoon_episodes_webtoon_number", "webtoon_episodes", ("webtoon_id", "episode_number"), True),
+    ("ix_webtoon_episodes_webtoon_pub_number", "webtoon_episodes", ("webtoon_id", "is_published", "episode_number"), False),
+    ("ix_episode_images_episode_order", "episode_images", ("episode_id", "page_order"), False),
+    ("ix_comments_episode_created", "comments", ("webtoon_episode_id", "created_at"), False),
+    ("ix_comments_chapter_created", "comments", ("novel_chapter_id", "created_at"), False),
+    ("uq_favorites_user_webtoon", "favorites", ("user_id", "webtoon_id"), True),
+    ("uq_favorites_user_novel", "favorites", ("user_id", "novel_id"), True),
+    ("uq_likes_user_episode", "likes", ("user_id", "episode_id"), True),
+    ("ix_novels_published_created", "novels", ("is_published", "created_at"), False),
+    ("uq_novel_chapters_novel_number", "novel_chapters", ("novel_id", "chapter_number"), True),
+    ("ix_novel_chapters_novel_pub_number", "novel_chapters", ("novel_id", "is_published", "chapter_number"), False),
+]
+
+
+def duplicates(engine: Engine, table: str, columns: tuple) -> int:
+    """Unique index'i engelleyen mükerrer grup sayısı."""
+    cols = ", ".join(columns)
+    not_null = " AND ".join(f"{c} IS NOT NULL" for c in columns)
+    with engine.connect() as conn:
+        return conn.execute(text(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM {table} WHERE {not_null} "
+            f"GROUP BY {cols} HAVING COUNT(*) > 1) d"
+        )).scalar()
+
+
+def upgrade(engine: Engine):
+    failed = []
+    for name, table, columns, unique in INDEXES:
+        ddl = (
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS "
+            f"{name} ON {table} ({', '.join(columns)})"
+        )
+        if not create_index_concurrently(engine, name, ddl):
+            failed.append((name, table, columns, unique))
+
+    for name, table, columns, unique in failed:
+        if unique:
+            print(f"⚠️ {name}: {table} tablosunda {duplicates(engine, table, columns)} mükerrer grup var")
+    with engine.begin() as conn:
+        for table in {t for _, t, _, _ in INDEXES}:
+            conn.execute(text(f"ANALYZE {table}"))
+
+
+def downgrade(engine: Engine):
+    for name, *_ in reversed(INDEXES):
+        drop_index_concurrently(engine, name)
+
+
+if __name__ == "__main__":
+    run(upgrade, downgrade, __doc__)
@@ -0,0 +1,111 @@
+"""
+002 - Roman bölüm metinlerini novel_chapter_contents tablosuna taşır.
+
+novel_chapters.content kolonundaki metinler, id aralıkları halinde
+(varsayılan 1000 satır) yeni tabloya kopyalanır; her batch ayrı commit
+edilir. Yarıda kesilirse tekrar çalıştırmak güvenlidir (ON CONFLICT DO NOTHING).
+Eski kolon sadece --drop-old verilirse ve tüm satırlar kopyalandıysa silinir.
+
+Kullanım (Backend klasöründen):
+    python -m migrations.m002_split_chapter_contents
+    python -m migrations.m002_split_chapter_contents --drop-old
+    python -m migrations.m002_split_chapter_contents --downgrade
+"""
+import argparse
+import time
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+
+def _has_old_column(engine: Engine) -> bool:
+    return any(c["name"] == "content" for c in inspect(engine).get_columns("novel_chapters"))
+
+
+def is_pending(engine: Engine) -> bool:
+    """
+    Eski kolonda henüz taşınmamış metin var mı? Uygulama açılışta bunu kontrol eder:
+    model metni sadece novel_chapter_contents'ten okuduğu için migration çalışmadan
+    açılırsa her okuma sayfası boş metinle kırılır.
+    """
+    if not _has_old_column(engine):
+        return False
+    with engine.connect() as conn:
+        return conn.execute(text("""
+            SELECT 1 FROM novel_chapters c
+            LEFT JOIN novel_chapter_contents b ON b.chapter_id = c.id
+            WHERE c.content IS NOT NULL AND b.chapter_id IS NULL
+            LIMIT 1
+        """)).first() is not None
+
+
+def upgrade(engine: Engine, batch_size: int = 1000, drop_old: bool = False):
+    import models
+    models.NovelChapterContent.__table__.create(bind=engine, checkfirst=True)
+
+    if not _has_old_column(engine):
+        print("✅ novel_chapters.content zaten yok, taşınacak veri kalmadı")
+        return
+
+    with engine.connect() as conn:
+        max_id = conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM novel_chapters")).scalar()
+
+    started = time.time()
+    moved = 0
+    last_id = 0
+    while last_id < max_id:
+        upper = last_id + batch_size
+        with engine.begin() as conn:
+            result = conn.execute(text("""
+                INSERT INTO novel_chapter_contents (chapter_id, content)
+                SELECT id, content FROM novel_chapters
+                WHERE id > :lo AND id <= :hi AND content IS NOT NULL
+                ON CONFLICT (chapter_id) DO NOTHING
+            """), {"lo": last_id, "hi": upper})
+            moved += result.rowcount or 0
+        last_id = upper
+        print(f"📦 {min(last_id, max_id)}/{max_id} id tarandı, {moved} metin taşındı "
+              f"({moved / max(time.time() - started, 1e-6):.0f} satır/sn)")
+
+    with engine.connect() as conn:
+        missing = conn.execute(text("""
+            SELECT COUNT(*) FROM novel_chapters c
+            LEFT JOIN novel_chapter_contents b ON b.chapter_id = c.id
+            WHERE c.content IS NOT NULL AND b.chapter_id IS NULL
+        """)).scalar()
+
+    if missing:
+        print(f"⚠️ {missing} bölümün metni taşınamadı, eski kolon bırakıldı")
+        return
+
+    if drop_old:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE novel_chapters DROP COLUMN content"))
+        print("🗑️ novel_chapters.content kolonu silindi")
+    else:
+        print("✅ Tüm metinler taşındı. Eski kolonu silmek için --drop-old ile tekrar çalıştırın")
+
+
+def downgrade(engine: Engine):
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE novel_chapters ADD COLUMN IF NOT EXISTS content TEXT"))
+        conn.execute(text("""
+            UPDATE novel_chapters c SET content = b.content
+            FROM novel_chapter_contents b
+            WHERE b.chapter_id = c.id AND c.content IS NULL
+        """))
+    print("↩️ Metinler novel_chapters.content kolonuna geri kopyalandı")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--downgrade", action="store_true")
+    parser.add_argument("--drop-old", action="store_true", help="Taşıma tamamlanınca eski kolonu sil")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    from database import engine
+    if args.downgrade:
+        downgrade(engine)
+    else:
+        upgrade(engine, batch_size=args.batch_size, drop_old=args.drop_old)
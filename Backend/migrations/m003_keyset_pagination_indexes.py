@@ -0,0 +1,38 @@
+"""
+003 - Keyset (cursor) sayfalama için (sıralama kolonu, id) index'leri.
+
+Liste uç noktaları artık OFFSET yerine `(kolon, id) < (:v, :id)` koşuluyla
+sayfalandığından, her sıralama modunun index'i id'yi de içerir.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently, run
+
+# (index adı, tablo, kolonlar)
+INDEXES = [
+    ("ix_webtoons_published_views_id", "webtoons", ("is_published", "view_count", "id")),
+    ("ix_webtoons_published_title_id", "webtoons", ("is_published", "title", "id")),
+    ("ix_webtoons_created_id", "webtoons", ("created_at", "id")),
+    ("ix_novels_created_id", "novels", ("created_at", "id")),
+    ("ix_users_created_id", "users", ("created_at", "id")),
+]
+
+
+def upgrade(engine: Engine):
+    for name, table, columns in INDEXES:
+        create_index_concurrently(
+            engine, name, f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        )
+    with engine.begin() as conn:
+        for table in {t for _, t, _ in INDEXES}:
+            conn.execute(text(f"ANALYZE {table}"))
+
+
+def downgrade(engine: Engine):
+    for name, *_ in reversed(INDEXES):
+        drop_index_concurrently(engine, name)
+
+
+if __name__ == "__main__":
+    run(upgrade, downgrade, __doc__)
@@ -0,0 +1,191 @@
+"""
+004 - Bot klasörlerindeki bölüm sayfalarını episode_images tablosuna taşır.
+
+Eski bot çalışmaları resimleri static/images/{slug}/bolum-{n}/ altına
+bırakıp episode_images satırı oluşturmamıştı; okuyucu bu bölümler için
+her istekte klasör taramasına (YÖNTEM B) düşüyor. Bu komut klasörleri
+slug (veya başlıktan üretilen eski slug) ve bölüm numarası ile
+webtoon_episodes satırlarına eşler ve sayfa satırlarını executemany ile
+toplu ekler. Seriler paralel işlenir.
+
+Tekrar çalıştırmak güvenlidir: zaten resmi olan bölümler atlanır ve bir
+bölümün tüm sayfaları aynı transaction'da eklenir (yarım bölüm kalmaz).
+Tamamlandıktan sonra READER_FOLDER_FALLBACK=0 ile klasör taraması kapatılabilir.
+Geri alma yoktur: eklenen satırlar yeni bot'un yazdığı satırlarla aynı biçimdedir.
+
+Kullanım (Backend klasöründen):
+    python -m migrations.m004_backfill_episode_images
+    python -m migrations.m004_backfill_episode_images --workers 8 --batch-size 5000
+    python -m migrations.m004_backfill_episode_images --dry-run
+"""
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Engine
+
+IMAGES_ROOT = "static/images"
+FOLDER_PREFIX = "bolum-"
+
+
+class Progress:
+    """Thread'ler arası ortak sayaç ve ilerleme çıktısı."""
+
+    def __init__(self, total_series: int):
+        self.total_series = total_series
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.series_done = 0
+        self.episodes = 0
+        self.rows = 0
+        self.skipped = 0
+        self.unmatched = []
+
+    def add(self, name: str, episodes: int, rows: int, skipped: int, unmatched: list):
+        with self._lock:
+            self.series_done += 1
+            self.episodes += episodes
+            self.rows += rows
+            self.skipped += skipped
+            self.unmatched.extend(unmatched)
+            elapsed = max(time.time() - self.started, 1e-6)
+            print(f"📦 [{self.series_done}/{self.total_series}] {name}: {episodes} bölüm, {rows} sayfa "
+                  f"| toplam {self.rows} sayfa ({self.rows / elapsed:.0f} satır/sn)")
+
+
+def series_folders(root: str) -> list:
+    try:
+        return sorted(e.name for e in os.scandir(root) if e.is_dir())
+    except FileNotFoundError:
+        return []
+
+
+def parse_number(folder_name: str):
+    if not folder_name.startswith(FOLDER_PREFIX):
+        return None
+    try:
+        return float(folder_name[len(FOLDER_PREFIX):])
+    except ValueError:
+        return None
+
+
+def backfill_series(engine: Engine, models, slug: str, webtoon_id: int, batch_size: int,
+                    dry_run: bool, progress: Progress):
+    from utils.image_manifest import IMAGE_EXTENSIONS, natural_sort_key
+
+    E, I = models.WebtoonEpisode, models.EpisodeImage
+    with engine.connect() as conn:
+        episodes = dict(conn.execute(select(E.episode_number, E.id).where(E.webtoon_id == webtoon_id)).all())
+        done = {row[0] for row in conn.execute(
+            select(I.episode_id).join(E, E.id == I.episode_id).where(E.webtoon_id == webtoon_id).distinct()
+        )}
+
+    series_path = os.path.join(IMAGES_ROOT, slug)
+    batch, episode_count, row_count, skipped, unmatched = [], 0, 0, 0, []
+
+    def flush():
+        nonlocal batch
+        if batch and not dry_run:
+            with engine.begin() as conn:
+                conn.execute(insert(I.__table__), batch)
+        batch = []
+
+    for folder in series_folders(series_path):
+        number = parse_number(folder)
+        episode_id = episodes.get(number) if number is not None else None
+        if episode_id is None:
+            unmatched.append(f"{slug}/{folder}")
+            continue
+        if episode_id in done:
+            skipped += 1
+            continue
+
+        files = [f for f in os.listdir(os.path.join(series_path, folder)) if f.endswith(IMAGE_EXTENSIONS)]
+        files.sort(key=natural_sort_key)
+        if not files:
+            continue
+
+        # Bölümün tüm sayfaları aynı batch'te kalır: yarıda kesilirse bölüm ya tam ya hiç eklenmiş olur
+        batch.extend(
+            {"episode_id": episode_id, "image_url": f"{IMAGES_ROOT}/{slug}/{folder}/{name}", "page_order": page}
+            for page, name in enumerate(files, start=1)
+        )
+        episode_count += 1
+        row_count += len(files)
+        if len(batch) >= batch_size:
+            flush()
+
+    flush()
+    progress.add(slug, episode_count, row_count, skipped, unmatched)
+
+
+def upgrade(engine: Engine, workers: int = 4, batch_size: int = 2000, dry_run: bool = False):
+    import models
+    from utils.image_manifest import _title_slug
+
+    with engine.connect() as conn:
+        webtoons = conn.execute(select(models.Webtoon.id, models.Webtoon.slug, models.Webtoon.title)).all()
+
+    # Klasör adı → webtoon: önce gerçek slug, yoksa başlıktan üretilen eski bot slug'ı
+    by_folder = {}
+    for webtoon_id, slug, title in webtoons:
+        if title:
+            by_folder.setdefault(_title_slug(title), webtoon_id)
+    for webtoon_id, slug, title in webtoons:
+        if slug:
+            by_folder[slug] = webtoon_id
+
+    # Bir webtoon'a iki klasör eşleşebilir (gerçek slug + eski başlık slug'ı). Her webtoon tek
+    # klasörle, tek worker'da işlenir: iki thread aynı bölümleri `done` kontrolünden önce
+    # görüp sayfaları iki kez eklemesin. Okuyucu gibi gerçek slug klasörü tercih edilir.
+    real_slug = {webtoon_id: slug for webtoon_id, slug, _ in webtoons}
+    folders = series_folders(IMAGES_ROOT)
+    chosen = {}
+    for name in folders:
+        webtoon_id = by_folder.get(name)
+        if webtoon_id is not None and (webtoon_id not in chosen or real_slug[webtoon_id] == name):
+            chosen[webtoon_id] = name
+    matched = [(name, webtoon_id) for webtoon_id, name in chosen.items()]
+    duplicates = [name for name in folders if name in by_folder and chosen[by_folder[name]] != name]
+    orphans = [name for name in folders if name not in by_folder]
+
+    print(f"🔎 {len(folders)} seri klasörü, {len(matched)} eşleşti, {len(orphans)} eşleşmedi"
+          f"{' (dry-run, yazma yok)' if dry_run else ''}")
+    progress = Progress(len(matched))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(backfill_series, engine, models, name, webtoon_id, batch_size, dry_run, progress): name
+            for name, webtoon_id in matched
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"❌ {futures[future]}: {e}")
+
+    elapsed = time.time() - progress.started
+    print(f"\n✅ {progress.episodes} bölüm, {progress.rows} sayfa eklendi, {progress.skipped} bölüm zaten vardı "
+          f"({elapsed:.1f} sn, {progress.rows / max(elapsed, 1e-6):.0f} satır/sn)")
+    for name in duplicates[:20]:
+        print(f"⚠️ Aynı webtoon'un ikinci klasörü atlandı: {name} (kullanılan: {chosen[by_folder[name]]})")
+    for name in orphans[:20]:
+        print(f"⚠️ Webtoon'u bulunamayan klasör: {name}")
+    for path in progress.unmatched[:20]:
+        print(f"⚠️ Bölümü bulunamayan klasör: {path}")
+    if not dry_run and not progress.unmatched and not orphans and not duplicates:
+        print("💡 Tüm klasörler eşlendi; READER_FOLDER_FALLBACK=0 ile klasör taraması kapatılabilir")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="Paralel işlenecek seri sayısı")
+    parser.add_argument("--batch-size", type=int, default=2000, help="Transaction başına yaklaşık satır")
+    parser.add_argument("--dry-run", action="store_true", help="Eşleşmeleri say, yazma")
+    args = parser.parse_args()
+
+    from database import engine
+    upgrade(engine, workers=args.workers, batch_size=args.batch_size, dry_run=args.dry_run)
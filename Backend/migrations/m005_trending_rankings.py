@@ -0,0 +1,47 @@
+"""
+005 - Trending sıralaması: saatlik görüntülenme kovaları ve roman popular index'i.
+
+view_counter her flush'ta artışları content_view_buckets tablosuna da
+(içerik, saat) bazında ekler; trending işi son pencereyi okuyup zamanla
+sönümlenen skorları hesaplar. Romanlara da sort_by=popular eklendiği için
+(is_published, view_count, id) index'i gerekir.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently, run
+
+INDEXES = [
+    ("ix_novels_published_views_id", "novels", ("is_published", "view_count", "id")),
+    ("ix_content_view_buckets_bucket", "content_view_buckets", ("bucket",)),
+]
+
+
+def upgrade(engine: Engine):
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS content_view_buckets (
+                content_type VARCHAR(20) NOT NULL,
+                content_id INTEGER NOT NULL,
+                bucket TIMESTAMP NOT NULL,
+                views INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (content_type, content_id, bucket)
+            )
+        """))
+    for name, table, columns in INDEXES:
+        create_index_concurrently(
+            engine, name, f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        )
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE novels"))
+
+
+def downgrade(engine: Engine):
+    for name, *_ in reversed(INDEXES):
+        drop_index_concurrently(engine, name)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS content_view_buckets"))
+
+
+if __name__ == "__main__":
+    run(upgrade, downgrade, __doc__)
@@ -0,0 +1,88 @@
+"""
+006 - Başlık/özet araması: Türkçe tam metin arama ve trigram index'leri.
+
+- pg_trgm ve unaccent eklentileri
+- immutable_unaccent(text): unaccent STABLE olduğu için index ifadelerinde
+  kullanılamaz; sözlüğü sabitleyen IMMUTABLE sarmalayıcı
+- turkish_unaccent: turkish config'in kopyası, kelimeler önce unaccent'ten
+  (ş→s, ğ→g, ı→i ...) sonra Türkçe kök bulucudan geçer
+- webtoons / novels.search_vector: title (ağırlık A) + summary (B),
+  GENERATED ALWAYS ... STORED (satır yazılınca DB günceller, uygulama kodu yok)
+- search_vector GIN + lower(immutable_unaccent(title)) gin_trgm_ops index'leri
+
+Not: STORED kolon eklemek tabloyu yeniden yazar (kısa süreli kilit). Seri
+tabloları küçük olduğundan kabul edilebilir; bölüm tablolarına dokunulmaz.
+Uygulama search_vector kolonunu başlangıçta kontrol eder; migration
+çalıştıktan sonra API yeniden başlatılmalıdır.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently, run
+
+TABLES = ("webtoons", "novels")
+
+SETUP = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    """
+    CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """,
+    """
+    DO $$ BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'turkish_unaccent') THEN
+            CREATE TEXT SEARCH CONFIGURATION turkish_unaccent (COPY = turkish);
+            ALTER TEXT SEARCH CONFIGURATION turkish_unaccent
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, turkish_stem;
+        END IF;
+    END $$
+    """,
+]
+
+VECTOR = (
+    "setweight(to_tsvector('turkish_unaccent'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('turkish_unaccent'::regconfig, coalesce(summary, '')), 'B')"
+)
+
+
+def upgrade(engine: Engine):
+    with engine.begin() as conn:
+        for statement in SETUP:
+            conn.execute(text(statement))
+        for table in TABLES:
+            conn.execute(text(
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                f"GENERATED ALWAYS AS ({VECTOR}) STORED"
+            ))
+            print(f"✅ {table}.search_vector")
+
+    for table in TABLES:
+        create_index_concurrently(
+            engine, f"ix_{table}_search_vector",
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)"
+        )
+        create_index_concurrently(
+            engine, f"ix_{table}_title_trgm",
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_title_trgm "
+            f"ON {table} USING gin (lower(immutable_unaccent(title)) gin_trgm_ops)"
+        )
+    with engine.begin() as conn:
+        for table in TABLES:
+            conn.execute(text(f"ANALYZE {table}"))
+
+
+def downgrade(engine: Engine):
+    for table in TABLES:
+        drop_index_concurrently(engine, f"ix_{table}_title_trgm")
+        drop_index_concurrently(engine, f"ix_{table}_search_vector")
+    with engine.begin() as conn:
+        for table in TABLES:
+            conn.execute(text(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector"))
+        conn.execute(text("DROP TEXT SEARCH CONFIGURATION IF EXISTS turkish_unaccent"))
+        conn.execute(text("DROP FUNCTION IF EXISTS immutable_unaccent(text)"))
+
+
+if __name__ == "__main__":
+    run(upgrade, downgrade, __doc__)
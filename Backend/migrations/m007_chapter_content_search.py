@@ -0,0 +1,176 @@
+"""
+007 - Roman bölüm metinlerinde tam metin arama.
+
+- novel_chapter_contents.search_vector: tsvector kolonu (turkish_unaccent).
+  m006'daki gibi GENERATED STORED değil: büyük tabloyu tek ALTER ile yeniden
+  yazmamak için kolon boş eklenir (sadece katalog değişikliği, anlık) ve
+  mevcut satırlar paralel batch'lerle doldurulur.
+- Trigger: INSERT / UPDATE OF content'te search_vector'ü hesaplar. Bot bölüm
+  metnini ham SQL ile eklediği için index uygulama kodu olmadan artımlı güncellenir.
+- ix_novel_chapter_contents_search_vector: GIN index (backfill'den sonra,
+  CONCURRENTLY; dolu tabloda tek seferde kurmak satır satır güncellemekten hızlıdır).
+
+turkish_unaccent config'i ve unaccent eklentisi m006'dan alınır (yoksa kurulur).
+
+Uygulama bölüm aramasında FTS'ye ancak GIN index varsa geçer (index sadece backfill
+hatasız bitince kurulur); karar başlangıçta önbelleğe alındığı için migration
+başarıyla bittikten sonra API yeniden başlatılmalıdır.
+
+Kullanım (Backend klasöründen):
+    python -m migrations.m007_chapter_content_search
+    python -m migrations.m007_chapter_content_search --workers 8 --batch-size 500
+    python -m migrations.m007_chapter_content_search --rebuild   # tüm vektörleri yeniden hesapla
+    python -m migrations.m007_chapter_content_search --downgrade
+"""
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently
+from migrations.m006_search_indexes import SETUP
+
+INDEX_NAME = "ix_novel_chapter_contents_search_vector"
+VECTOR = "to_tsvector('turkish_unaccent'::regconfig, coalesce({content}, ''))"
+
+TRIGGER = [
+    f"""
+    CREATE OR REPLACE FUNCTION novel_chapter_contents_search_vector() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.search_vector := {VECTOR.format(content="NEW.content")};
+        RETURN NEW;
+    END $$
+    """,
+    "DROP TRIGGER IF EXISTS trg_novel_chapter_contents_search_vector ON novel_chapter_contents",
+    """
+    CREATE TRIGGER trg_novel_chapter_contents_search_vector
+    BEFORE INSERT OR UPDATE OF content ON novel_chapter_contents
+    FOR EACH ROW EXECUTE FUNCTION novel_chapter_contents_search_vector()
+    """,
+]
+
+
+class Progress:
+    """Thread'ler arası ortak sayaç ve ilerleme çıktısı."""
+
+    def __init__(self, total_batches: int):
+        self.total_batches = total_batches
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.rows = 0
+
+    def add(self, rows: int):
+        with self._lock:
+            self.batches += 1
+            self.rows += rows
+            elapsed = max(time.time() - self.started, 1e-6)
+            print(f"📦 [{self.batches}/{self.total_batches}] +{rows} bölüm "
+                  f"| toplam {self.rows} ({self.rows / elapsed:.0f} bölüm/sn)")
+
+
+def index_batch(engine: Engine, start: int, end: int, rebuild: bool, progress: Progress):
+    """chapter_id ∈ [start, end) aralığını tek transaction'da indeksler."""
+    only_missing = "" if rebuild else " AND search_vector IS NULL"
+    with engine.begin() as conn:
+        result = conn.execute(text(
+            f"UPDATE novel_chapter_contents SET search_vector = {VECTOR.format(content='content')} "
+            f"WHERE chapter_id >= :start AND chapter_id < :end{only_missing}"
+        ), {"start": start, "end": end})
+    progress.add(result.rowcount)
+
+
+def backfill(engine: Engine, workers: int = 4, batch_size: int = 500, rebuild: bool = False) -> list:
+    """
+    Mevcut bölümleri chapter_id aralıklarına bölüp paralel indeksler.
+    Her aralık ayrı transaction: yarıda kesilirse tekrar çalıştırmak kalan satırlardan devam eder.
+
+    Returns:
+        Hata veren aralıkların başlangıç chapter_id'leri (boşsa hepsi indekslendi)
+    """
+    only_missing = "" if rebuild else " WHERE search_vector IS NULL"
+    with engine.connect() as conn:
+        low, high = conn.execute(text(
+            f"SELECT min(chapter_id), max(chapter_id) FROM novel_chapter_contents{only_missing}"
+        )).one()
+    if low is None:
+        print("✅ İndekslenecek bölüm yok")
+        return []
+
+    ranges = [(start, min(start + batch_size, high + 1)) for start in range(low, high + 1, batch_size)]
+    print(f"🔎 chapter_id {low}..{high}: {len(ranges)} batch, {workers} worker"
+          f"{' (tümü yeniden hesaplanıyor)' if rebuild else ''}")
+    progress = Progress(len(ranges))
+    failed = []
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(index_batch, engine, start, end, rebuild, progress): start for start, end in ranges}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                failed.append(futures[future])
+                print(f"❌ chapter_id {futures[future]}+: {e}")
+
+    elapsed = time.time() - progress.started
+    print(f"{'⚠️' if failed else '✅'} {progress.rows} bölüm indekslendi ({elapsed:.1f} sn, "
+          f"{progress.rows / max(elapsed, 1e-6):.0f} bölüm/sn)")
+    return sorted(failed)
+
+
+def upgrade(engine: Engine, workers: int = 4, batch_size: int = 500, rebuild: bool = False) -> bool:
+    """
+    Returns:
+        False: Bazı batch'ler indekslenemedi (index kurulmadı, tekrar çalıştırmak kalanlardan devam eder)
+    """
+    with engine.begin() as conn:
+        for statement in SETUP:
+            conn.execute(text(statement))
+        conn.execute(text("ALTER TABLE novel_chapter_contents ADD COLUMN IF NOT EXISTS search_vector tsvector"))
+        # Trigger backfill'den önce: bu sırada eklenen bölümler de vektörüyle yazılır
+        for statement in TRIGGER:
+            conn.execute(text(statement))
+        print("✅ novel_chapter_contents.search_vector + trigger")
+
+    failed = backfill(engine, workers, batch_size, rebuild)
+    if failed:
+        # Eksik vektörlü bölümler aramada sessizce kaybolmasın: index/ANALYZE yapılmaz
+        print(f"❌ {len(failed)} batch indekslenemedi (chapter_id {', '.join(f'{start}+' for start in failed[:10])}"
+              f"{' ...' if len(failed) > 10 else ''}). GIN index kurulmadı; hatayı giderip tekrar çalıştırın")
+        return False
+
+    create_index_concurrently(
+        engine, INDEX_NAME,
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} ON novel_chapter_contents USING gin (search_vector)"
+    )
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE novel_chapter_contents"))
+    return True
+
+
+def downgrade(engine: Engine):
+    drop_index_concurrently(engine, INDEX_NAME)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TRIGGER IF EXISTS trg_novel_chapter_contents_search_vector ON novel_chapter_contents"))
+        conn.execute(text("DROP FUNCTION IF EXISTS novel_chapter_contents_search_vector()"))
+        conn.execute(text("ALTER TABLE novel_chapter_contents DROP COLUMN IF EXISTS search_vector"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="Paralel çalışan batch sayısı")
+    parser.add_argument("--batch-size", type=int, default=500, help="Transaction başına chapter_id aralığı")
+    parser.add_argument("--rebuild", action="store_true", help="Dolu vektörleri de yeniden hesapla (config değişince)")
+    parser.add_argument("--downgrade", action="store_true", help="Migration'ı geri al")
+    args = parser.parse_args()
+
+    from database import engine
+    if args.downgrade:
+        downgrade(engine)
+    elif not upgrade(engine, workers=args.workers, batch_size=args.batch_size, rebuild=args.rebuild):
+        sys.exit(1)
@@ -0,0 +1,53 @@
+"""
+008 - Keşfet: kategori semi-join index'leri ve faset sayaç tablosu.
+
+- webtoon_categories (category_id, webtoon_id) ve (webtoon_id) index'leri:
+  /explore?category= filtresi index-only semi-join ile çalışır.
+- explore_facet_counts: yayındaki webtoon sayıları (kategori, tür, durum)
+  kırılımında. Uygulama commit sonrası ve periyodik olarak yeniden hesaplar;
+  migration ilk dolumu yapar.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently, run
+
+INDEXES = [
+    ("ix_webtoon_categories_category_webtoon", "webtoon_categories", ("category_id", "webtoon_id")),
+    ("ix_webtoon_categories_webtoon", "webtoon_categories", ("webtoon_id",)),
+]
+
+
+def upgrade(engine: Engine):
+    from utils.facets import facet_counter
+
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS explore_facet_counts (
+                category_id INTEGER NOT NULL,
+                type VARCHAR(10) NOT NULL,
+                status VARCHAR(30) NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (category_id, type, status)
+            )
+        """))
+    for name, table, columns in INDEXES:
+        create_index_concurrently(
+            engine, name, f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        )
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE webtoon_categories"))
+
+    rows = facet_counter.refresh(engine)
+    print(f"✅ explore_facet_counts: {rows} satır")
+
+
+def downgrade(engine: Engine):
+    for name, *_ in reversed(INDEXES):
+        drop_index_concurrently(engine, name)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS explore_facet_counts"))
+
+
+if __name__ == "__main__":
+    run(upgrade, downgrade, __doc__)
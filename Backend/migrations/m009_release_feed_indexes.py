@@ -0,0 +1,36 @@
+"""
+009 - Yeni çıkanlar akışı (/releases) index'leri.
+
+Her iki bölüm tablosu (is_published, created_at, id) sırasıyla geriye doğru
+taranır; keyset sayfalamada her sayfa index'te bir konumdan başlayan kısa
+bir aralıktır. Gruplanmış akışta pencere aralıkları ve max(created_at)
+atlamaları da aynı index'i kullanır.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently, run
+
+INDEXES = [
+    ("ix_webtoon_episodes_pub_created_id", "webtoon_episodes", ("is_published", "created_at", "id")),
+    ("ix_novel_chapters_pub_created_id", "novel_chapters", ("is_published", "created_at", "id")),
+]
+
+
+def upgrade(engine: Engine):
+    for name, table, columns in INDEXES:
+        create_index_concurrently(
+            engine, name, f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        )
+    with engine.begin() as conn:
+        for _, table, _ in INDEXES:
+            conn.execute(text(f"ANALYZE {table}"))
+
+
+def downgrade(engine: Engine):
+    for name, *_ in reversed(INDEXES):
+        drop_index_concurrently(engine, name)
+
+
+if __name__ == "__main__":
+    run(upgrade, downgrade, __doc__)
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Boolean, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Boolean, Float, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.associationproxy import association_proxy
 from database import Base
 import datetime
 import enum
@@ -12,6 +13,12 @@ class ContentType(str, enum.Enum):
 # 1. KULLANICILAR
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Giriş ve kayıt kontrolü username ile arar
+        Index("uq_users_username", "username", unique=True),
+        # Admin listesi keyset sayfalama: ORDER BY created_at DESC, id DESC
+        Index("ix_users_created_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(50), nullable=False)
@@ -55,6 +62,15 @@ class Category(Base):
 # 3. WEBTOONLAR
 class Webtoon(Base):
     __tablename__ = "webtoons"
+    __table_args__ = (
+        # Anasayfa listesi: is_published = TRUE ORDER BY created_at DESC
+        Index("ix_webtoons_published_created", "is_published", "created_at"),
+        # Keyset sayfalama: popular (view_count, id) ve alphabetical (title, id)
+        Index("ix_webtoons_published_views_id", "is_published", "view_count", "id"),
+        Index("ix_webtoons_published_title_id", "is_published", "title", "id"),
+        # Admin listesi (is_published filtresi olmadan)
+        Index("ix_webtoons_created_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(150), nullable=False)
@@ -63,6 +79,7 @@ class Webtoon(Base):
     status = Column(String(30), default="ongoing")
     view_count = Column(Integer, default=0)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     is_featured = Column(Boolean, default=False)
     is_published = Column(Boolean, default=False)
     banner_image = Column(String, nullable=True)
@@ -96,6 +113,12 @@ class Webtoon(Base):
 # 4. WEBTOON-KATEGORİ ARA TABLOSU
 class WebtoonCategory(Base):
     __tablename__ = "webtoon_categories"
+    __table_args__ = (
+        # Keşfet filtresi: category_id = ? → webtoon_id (index-only semi-join)
+        Index("ix_webtoon_categories_category_webtoon", "category_id", "webtoon_id"),
+        # Seri → kategorileri (detay sayfası, silme cascade'i)
+        Index("ix_webtoon_categories_webtoon", "webtoon_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True) 
     webtoon_id = Column(Integer, ForeignKey("webtoons.id"), nullable=False)
@@ -116,6 +139,13 @@ class WebtoonCategory(Base):
 # 5. BÖLÜMLER (WebtoonEpisode)
 class WebtoonEpisode(Base):
     __tablename__ = "webtoon_episodes" 
+    __table_args__ = (
+        Index("uq_webtoon_episodes_webtoon_number", "webtoon_id", "episode_number", unique=True),
+        # Okuyucu navigasyonu: webtoon_id = ? AND is_published AND episode_number > / < ?
+        Index("ix_webtoon_episodes_webtoon_pub_number", "webtoon_id", "is_published", "episode_number"),
+        # Yeni çıkanlar akışı: is_published ORDER BY created_at DESC, id DESC
+        Index("ix_webtoon_episodes_pub_created_id", "is_published", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     webtoon_id = Column(Integer, ForeignKey("webtoons.id"), nullable=False)
@@ -125,6 +155,7 @@ class WebtoonEpisode(Base):
     likes_count = Column(Integer, default=0)
     is_published = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     content_text = Column(Text, nullable=True)
 
     webtoon = relationship("Webtoon", back_populates="episodes")
@@ -139,6 +170,9 @@ class WebtoonEpisode(Base):
 # 6. BÖLÜM RESİMLERİ
 class EpisodeImage(Base):
     __tablename__ = "episode_images"
+    __table_args__ = (
+        Index("ix_episode_images_episode_order", "episode_id", "page_order"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     episode_id = Column(Integer, ForeignKey("webtoon_episodes.id"), nullable=False)
@@ -153,6 +187,10 @@ class EpisodeImage(Base):
 # 7. YORUMLAR
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_episode_created", "webtoon_episode_id", "created_at"),
+        Index("ix_comments_chapter_created", "novel_chapter_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -173,6 +211,11 @@ class Comment(Base):
 # 8. FAVORİLER
 class Favorite(Base):
     __tablename__ = "favorites"
+    __table_args__ = (
+        # NULL'lar birbirinden farklı sayıldığı için iki index birbirini engellemez
+        Index("uq_favorites_user_webtoon", "user_id", "webtoon_id", unique=True),
+        Index("uq_favorites_user_novel", "user_id", "novel_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True) 
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -192,6 +235,9 @@ class Favorite(Base):
 # 9. BEĞENİLER
 class Like(Base):
     __tablename__ = "likes"
+    __table_args__ = (
+        Index("uq_likes_user_episode", "user_id", "episode_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -206,6 +252,13 @@ class Like(Base):
 # 10. ROMANLAR
 class Novel(Base):
     __tablename__ = "novels"
+    __table_args__ = (
+        Index("ix_novels_published_created", "is_published", "created_at"),
+        # Admin listesi keyset sayfalama
+        Index("ix_novels_created_id", "created_at", "id"),
+        # sort_by=popular keyset sayfalama: (view_count, id)
+        Index("ix_novels_published_views_id", "is_published", "view_count", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), index=True)      
@@ -216,6 +269,7 @@ class Novel(Base):
     status = Column(String, default="ongoing") 
     source_url = Column(String(500), nullable=True) 
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     is_featured = Column(Boolean, default=False)
     is_published = Column(Boolean, default=False)
     view_count = Column(Integer, default=0)
@@ -228,13 +282,21 @@ class Novel(Base):
 
 class NovelChapter(Base):
     __tablename__ = "novel_chapters"
+    __table_args__ = (
+        # Bot'un ON CONFLICT (novel_id, chapter_number) ifadesi bu unique index'e dayanır
+        Index("uq_novel_chapters_novel_number", "novel_id", "chapter_number", unique=True),
+        # Detay sayfası bölüm listesi: novel_id = ? AND is_published ORDER BY chapter_number
+        Index("ix_novel_chapters_novel_pub_number", "novel_id", "is_published", "chapter_number"),
+        # Yeni çıkanlar akışı: is_published ORDER BY created_at DESC, id DESC
+        Index("ix_novel_chapters_pub_created_id", "is_published", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     chapter_number = Column(Float) # Float yaptım ki 1.5 gibi ara bölümler olabilsin
     title = Column(String)                  
-    content = Column(Text)                  
     is_published = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     
     # 👇 İŞTE EKSİK OLAN SÜTUN BUYDU!
     view_count = Column(Integer, default=0) 
@@ -245,5 +307,43 @@ class NovelChapter(Base):
     # Novel ile ilişkili yorumları bağladık (Eğer Comment modelin varsa)
     comments = relationship("Comment", back_populates="novel_chapter")
 
+    # Bölüm metni ayrı tabloda: listeler, navigasyon ve kartlar metni hiç yüklemez.
+    # `chapter.content` okunduğunda (sadece okuma sayfası) ayrıca yüklenir.
+    body = relationship("NovelChapterContent", uselist=False, back_populates="chapter", cascade="all, delete-orphan")
+    content = association_proxy("body", "content", creator=lambda content: NovelChapterContent(content=content))
+
     def __str__(self):
-        return f"{self.title} (Bölüm {self.chapter_number})"
\ No newline at end of file
+        return f"{self.title} (Bölüm {self.chapter_number})"
+
+# 11. ROMAN BÖLÜM METİNLERİ
+class NovelChapterContent(Base):
+    __tablename__ = "novel_chapter_contents"
+
+    chapter_id = Column(Integer, ForeignKey("novel_chapters.id", ondelete="CASCADE"), primary_key=True)
+    content = Column(Text)
+
+    chapter = relationship("NovelChapter", back_populates="body")
+
+# 12. SAATLİK GÖRÜNTÜLENME KOVALARI (Trending sıralaması için)
+class ContentViewBucket(Base):
+    __tablename__ = "content_view_buckets"
+    __table_args__ = (
+        # Sıralama işi pencere dışındaki kovaları bu index ile siler
+        Index("ix_content_view_buckets_bucket", "bucket"),
+    )
+
+    # view_counter'ın içerik tipi: "webtoon", "novel", "novel_chapter"
+    content_type = Column(String(20), primary_key=True)
+    content_id = Column(Integer, primary_key=True)
+    bucket = Column(DateTime, primary_key=True)  # saat başı (UTC)
+    views = Column(Integer, nullable=False, default=0)
+
+# 13. KEŞFET FASET SAYAÇLARI (Yayındaki webtoon'lar, utils.facets bakımını yapar)
+class ExploreFacetCount(Base):
+    __tablename__ = "explore_facet_counts"
+
+    # 0 = kategoriden bağımsız tüm katalog, diğerleri categories.id
+    category_id = Column(Integer, primary_key=True)
+    type = Column(String(10), primary_key=True)     # ContentType değeri
+    status = Column(String(30), primary_key=True)   # NULL status "ongoing" sayılır
+    count = Column(Integer, nullable=False, default=0)
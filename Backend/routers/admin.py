@@ -9,6 +9,8 @@ import uuid
 from typing import Optional, List
 import traceback
 from routers.auth import get_current_admin  # ADMIN AUTH
+from utils.pagination import paginate_keyset, estimated_count
+from utils.search import search_filter
 
 router = APIRouter(
     prefix="/admin",
@@ -22,6 +24,31 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(UPLOAD_DIR_BANNERS, exist_ok=True)
 
 
+def paginated_response(db: Session, query, sort_col, id_col, page: int, limit: int,
+                       cursor: Optional[str], exact_count: bool) -> dict:
+    """
+    Admin listeleri için ortak sayfalama.
+    cursor verilirse keyset (OFFSET'siz), verilmezse eski page/offset davranışı.
+    Toplam, exact_count istenmedikçe planner tahmininden gelir (COUNT(*) taraması yok).
+    """
+    total = query.order_by(None).count() if exact_count else estimated_count(db, query)
+    rows, next_cursor = paginate_keyset(
+        query, sort_col, id_col, "newest", True, cursor, limit, offset=(page - 1) * limit
+    )
+    return {
+        "status": "success",
+        "data": rows,
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "pages": (total + limit - 1) // limit,
+            "total_is_estimate": not exact_count,
+            "next_cursor": next_cursor,
+        }
+    }
+
+
 # ==================== WEBTOONS ====================
 
 @router.post("/webtoon/create")
@@ -101,6 +128,8 @@ async def list_webtoons(
     status: Optional[str] = Query(None),
     is_published: Optional[bool] = Query(None),
     is_featured: Optional[bool] = Query(None),
+    cursor: Optional[str] = Query(None),
+    exact_count: bool = Query(False),
     db: Session = Depends(get_db),
     current_admin: models.User = Depends(get_current_admin)  # AUTH
 ):
@@ -108,12 +137,8 @@ async def list_webtoons(
     query = db.query(models.Webtoon)
     
     if search:
-        query = query.filter(
-            or_(
-                models.Webtoon.title.ilike(f"%{search}%"),
-                models.Webtoon.summary.ilike(f"%{search}%")
-            )
-        )
+        # Public /search ile aynı index'ler (search_vector GIN + başlık trigram)
+        query = query.filter(search_filter(db, models.Webtoon, search))
     
     if status:
         query = query.filter(models.Webtoon.status == status)
@@ -122,21 +147,10 @@ async def list_webtoons(
     if is_featured is not None:
         query = query.filter(models.Webtoon.is_featured == is_featured)
     
-    total = query.count()
-    offset = (page - 1) * limit
-    webtoons = query.order_by(models.Webtoon.created_at.desc()).offset(offset).limit(limit).all()
+    result = paginated_response(db, query, models.Webtoon.created_at, models.Webtoon.id, page, limit, cursor, exact_count)
     
-    print(f"   ✅ Total found: {total}")
-    return {
-        "status": "success",
-        "data": webtoons,
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "pages": (total + limit - 1) // limit
-        }
-    }
+    print(f"   ✅ Total found: {result['pagination']['total']}")
+    return result
 
 
 @router.get("/webtoon/list")
@@ -249,18 +263,16 @@ async def list_novels(
     status: Optional[str] = Query(None),
     is_published: Optional[bool] = Query(None),
     is_featured: Optional[bool] = Query(None),
+    cursor: Optional[str] = Query(None),
+    exact_count: bool = Query(False),
     db: Session = Depends(get_db),
     current_admin: models.User = Depends(get_current_admin)  # AUTH
 ):
     query = db.query(models.Novel)
     
     if search:
-        query = query.filter(
-            or_(
-                models.Novel.title.ilike(f"%{search}%"),
-                models.Novel.summary.ilike(f"%{search}%")
-            )
-        )
+        # Public /search ile aynı index'ler (search_vector GIN + başlık trigram)
+        query = query.filter(search_filter(db, models.Novel, search))
     
     if status:
         query = query.filter(models.Novel.status == status)
@@ -269,15 +281,7 @@ async def list_novels(
     if is_featured is not None:
         query = query.filter(models.Novel.is_featured == is_featured)
     
-    total = query.count()
-    offset = (page - 1) * limit
-    novels = query.order_by(models.Novel.created_at.desc()).offset(offset).limit(limit).all()
-    
-    return {
-        "status": "success",
-        "data": novels,
-        "pagination": {"page": page, "limit": limit, "total": total, "pages": (total + limit - 1) // limit}
-    }
+    return paginated_response(db, query, models.Novel.created_at, models.Novel.id, page, limit, cursor, exact_count)
 
 
 @router.get("/novel/list")
@@ -519,6 +523,8 @@ async def list_users(
     search: Optional[str] = Query(None),
     role: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
+    cursor: Optional[str] = Query(None),
+    exact_count: bool = Query(False),
     db: Session = Depends(get_db),
     current_admin: models.User = Depends(get_current_admin)  # AUTH
 ):
@@ -537,15 +543,7 @@ async def list_users(
     if is_active is not None:
         query = query.filter(models.User.is_active == is_active)
     
-    total = query.count()
-    offset = (page - 1) * limit
-    users = query.order_by(models.User.created_at.desc()).offset(offset).limit(limit).all()
-    
-    return {
-        "status": "success",
-        "data": users,
-        "pagination": {"page": page, "limit": limit, "total": total, "pages": (total + limit - 1) // limit}
-    }
+    return paginated_response(db, query, models.User.created_at, models.User.id, page, limit, cursor, exact_count)
 
 
 @router.get("/users/{user_id}")
@@ -622,3 +620,36 @@ async def get_dashboard_stats(
         "total_comments": db.query(func.count(models.Comment.id)).scalar(),
     }
     return {"status": "success", "data": stats}
+
+
+@router.get("/stats/cache")
+def get_cache_stats(current_admin: models.User = Depends(get_current_admin)):
+    """Süreç içi önbellek ve yükleme birleştirme metrikleri (bu worker için)."""
+    from utils.chapter_index import chapter_index
+    from utils.facets import facet_counter
+    from utils.home_feed import home_feed
+    from utils.image_manifest import image_manifest
+    from utils.response_cache import response_cache
+    from utils.showcase import showcase
+    from utils.single_flight import single_flight
+    from utils.sitemap import sitemap_builder
+    from utils.suggest import suggest_index
+    from utils.trending import trending_ranker
+    from utils.view_counter import view_counter
+
+    return {
+        "status": "success",
+        "data": {
+            "response_cache": response_cache.get_stats(),
+            "chapter_index": chapter_index.get_stats(),
+            "image_manifest": image_manifest.get_stats(),
+            "suggest_index": suggest_index.get_stats(),
+            "explore_facets": facet_counter.get_stats(),
+            "showcase": showcase.get_stats(),
+            "home_feed": home_feed.get_stats(),
+            "sitemap": sitemap_builder.get_stats(),
+            "single_flight": single_flight.get_stats(),
+            "trending": trending_ranker.get_stats(),
+            "view_counter": view_counter.get_stats(),
+        },
+    }
@@ -0,0 +1,287 @@
+import os
+from typing import List
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from pydantic import TypeAdapter
+
+from database import get_db
+import models
+import schemas
+from routers.novel import get_novels_logic
+from routers.webtoon import WEBTOON_CARD_COLUMNS, WEBTOON_SORTS, get_webtoons_logic
+from utils.facets import DEFAULT_STATUS, DEFAULT_TYPE, facet_counter
+from utils.home_feed import Section, home_feed
+from utils.http_cache import CACHE_POLICIES
+from utils.pagination import paginate_keyset
+from utils.releases import RELEASE_SOURCES, grouped_release_page, release_page
+from utils.search import SEARCH_MODELS, search_backend, search_series
+from utils.showcase import showcase
+from utils.suggest import suggest_index
+from utils.trending import trending_page, trending_ranker
+
+router = APIRouter(
+    tags=["Discover (Keşfet)"]
+)
+
+# Karışık listelerde gösterilen kart kolonları (tür başına)
+DISCOVER_CARD_COLUMNS = {
+    "webtoon": (
+        models.Webtoon.id, models.Webtoon.title, models.Webtoon.slug, models.Webtoon.cover_image,
+        models.Webtoon.status, models.Webtoon.view_count, models.Webtoon.type,
+    ),
+    "novel": (
+        models.Novel.id, models.Novel.title, models.Novel.slug, models.Novel.cover_image,
+        models.Novel.status, models.Novel.view_count,
+    ),
+}
+SERIES_MODELS = {"webtoon": models.Webtoon, "novel": models.Novel}
+
+
+def load_cards(db: Session, refs: list) -> dict:
+    """
+    [(tür, id), ...] → {(tür, id): kart}. Tür başına tek `IN` sorgusu, sadece yayındakiler.
+    """
+    cards = {}
+    for kind, model in SERIES_MODELS.items():
+        ids = [series_id for k, series_id in refs if k == kind]
+        if not ids:
+            continue
+        rows = db.query(*DISCOVER_CARD_COLUMNS[kind])\
+                 .filter(model.id.in_(ids), model.is_published == True)\
+                 .all()
+        for row in rows:
+            # Webtoon'un kendi `type` kolonu (MANGA/NOVEL) ile karışmasın diye tür `content_type`
+            cards[(kind, row.id)] = {**row._asdict(), "content_type": kind, "view_count": row.view_count or 0}
+    return cards
+
+
+# ==========================================
+# 📈 TRENDING (Webtoon + Roman birlikte)
+# ==========================================
+@router.get("/trending")
+def trending(
+    response: Response,
+    db: Session = Depends(get_db),
+    type: str = Query("all", pattern="^(all|webtoon|novel)$"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str = None,
+):
+    """
+    Son görüntülenmelere göre (zamanla sönümlenen skor) sıralı seriler.
+    Sıralama arka planda hazırlanır; bir sayfa dizi dilimi + tür başına tek kart sorgusudur.
+    """
+    items, next_cursor = trending_page(type, cursor, limit)
+    cards = load_cards(db, [(kind, series_id) for kind, series_id, _ in items])
+
+    response.headers["Cache-Control"] = CACHE_POLICIES["list"]
+    return {
+        "items": [
+            {**cards[(kind, series_id)], "trending_score": score}
+            for kind, series_id, score in items if (kind, series_id) in cards
+        ],
+        "next_cursor": next_cursor,
+        "computed_at": trending_ranker.computed_at,
+    }
+
+
+# ==========================================
+# 🔎 ARAMA (Başlık + özet, Türkçe FTS + yazım hatası toleransı)
+# ==========================================
+@router.get("/search")
+def search(
+    response: Response,
+    db: Session = Depends(get_db),
+    q: str = Query(..., min_length=2, max_length=100),
+    type: str = Query("all", pattern="^(all|webtoon|novel)$"),
+    limit: int = Query(20, ge=1, le=50),
+    skip: int = Query(0, ge=0, le=500),
+):
+    """
+    Yayındaki webtoon ve romanlarda skora göre sıralı arama.
+    Her tür kendi index'inden ilk `skip + limit` sonucu verir, skorlar birleştirilip sayfalanır.
+    """
+    kinds = list(SEARCH_MODELS) if type == "all" else [type]
+    found = []
+    for kind in kinds:
+        for score, row in search_series(db, kind, q, DISCOVER_CARD_COLUMNS[kind], skip + limit + 1):
+            found.append((score, kind, row))
+    found.sort(key=lambda f: (-f[0], f[1], -f[2].id))
+
+    items = []
+    for score, kind, row in found[skip:skip + limit]:
+        card = row._asdict()
+        card.pop("rank", None)
+        items.append({**card, "content_type": kind, "view_count": row.view_count or 0, "score": round(score, 4)})
+
+    response.headers["Cache-Control"] = CACHE_POLICIES["list"]
+    return {"items": items, "has_more": len(found) > skip + limit, "backend": search_backend(db)}
+
+
+# ==========================================
+# ⌨️ ARAMA ÖNERİLERİ (Yazarken, bellekteki prefix index'ten)
+# ==========================================
+@router.get("/search/suggest")
+def search_suggest(
+    response: Response,
+    db: Session = Depends(get_db),
+    q: str = Query(..., min_length=1, max_length=100),
+    type: str = Query("all", pattern="^(all|webtoon|novel)$"),
+    limit: int = Query(8, ge=1, le=20),
+):
+    """
+    Başlık önerileri: "kil us" → "Kılıç Ustası". Kelimeler slug_olustur ile katlanır,
+    her kelime başlıktaki bir kelimenin başı olmalı. DB'ye sadece index kurulurken gidilir.
+    """
+    suggest_index.ensure(db)
+    items = suggest_index.suggest(q, limit, None if type == "all" else type)
+
+    response.headers["Cache-Control"] = CACHE_POLICIES["list"]
+    return {"items": [
+        {"content_type": item["content_type"], "id": item["id"], "title": item["title"],
+         "slug": item["slug"], "cover_image": item["cover_image"]}
+        for item in items
+    ]}
+
+
+# ==========================================
+# 🧭 KEŞFET (Kategori / durum / tür filtreleri + faset sayıları)
+# ==========================================
+@router.get("/explore")
+def explore(
+    response: Response,
+    db: Session = Depends(get_db),
+    category: int = Query(None, ge=1),
+    status: str = Query(None, max_length=30),
+    type: str = Query(None, pattern="^(MANGA|NOVEL)$"),
+    sort_by: str = Query("newest", pattern="^(newest|alphabetical|popular)$"),
+    limit: int = Query(24, ge=1, le=100),
+    skip: int = 0,
+    cursor: str = None,
+):
+    """
+    Yayındaki webtoon'ları filtreler, sayfayı faset sayılarıyla birlikte döner.
+    Sayılar explore_facet_counts sayaç tablosundan gelir; her faset kendi filtresi hariç
+    diğer filtrelere göredir. Kategori filtresi (category_id, webtoon_id) index'i üzerinden semi-join'dir.
+    """
+    W, WC = models.Webtoon, models.WebtoonCategory
+    query = db.query(*WEBTOON_CARD_COLUMNS).filter(W.is_published == True)
+    if category is not None:
+        query = query.filter(W.id.in_(select(WC.webtoon_id).where(WC.category_id == category)))
+    if status is not None:
+        # Sayaçlarda NULL durum "ongoing" sayılır, filtre de aynı kümeyi seçsin
+        query = query.filter(or_(W.status == status, W.status.is_(None)) if status == DEFAULT_STATUS else W.status == status)
+    if type is not None:
+        # NULL tür de sayaçlarda "MANGA" sayılır
+        type_filter = W.type == models.ContentType(type)
+        query = query.filter(or_(type_filter, W.type.is_(None)) if type == DEFAULT_TYPE else type_filter)
+
+    sort_col, descending = WEBTOON_SORTS[sort_by]
+    rows, next_cursor = paginate_keyset(query, sort_col, W.id, sort_by, descending, cursor, limit, offset=skip)
+
+    facet_counter.ensure()
+    facets = facet_counter.facets(db, category, type, status)
+
+    response.headers["Cache-Control"] = CACHE_POLICIES["list"]
+    return {
+        "items": [
+            {**row._asdict(), "status": row.status or DEFAULT_STATUS, "type": row.type or DEFAULT_TYPE,
+             "view_count": row.view_count or 0}
+            for row in rows
+        ],
+        "next_cursor": next_cursor,
+        "total": facets.pop("total"),
+        "facets": facets,
+    }
+
+
+# ==========================================
+# 🏠 ANASAYFA (Vitrin + yeni webtoon'lar + yeni romanlar + trending, tek istekte)
+# ==========================================
+# Bölüm boyutları ayrı uç noktaların varsayılanlarıyla aynı (/webtoons/, /novels/)
+HOME_LIMITS = {"webtoons": 20, "novels": 100, "trending": 10}
+
+
+def _home_trending(db: Session) -> list:
+    items, _ = trending_page("all", None, HOME_LIMITS["trending"])
+    cards = load_cards(db, [(kind, series_id) for kind, series_id, _ in items])
+    return [
+        {**cards[(kind, series_id)], "trending_score": score}
+        for kind, series_id, score in items if (kind, series_id) in cards
+    ]
+
+
+# /webtoons/ ve /novels/'un response_model'leri: anasayfa kartları aynı şemayla serileştirilir
+HOME_CARD_SCHEMAS = {
+    "webtoons": TypeAdapter(List[schemas.WebtoonCard]),
+    "novels": TypeAdapter(List[schemas.NovelCard]),
+}
+
+
+def _home_cards(name: str, items: list) -> list:
+    """response_model'in yaptığı doğrulama + alan süzme (ham dict'teki fazladan alanlar sızmaz)."""
+    adapter = HOME_CARD_SCHEMAS[name]
+    return adapter.dump_python(adapter.validate_python(items, from_attributes=True), mode="json")
+
+
+HOME_SECTIONS = [
+    # Vitrin zaten bellekte hazır; her istekte yeniden karıştırılsın diye bölüm önbelleği yok
+    Section("showcase", lambda db: showcase.items(), ttl=0, needs_db=False),
+    Section("webtoons", lambda db: _home_cards("webtoons", get_webtoons_logic(db, HOME_LIMITS["webtoons"])),
+            ttl=float(os.getenv("HOME_TTL_WEBTOONS", "30")), groups=("webtoon",)),
+    Section("novels", lambda db: _home_cards("novels", get_novels_logic(db, HOME_LIMITS["novels"], 0)),
+            ttl=float(os.getenv("HOME_TTL_NOVELS", "30")), groups=("novel",)),
+    Section("trending", _home_trending,
+            ttl=float(os.getenv("HOME_TTL_TRENDING", "120")), groups=("webtoon", "novel")),
+]
+
+
+@router.get("/home")
+def home(request: Request):
+    """
+    Anasayfanın tüm bölümleri tek yanıtta: {"showcase": [...], "webtoons": [...], "novels": [...], "trending": [...]}.
+    Bölümler paralel ve kendi TTL'leriyle önbellekten yüklenir; süreler Server-Timing header'ında.
+    Hata veren bölüm null döner.
+    """
+    body, timings = home_feed.assemble(HOME_SECTIONS)
+    body, encoding, duration = home_feed.compress(body, request.headers.get("accept-encoding"))
+
+    headers = {"Cache-Control": CACHE_POLICIES["list"], "Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        timings.append(f"gzip;dur={duration * 1000:.2f}")
+    headers["Server-Timing"] = ", ".join(timings)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+# ==========================================
+# 🆕 YENİ ÇIKANLAR (Webtoon bölümleri + roman bölümleri birlikte)
+# ==========================================
+@router.get("/releases")
+def releases(
+    response: Response,
+    db: Session = Depends(get_db),
+    type: str = Query("all", pattern="^(all|webtoon|novel)$"),
+    group: str = Query("none", pattern="^(none|series)$"),
+    limit: int = Query(30, ge=1, le=100),
+    cursor: str = None,
+):
+    """
+    Yayındaki serilerin yeni bölümleri, en yeni önce. `group=series` aynı serinin aynı gün
+    (RELEASES_GROUP_HOURS) içindeki bölümlerini tek kayıtta toplar. Sayfalama `next_cursor` ile.
+    """
+    kinds = list(RELEASE_SOURCES) if type == "all" else [type]
+    page = grouped_release_page if group == "series" else release_page
+    items, next_cursor = page(db, kinds, cursor, limit)
+
+    cards = load_cards(db, {(item["content_type"], item["series_id"]) for item in items})
+    response.headers["Cache-Control"] = CACHE_POLICIES["list"]
+    return {
+        "items": [
+            {**item, "series": cards[(item["content_type"], item["series_id"])]}
+            for item in items if (item["content_type"], item["series_id"]) in cards
+        ],
+        "next_cursor": next_cursor,
+    }
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func
 from typing import List
 import shutil
 import os
@@ -10,12 +11,11 @@ import models
 import schemas
 from database import get_db
 from routers.auth import get_current_admin
+from utils.chapter_index import chapter_index
+from utils.http_cache import has_conditions, is_not_modified, last_modified_of, make_etag, not_modified, validator_headers
+from utils.single_flight import single_flight, render_json
 
-
-# --- YARDIMCI: DOĞAL SIRALAMA (1, 2, 10 SORUNU İÇİN) ---
-import re
-def natural_sort_key(s):
-    return [int(text) if text.isdigit() else text.lower() for text in re.split('([0-9]+)', s)]
+from utils.image_manifest import image_manifest, natural_sort_key, FOLDER_FALLBACK
 
 router = APIRouter(
     prefix="/episodes", 
@@ -110,55 +110,75 @@ def create_episode(
     }
 
 
+def episode_validators(db: Session, webtoon_id: int, episode_id: int, episode_number: float,
+                       episode_modified, webtoon_modified):
+    """Okuma sayfası (ETag, Last-Modified): bölüm + webtoon sürümü ve navigasyon komşuları."""
+    prev_ep, next_ep = chapter_index.series(db, "webtoon", webtoon_id).neighbours(episode_number)
+    etag = make_etag("episode", episode_id, episode_modified, webtoon_modified, prev_ep, next_ep)
+    return etag, last_modified_of(episode_modified, webtoon_modified)
+
+
 # ==========================================
 # 📖 2. BÖLÜM OKUMA (HİBRİT SİSTEM: BOT + DB)
 # ==========================================
 @router.get("/{episode_id}")
 def bolum_oku(episode_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
-    
-    # 1. Bölümü Bul
-    bolum = db.query(models.WebtoonEpisode).filter(models.WebtoonEpisode.id == episode_id, models.WebtoonEpisode.is_published == True).first()
-    
-    if not bolum:
-        raise HTTPException(status_code=404, detail="Bölüm bulunamadı")
-    
-    
-    # 🔥 YENİ SİSTEM: IP Tabanlı View Count Rate Limiting
     from utils.view_tracker import view_tracker
     
+    # 0. Koşullu istek: sürüm bilgisi tek küçük sorguyla, sayfa listesi yüklenmeden 304
+    if has_conditions(request):
+        version = db.query(
+                    models.WebtoonEpisode.webtoon_id,
+                    models.WebtoonEpisode.episode_number,
+                    func.coalesce(models.WebtoonEpisode.updated_at, models.WebtoonEpisode.created_at),
+                    func.coalesce(models.Webtoon.updated_at, models.Webtoon.created_at),
+                  )\
+                  .join(models.Webtoon, models.Webtoon.id == models.WebtoonEpisode.webtoon_id)\
+                  .filter(models.WebtoonEpisode.id == episode_id, models.WebtoonEpisode.is_published == True)\
+                  .first()
+        if version:
+            etag, modified = episode_validators(db, version[0], episode_id, *version[1:])
+            if is_not_modified(request, etag, modified):
+                view_tracker.record_view(request.client.host, "episode", episode_id, parent=("webtoon", version[0]))
+                return not_modified(etag, modified, "reader")
+
+    # 1-2. Bölüm yüklemesi: aynı bölüm için eşzamanlı istekler tek yüklemeyi bekler
+    base_url = str(request.base_url)
+    body, etag, modified, webtoon_id = single_flight.do(
+        ("episode", episode_id, base_url), lambda: load_episode(db, episode_id, base_url)
+    )
+
+    # 🔥 YENİ SİSTEM: IP Tabanlı View Count Rate Limiting
     client_ip = request.client.host
     
-    # Episode view count (bölüm bazında)
-    if view_tracker.should_count_view(client_ip, "episode", episode_id):
-        # İlk kez izleniyor veya 1 saat geçmiş
-        if bolum.view_count is None:
-            bolum.view_count = 0
-        bolum.view_count += 1
-        
-        # Webtoon view count da artır (bölüm okunduğunda seri de sayılır)
-        if bolum.webtoon:
-            if bolum.webtoon.view_count is None:
-                bolum.webtoon.view_count = 0
-            bolum.webtoon.view_count += 1
-        
-        db.commit()
+    # Episode view count (bölüm bazında, write-behind)
+    # Webtoon view count da artır (bölüm okunduğunda seri de sayılır)
+    view_tracker.record_view(client_ip, "episode", episode_id, parent=("webtoon", webtoon_id))
     # ----------------------------------------------------
 
+    return Response(body, media_type="application/json", headers=validator_headers(etag, modified, "reader"))
 
-    # 3. Navigasyon (Önceki/Sonraki Bölüm)
-    sonraki_bolum = db.query(models.WebtoonEpisode).filter(
-        models.WebtoonEpisode.webtoon_id == bolum.webtoon_id,
-        models.WebtoonEpisode.episode_number > bolum.episode_number,
-        models.WebtoonEpisode.is_published == True
-    ).order_by(models.WebtoonEpisode.episode_number.asc()).first()
 
-    onceki_bolum = db.query(models.WebtoonEpisode).filter(
-        models.WebtoonEpisode.webtoon_id == bolum.webtoon_id,
-        models.WebtoonEpisode.episode_number < bolum.episode_number,
-        models.WebtoonEpisode.is_published == True
-    ).order_by(models.WebtoonEpisode.episode_number.desc()).first()
+def load_episode(db: Session, episode_id: int, base_url: str):
+    """
+    Okuma sayfası yanıtı (single-flight lideri çalıştırır).
 
-    # 4. Resim Listesi Oluşturma (Aynı mantık devam ediyor...)
+    Returns:
+        (JSON gövdesi, ETag, Last-Modified, webtoon_id)
+    """
+    # 1. Bölüm + webtoon tek sorguda
+    bolum = db.query(models.WebtoonEpisode)\
+              .options(joinedload(models.WebtoonEpisode.webtoon))\
+              .filter(models.WebtoonEpisode.id == episode_id, models.WebtoonEpisode.is_published == True)\
+              .first()
+    
+    if not bolum:
+        raise HTTPException(status_code=404, detail="Bölüm bulunamadı")
+    
+    # Önceki/Sonraki: süreç içi bölüm indeksinden (sorgu yok)
+    onceki_bolum, sonraki_bolum = chapter_index.series(db, "webtoon", bolum.webtoon_id).neighbours(bolum.episode_number)
+
+    # 2. Resim Listesi Oluşturma (ikinci ve son sorgu)
     image_urls = []
     
     # YÖNTEM A: Veritabanı
@@ -169,48 +189,34 @@ def bolum_oku(episode_id: int, request: Request, response: Response, db: Session
 
     if db_images:
         for img in db_images:
-            full_url = str(request.base_url) + img.image_url
+            full_url = base_url + img.image_url
             image_urls.append(full_url)
     
-    # YÖNTEM B: Klasör (Bot)
-    if not image_urls and bolum.webtoon:
-        slug = bolum.webtoon.slug
-        bot_base_path = f"static/images/{slug}"
-        if not slug or not os.path.exists(bot_base_path):
-            import re
-            text_slug = bolum.webtoon.title.lower()
-            text_slug = text_slug.replace("ı", "i").replace("ğ", "g").replace("ü", "u").replace("ş", "s").replace("ö", "o").replace("ç", "c")
-            text_slug = re.sub(r'[^a-z0-9\s-]', '', text_slug)
-            slug = re.sub(r'[\s-]+', '-', text_slug).strip('-')
-
-        chap_num = str(int(bolum.episode_number)) if bolum.episode_number % 1 == 0 else str(bolum.episode_number)
-        bot_folder_path = f"static/images/{slug}/bolum-{chap_num}"
-        
-        if os.path.exists(bot_folder_path):
-            files = os.listdir(bot_folder_path)
-            try:
-                files.sort(key=natural_sort_key)
-            except:
-                files.sort()
-
-            for file in files:
-                if file.endswith((".webp", ".jpg", ".png", ".jpeg")):
-                    url = f"{str(request.base_url)}static/images/{slug}/bolum-{chap_num}/{file}"
-                    image_urls.append(url)
+    # YÖNTEM B: Klasör (Bot) — sayfa listesi manifest önbelleğinden (sıcak bölümde disk erişimi yok)
+    if not image_urls and bolum.webtoon and FOLDER_FALLBACK:
+        folder, files = image_manifest.episode_images(bolum.webtoon.slug, bolum.webtoon.title, bolum.episode_number)
+        for file in files:
+            image_urls.append(f"{base_url}{folder}/{file}")
+
+    etag, modified = episode_validators(
+        db, bolum.webtoon_id, bolum.id, bolum.episode_number, bolum.updated_at or bolum.created_at,
+        (bolum.webtoon.updated_at or bolum.webtoon.created_at) if bolum.webtoon else None,
+    )
 
-    return {
+    # Gövde bir kez serileştirilir, bekleyen istekler aynı byte'ları döner
+    body = render_json({
         "id": bolum.id,
         "webtoon_id": bolum.webtoon_id,
         "webtoon_title": bolum.webtoon.title if bolum.webtoon else "Bilinmiyor",
         "webtoon_slug": bolum.webtoon.slug if bolum.webtoon else "",
-        "webtoon_cover": f"{request.base_url}{bolum.webtoon.cover_image}" if bolum.webtoon and bolum.webtoon.cover_image else None,
+        "webtoon_cover": f"{base_url}{bolum.webtoon.cover_image}" if bolum.webtoon and bolum.webtoon.cover_image else None,
         "title": bolum.title,
         "episode_number": bolum.episode_number,
         "created_at": bolum.created_at,
         "view_count": bolum.view_count,
         "content_text": bolum.content_text,
         "images": image_urls,
-        "next_episode_id": sonraki_bolum.id if sonraki_bolum else None,
-        "prev_episode_id": onceki_bolum.id if onceki_bolum else None
-    }
-
+        "next_episode_id": sonraki_bolum[1] if sonraki_bolum else None,
+        "prev_episode_id": onceki_bolum[1] if onceki_bolum else None
+    })
+    return body, etag, modified, bolum.webtoon_id
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, status, Request, Response
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, status, Request, Response, Query
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, inspect as sa_inspect
 from typing import List
 import shutil
 import os
@@ -11,6 +11,13 @@ from database import get_db
 import models 
 import schemas
 from routers.auth import get_current_user 
+from utils.queries import latest_per_series, count_per_series
+from utils.chapter_index import chapter_index, chapter_page, edge_chapters, series_validators, DETAIL_EDGE
+from utils.http_cache import CACHE_POLICIES, has_conditions, is_not_modified, last_modified_of, make_etag, not_modified, set_validators, validator_headers
+from utils.single_flight import single_flight, render_json
+from utils.pagination import paginate_keyset
+from utils.search import search_chapters
+from utils.trending import trending_rows
 
 router = APIRouter(
     prefix="/novels",
@@ -26,68 +33,163 @@ def check_editor_permission(user: models.User):
         )
 
 # --- YARDIMCI FONSİYONLAR ---
-def get_novels_logic(db: Session, limit: int, skip: int):
-    # O P T I M İ Z A S Y O N EKLENDİ (N+1 Sorunu Çözümü)
-    from sqlalchemy.orm import selectinload
+# Kartta gösterilen kolonlar (summary gibi büyük alanlar yüklenmez)
+NOVEL_CARD_COLUMNS = (
+    models.Novel.id, models.Novel.title, models.Novel.slug, models.Novel.cover_image,
+    models.Novel.status, models.Novel.view_count, models.Novel.source_url,
+    models.Novel.is_published, models.Novel.created_at,
+)
+CHAPTER_CARD_COLUMNS = (
+    models.NovelChapter.id, models.NovelChapter.chapter_number, models.NovelChapter.title,
+    models.NovelChapter.is_published, models.NovelChapter.created_at,
+)
 
-    query = db.query(models.Novel).filter(models.Novel.is_published == True).options(selectinload(models.Novel.chapters))
-    novels = query.order_by(desc(models.Novel.created_at)).offset(skip).limit(limit).all()
-    
-    # 🚀 Frontend Performans Yaması:
-    for n in novels:
-        # Bölümleri numaraya göre tersten (büyükten küçüğe) sırala ve ilk 3'ü al
-        # ⚠️ CRITICAL SİGORTA: `chapter_number` None ise -1 kabul et
-        try:
-            n.chapters.sort(key=lambda x: (float(x.chapter_number) if x.chapter_number is not None else -1.0), reverse=True)
-        except Exception:
-            # Sort başarısız olursa (örn: veritabanı hatası) sıralamadan devam et
-            pass
-        n.chapters = n.chapters[:3]
-        
-    return novels
+# sort_by → (keyset kolonu, azalan mı); "trending" bellekteki sönümlü skor sıralaması
+NOVEL_SORTS = {
+    "newest": (models.Novel.created_at, True),
+    "popular": (models.Novel.view_count, True),
+}
+
+def get_novels_logic(db: Session, limit: int, skip: int, latest: int = 3, cursor: str = None,
+                     response: Response = None, sort_by: str = "newest"):
+    if sort_by not in NOVEL_SORTS and sort_by != "trending":
+        sort_by = "newest"
+
+    query = db.query(*NOVEL_CARD_COLUMNS).filter(models.Novel.is_published == True)
+    if sort_by == "trending":
+        novels, next_cursor = trending_rows(query, models.Novel.id, "novel", cursor, limit, offset=skip)
+    else:
+        sort_col, descending = NOVEL_SORTS[sort_by]
+        novels, next_cursor = paginate_keyset(
+            query, sort_col, models.Novel.id, sort_by, descending, cursor, limit, offset=skip
+        )
+    if response is not None:
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Cache-Control"] = CACHE_POLICIES["list"]
+
+    # 🚀 Son N bölüm tek ROW_NUMBER() sorgusuyla (içerik kolonu olmadan)
+    ids = [n.id for n in novels]
+    latest_chapters = latest_per_series(
+        db, models.NovelChapter, models.NovelChapter.novel_id, models.NovelChapter.chapter_number,
+        ids, latest, CHAPTER_CARD_COLUMNS
+    )
+    counts = count_per_series(db, models.NovelChapter, models.NovelChapter.novel_id, ids)
+
+    return [
+        {
+            **n._asdict(),
+            "status": n.status or "ongoing",
+            "view_count": n.view_count or 0,
+            "chapters": latest_chapters.get(n.id, []),
+            "chapter_count": counts.get(n.id, 0),
+        }
+        for n in novels
+    ]
 
 # 1. LİSTELEME
 @router.get("/", response_model=List[schemas.NovelCard])
-def novelleri_getir(db: Session = Depends(get_db), limit: int = 100, skip: int = 0):
-    return get_novels_logic(db, limit, skip)
+def novelleri_getir(response: Response, db: Session = Depends(get_db), limit: int = Query(100, ge=1, le=200), skip: int = 0,
+                    cursor: str = None, latest: int = Query(3, ge=0, le=10), sort_by: str = "newest"):
+    return get_novels_logic(db, limit, skip, latest, cursor, response, sort_by)
 
 # 1.1 LİSTELEME (SLASHSIZ ERİŞİM İÇİN ALIAS - CORS FIX)
 @router.get("", include_in_schema=False)
-def novelleri_getir_no_slash(db: Session = Depends(get_db), limit: int = 100, skip: int = 0):
-    return get_novels_logic(db, limit, skip)
+def novelleri_getir_no_slash(response: Response, db: Session = Depends(get_db), limit: int = Query(100, ge=1, le=200), skip: int = 0,
+                             cursor: str = None, latest: int = Query(3, ge=0, le=10), sort_by: str = "newest"):
+    return get_novels_logic(db, limit, skip, latest, cursor, response, sort_by)
 
 # 2. TEK ROMAN GETİR
 @router.get("/{slug_or_id}", response_model=schemas.NovelDetail)
 def novel_detay(slug_or_id: str, response: Response, request: Request, db: Session = Depends(get_db)):
+    from utils.view_tracker import view_tracker
+
     if slug_or_id.isdigit():
-        novel = db.query(models.Novel).filter(models.Novel.id == int(slug_or_id), models.Novel.is_published == True).first()
+        lookup = models.Novel.id == int(slug_or_id)
     else:
-        novel = db.query(models.Novel).filter(models.Novel.slug == slug_or_id, models.Novel.is_published == True).first()
+        lookup = models.Novel.slug == slug_or_id
+
+    # Koşullu istek: 304 kararı (id, updated_at) + bölüm indeksiyle, içerik yüklenmeden verilir
+    if has_conditions(request):
+        row = db.query(models.Novel.id, func.coalesce(models.Novel.updated_at, models.Novel.created_at))\
+                .filter(lookup, models.Novel.is_published == True).first()
+        if row:
+            etag, modified = series_validators(db, "novel", row[0], row[1])
+            if is_not_modified(request, etag, modified):
+                view_tracker.record_view(request.client.host, "novel", row[0])
+                return not_modified(etag, modified, "series")
+
+    def load():
+        novel = db.query(models.Novel).filter(lookup, models.Novel.is_published == True).first()
+        if not novel:
+            raise HTTPException(status_code=404, detail="Roman bulunamadı")
+
+        # Tüm bölüm listesi yerine sadece ilk ve son sayfa; aradakiler /novels/{slug}/chapters'tan
+        chapters, chapter_count = edge_chapters(db, "novel", novel.id, DETAIL_EDGE)
+        etag, modified = series_validators(db, "novel", novel.id, novel.updated_at or novel.created_at)
+        detail = {attr.key: getattr(novel, attr.key) for attr in sa_inspect(models.Novel).column_attrs}
+        return {**detail, "chapters": chapters, "chapter_count": chapter_count}, etag, modified
+
+    # Aynı seri için eşzamanlı istekler tek yüklemeyi bekler (sonuç salt okunur paylaşılır)
+    payload, etag, modified = single_flight.do(("novel", slug_or_id), load)
 
-    if not novel:
-        raise HTTPException(status_code=404, detail="Roman bulunamadı")
-    
-    
     # 🔥 YENİ SİSTEM: IP Tabanlı View Count Rate Limiting
-    from utils.view_tracker import view_tracker
-    
     client_ip = request.client.host
     
     # ViewTracker ile kontrol: Bu IP son 1 saat içinde bu romanı gördü mü?
-    if view_tracker.should_count_view(client_ip, "novel", novel.id):
-        # İlk defa görüntüleniyor (veya 1 saat geçmiş), sayacı artır
-        if getattr(novel, 'view_count', None) is None:
-            novel.view_count = 0
-        novel.view_count += 1
-        db.commit()
-    
-    chapters = db.query(models.NovelChapter).filter(
-        models.NovelChapter.novel_id == novel.id,
-        models.NovelChapter.is_published == True
-    ).order_by(asc(models.NovelChapter.chapter_number)).all()
-    
-    novel.chapters = chapters
-    return novel
+    # Sayılırsa artış write-behind sayaca gider, istek içinde DB'ye yazılmaz
+    view_tracker.record_view(client_ip, "novel", payload["id"])
+    # Yanıt önbellekten sunulduğunda da görüntülenme sayılsın
+    request.state.view_key = ("novel", payload["id"])
+
+    set_validators(response, etag, modified, "series")
+    return payload
+
+# 2.1 BÖLÜM LİSTESİ (Sayfalı, iki yönlü)
+@router.get("/{slug}/chapters")
+def novel_bolumleri(
+    slug: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=500),
+    after: float = None,
+    before: float = None,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    format: str = Query("rows", pattern="^(rows|columnar)$"),
+):
+    novel_id = chapter_index.series_id(db, "novel", slug, published_only=True)
+    if novel_id is None:
+        raise HTTPException(status_code=404, detail="Roman bulunamadı")
+
+    # Liste sadece bölüm kümesine bağlı: doğrulayıcılar indeksten, 304 satır okunmadan
+    etag, modified = series_validators(db, "novel", novel_id)
+    if is_not_modified(request, etag, modified):
+        return not_modified(etag, modified, "series")
+    set_validators(response, etag, modified, "series")
+    return chapter_page(db, "novel", novel_id, limit, after, before, order, columnar=format == "columnar")
+
+# 2.2 BÖLÜM METNİNDE ARAMA (Terimin geçtiği bölümler + vurgulu alıntı)
+@router.get("/{slug}/search")
+def novel_bolum_ara(
+    slug: str,
+    response: Response,
+    db: Session = Depends(get_db),
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(20, ge=1, le=50),
+    skip: int = Query(0, ge=0),
+):
+    """
+    Romanın bölüm metinlerinde arama. Bölüm numarasına göre artan sıralı
+    (terimin ilk geçtiği bölüm başta); `snippet` HTML-escape edilmiştir, eşleşmeler <mark> içindedir.
+    """
+    novel_id = chapter_index.series_id(db, "novel", slug, published_only=True)
+    if novel_id is None:
+        raise HTTPException(status_code=404, detail="Roman bulunamadı")
+
+    backend, rows = search_chapters(db, novel_id, q, limit, skip)
+    response.headers["Cache-Control"] = CACHE_POLICIES["list"]
+    return {"items": rows[:limit], "has_more": len(rows) > limit, "backend": backend}
 
 # 3. YENİ ROMAN EKLE
 @router.post("/ekle", status_code=status.HTTP_201_CREATED)
@@ -168,66 +270,107 @@ def novel_bolum_ekle(
     db.refresh(yeni_bolum)
     return {"durum": "Başarılı", "mesaj": "Bölüm eklendi"}
 
+def resolve_chapter_identifier(index, chapter_identifier: str):
+    """Hybrid locator: önce bölüm numarası, bulunamazsa bu romana ait bölüm ID'si."""
+    # 1. Deneme: Identifier bir Float ise (Bölüm Numarası)
+    try:
+        chapter_id = index.resolve(float(chapter_identifier))
+        if chapter_id is not None:
+            return chapter_id
+    except ValueError:
+        pass
+
+    # 2. Deneme: Identifier bir Integer ise (ID olabilir)
+    if chapter_identifier.isdigit() and index.number_of(int(chapter_identifier)) is not None:
+        return int(chapter_identifier)
+    return None
+
+def chapter_validators(index, chapter_id: int, chapter_number: float, chapter_modified, novel_modified):
+    """Okuma sayfası (ETag, Last-Modified): bölüm + roman sürümü ve navigasyon komşuları."""
+    prev_ch, next_ch = index.neighbours(chapter_number, published_only=False)
+    etag = make_etag("novel_chapter", chapter_id, chapter_modified, novel_modified, prev_ch, next_ch)
+    return etag, last_modified_of(chapter_modified, novel_modified)
+
 # 5. OKUMA SAYFASI (🔥 FİNAL VERSİYON: KORUMALI & HYBRID LOCATOR 🔥)
 @router.get("/{slug}/chapters/{chapter_identifier}")
 def novel_bolum_oku(slug: str, chapter_identifier: str, request: Request, response: Response, db: Session = Depends(get_db)):
     
-    # Romanı bul
-    novel = db.query(models.Novel).filter(models.Novel.slug == slug).first()
-    if not novel:
+    # Slug → roman id ve bölüm numarası/ID çözümlemesi süreç içi indeksten (sorgu yok)
+    novel_id = chapter_index.series_id(db, "novel", slug)
+    if novel_id is None:
         raise HTTPException(status_code=404, detail="Roman bulunamadı")
+    index = chapter_index.series(db, "novel", novel_id)
+    chapter_id = resolve_chapter_identifier(index, chapter_identifier)
+    if chapter_id is None:
+        # Bot/başka worker yeni bölüm eklemiş olabilir: indeksi bir kez tazele
+        index = chapter_index.refresh(db, "novel", novel_id)
+        chapter_id = resolve_chapter_identifier(index, chapter_identifier)
 
-    chapter = None
-
-    # 1. Deneme: Identifier bir Float ise (Bölüm Numarası)
-    is_float = False
-    try:
-        c_num = float(chapter_identifier)
-        is_float = True
-        chapter = db.query(models.NovelChapter).filter(
-            models.NovelChapter.novel_id == novel.id,
-            models.NovelChapter.chapter_number == c_num
-        ).first()
-    except ValueError:
-        pass
-
-    # 2. Deneme: Eğer bulunamadıysa ve Identifier bir Integer ise (ID olabilir)
-    if not chapter and chapter_identifier.isdigit():
-        c_id = int(chapter_identifier)
-        chapter = db.query(models.NovelChapter).filter(
-            models.NovelChapter.novel_id == novel.id,
-            models.NovelChapter.id == c_id
-        ).first()
+    from utils.view_tracker import view_tracker
 
-    if not chapter:
+    # Koşullu istek: sürüm bilgisi tek küçük sorguyla, metin yüklenmeden 304
+    if chapter_id is not None and has_conditions(request):
+        version = db.query(
+                    models.NovelChapter.chapter_number,
+                    func.coalesce(models.NovelChapter.updated_at, models.NovelChapter.created_at),
+                    func.coalesce(models.Novel.updated_at, models.Novel.created_at),
+                  )\
+                  .join(models.Novel, models.Novel.id == models.NovelChapter.novel_id)\
+                  .filter(models.NovelChapter.id == chapter_id, models.Novel.slug == slug)\
+                  .first()
+        if version:
+            etag, modified = chapter_validators(index, chapter_id, *version)
+            if is_not_modified(request, etag, modified):
+                view_tracker.record_view(request.client.host, "novel_chapter", chapter_id)
+                return not_modified(etag, modified, "reader")
+
+    if chapter_id is None:
         raise HTTPException(status_code=404, detail="Bölüm bulunamadı (ID veya Numara ile eşleşmedi)")
 
+    # Yükleme: aynı bölüm için eşzamanlı istekler (yeni bölüm yayınlandığında) tek yüklemeyi bekler
+    body, etag, modified = single_flight.do(
+        ("novel_chapter", slug, chapter_id), lambda: load_chapter(db, index, novel_id, slug, chapter_id)
+    )
+
     # 🔥 YENİ SİSTEM: IP Tabanlı View Count Rate Limiting
-    from utils.view_tracker import view_tracker
-    
     client_ip = request.client.host
     
-    # Chapter view count (bölüm bazında)
-    if view_tracker.should_count_view(client_ip, "novel_chapter", chapter.id):
-        if chapter.view_count is None:
-            chapter.view_count = 0
-        chapter.view_count += 1
-        db.commit()
+    # Chapter view count (bölüm bazında, write-behind)
+    view_tracker.record_view(client_ip, "novel_chapter", chapter_id)
     # ------------------------------------
 
+    return Response(body, media_type="application/json", headers=validator_headers(etag, modified, "reader"))
 
-    # Navigasyon
-    prev_ch = db.query(models.NovelChapter).filter(
-        models.NovelChapter.novel_id == novel.id,
-        models.NovelChapter.chapter_number < chapter.chapter_number
-    ).order_by(desc(models.NovelChapter.chapter_number)).first()
 
-    next_ch = db.query(models.NovelChapter).filter(
-        models.NovelChapter.novel_id == novel.id,
-        models.NovelChapter.chapter_number > chapter.chapter_number
-    ).order_by(asc(models.NovelChapter.chapter_number)).first()
+def load_chapter(db: Session, index, novel_id: int, slug: str, chapter_id: int):
+    """
+    Okuma sayfası yanıtı (single-flight lideri çalıştırır).
+
+    Returns:
+        (JSON gövdesi, ETag, Last-Modified)
+    """
+    # Tek sorgu: bölüm + metin + roman (slug tekrar kontrol edilir, indeks eskiyse yakalanır)
+    row = db.query(models.NovelChapter, models.Novel)\
+            .join(models.Novel, models.Novel.id == models.NovelChapter.novel_id)\
+            .options(joinedload(models.NovelChapter.body))\
+            .filter(models.NovelChapter.id == chapter_id, models.Novel.slug == slug)\
+            .first()
+
+    if not row:
+        # İndeks eski (bölüm silinmiş / slug değişmiş)
+        chapter_index.invalidate("novel", novel_id)
+        raise HTTPException(status_code=404, detail="Bölüm bulunamadı (ID veya Numara ile eşleşmedi)")
+    chapter, novel = row
+
+    # Navigasyon (indeksten, yayın durumundan bağımsız)
+    prev_ch, next_ch = index.neighbours(chapter.chapter_number, published_only=False)
+    etag, modified = chapter_validators(
+        index, chapter.id, chapter.chapter_number,
+        chapter.updated_at or chapter.created_at, novel.updated_at or novel.created_at,
+    )
 
-    return {
+    # Gövde bir kez serileştirilir, bekleyen istekler aynı byte'ları döner
+    body = render_json({
         "id": chapter.id,
         "title": chapter.title,
         "content": chapter.content,
@@ -237,9 +380,10 @@ def novel_bolum_oku(slug: str, chapter_identifier: str, request: Request, respon
         "view_count": chapter.view_count, 
         "created_at": chapter.created_at, 
         "novel_id": novel.id, 
-        "prev_chapter": prev_ch.chapter_number if prev_ch else None,
-        "next_chapter": next_ch.chapter_number if next_ch else None
-    }
+        "prev_chapter": prev_ch[0] if prev_ch else None,
+        "next_chapter": next_ch[0] if next_ch else None
+    })
+    return body, etag, modified
 
 
 # 6. BÖLÜM SİLME (Admin/Editor)
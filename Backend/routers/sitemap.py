@@ -0,0 +1,56 @@
+import gzip
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+
+from utils.http_cache import CACHE_POLICIES
+from utils.sitemap import PAGES, SITEMAP_SOURCES, sitemap_builder
+
+router = APIRouter(
+    tags=["Sitemap"]
+)
+
+# Gövde zaten gzip'li; nginx yeniden sıkıştırmaz
+XML_HEADERS = {"Cache-Control": CACHE_POLICIES["sitemap"], "Vary": "Accept-Encoding"}
+
+
+def _accepts_gzip(request: Request) -> bool:
+    return "gzip" in (request.headers.get("accept-encoding") or "").lower()
+
+
+def _xml(body: bytes, request: Request) -> Response:
+    """Önbellekteki gzip'li gövde; gzip kabul etmeyen istemciye açılmış hali."""
+    if not _accepts_gzip(request):
+        return Response(gzip.decompress(body), media_type="application/xml", headers=XML_HEADERS)
+    return Response(body, media_type="application/xml", headers={**XML_HEADERS, "Content-Encoding": "gzip"})
+
+
+# ==========================================
+# 🗺️ SITEMAP INDEX
+# ==========================================
+@router.get("/sitemap.xml")
+def sitemap_index(request: Request):
+    """Tüm sitemap parçalarının listesi (parça başına en son değişiklik tarihiyle)."""
+    return _xml(sitemap_builder.index(), request)
+
+
+# ==========================================
+# 🧩 SITEMAP PARÇASI (pages / webtoons / novels / episodes / chapters)
+# ==========================================
+@router.get("/sitemaps/{kind}-{number}.xml")
+def sitemap_shard(kind: str, number: int, request: Request):
+    """
+    Tek parça: önbellekteyse hazır gzip gövdesi, değilse sunucu tarafı cursor'dan
+    üretilirken akıtılır (bittiğinde önbelleğe yazılır).
+    """
+    if (kind != PAGES and kind not in SITEMAP_SOURCES) or not sitemap_builder.has_shard(kind, number):
+        raise HTTPException(status_code=404, detail="Sitemap bulunamadı")
+
+    cached = sitemap_builder.cached(kind, number)
+    if cached is not None:
+        return _xml(cached, request)
+    if not _accepts_gzip(request):
+        return StreamingResponse(sitemap_builder.stream(kind, number, compress=False),
+                                 media_type="application/xml", headers=XML_HEADERS)
+    return StreamingResponse(sitemap_builder.stream(kind, number), media_type="application/xml",
+                             headers={**XML_HEADERS, "Content-Encoding": "gzip"})
@@ -1,11 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, status, Response, Request
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, status, Response, Request, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func, inspect as sa_inspect
 from typing import List
 import shutil
 import os
 import uuid # Resim isimleri çakışmasın diye rastgele isim üretici
-import re   # Slug üretimi için regex
 
 # Proje dosyalarından gerekli parçaları çağırıyoruz
 from database import get_db
@@ -13,6 +12,13 @@ import models
 import schemas
 # Admin kontrolünü içeri aktarıyoruz
 from routers.auth import get_current_admin
+from utils.queries import latest_per_series, count_per_series
+from utils.pagination import paginate_keyset
+from utils.trending import trending_rows
+from utils.chapter_index import chapter_index, chapter_page, edge_chapters, series_validators, DETAIL_EDGE
+from utils.http_cache import CACHE_POLICIES, has_conditions, is_not_modified, not_modified, set_validators
+from utils.single_flight import single_flight
+from utils.slug import slug_olustur
 
 # Router kurulumu
 router = APIRouter(
@@ -20,72 +26,153 @@ router = APIRouter(
     tags=["Webtoons"]      # Dokümantasyonda başlık
 )
 
-# --- YARDIMCI FONKSİYON: SLUG OLUŞTURUCU ---
-def slug_olustur(text: str):
-    text = text.lower() # Küçük harfe çevir
-    # Türkçe karakterleri İngilizce karşılıklarına çevir
-    text = text.replace("ı", "i").replace("ğ", "g").replace("ü", "u").replace("ş", "s").replace("ö", "o").replace("ç", "c")
-    text = re.sub(r'[^a-z0-9\s-]', '', text) # Harf, sayı ve tire dışındakileri sil
-    text = re.sub(r'[\s-]+', '-', text)      # Boşlukları tire yap
-    return text.strip('-')
+# Kartta gösterilen kolonlar (summary gibi büyük alanlar yüklenmez)
+WEBTOON_CARD_COLUMNS = (
+    models.Webtoon.id, models.Webtoon.title, models.Webtoon.slug, models.Webtoon.cover_image,
+    models.Webtoon.status, models.Webtoon.view_count, models.Webtoon.type,
+    models.Webtoon.is_featured, models.Webtoon.is_published, models.Webtoon.created_at,
+)
+EPISODE_CARD_COLUMNS = (
+    models.WebtoonEpisode.id, models.WebtoonEpisode.title, models.WebtoonEpisode.episode_number,
+    models.WebtoonEpisode.is_published, models.WebtoonEpisode.created_at,
+)
+
+# sort_by → (keyset kolonu, azalan mı). Eşitlikte id ile sıralanır.
+# "trending" ayrıca: utils.trending'in bellekteki sönümlü skor sıralaması.
+WEBTOON_SORTS = {
+    "newest": (models.Webtoon.created_at, True),
+    "alphabetical": (models.Webtoon.title, False),
+    "popular": (models.Webtoon.view_count, True),
+}
+
+def get_webtoons_logic(db: Session, limit: int, skip: int = 0, latest: int = 3, cursor: str = None,
+                       response: Response = None, sort_by: str = "newest"):
+    if sort_by not in WEBTOON_SORTS and sort_by != "trending":
+        sort_by = "newest"
+
+    query = db.query(*WEBTOON_CARD_COLUMNS).filter(models.Webtoon.is_published == True)
+    if sort_by == "trending":
+        # Sıralama bellekte hazır: sayfa dilimi + sadece o id'lerin kartları
+        webtoons, next_cursor = trending_rows(query, models.Webtoon.id, "webtoon", cursor, limit, offset=skip)
+    else:
+        sort_col, descending = WEBTOON_SORTS[sort_by]
+        webtoons, next_cursor = paginate_keyset(
+            query, sort_col, models.Webtoon.id, sort_by, descending, cursor, limit, offset=skip
+        )
+    if response is not None:
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Cache-Control"] = CACHE_POLICIES["list"]
+
+    # 🚀 Son N bölüm tek ROW_NUMBER() sorgusuyla (tüm bölümler yüklenmez)
+    ids = [w.id for w in webtoons]
+    latest_episodes = latest_per_series(
+        db, models.WebtoonEpisode, models.WebtoonEpisode.webtoon_id, models.WebtoonEpisode.episode_number,
+        ids, latest, EPISODE_CARD_COLUMNS
+    )
+    counts = count_per_series(db, models.WebtoonEpisode, models.WebtoonEpisode.webtoon_id, ids)
+
+    return [
+        {
+            **w._asdict(),
+            "view_count": w.view_count or 0,
+            "episodes": latest_episodes.get(w.id, []),
+            "episode_count": counts.get(w.id, 0),
+        }
+        for w in webtoons
+    ]
 
 # 1. ANASAYFA LİSTELEME (Sadece Kart Bilgileri) - HERKESE AÇIK
+# Sonraki sayfa için opak cursor X-Next-Cursor header'ında döner (liste formatı bozulmasın diye)
 @router.get("/", response_model=List[schemas.WebtoonCard]) 
 def webtoonlari_getir(
+    response: Response,
     db: Session = Depends(get_db),
-    limit: int = 20,       
+    limit: int = Query(20, ge=1, le=100),
     skip: int = 0,         
-    sort_by: str = "newest" 
+    sort_by: str = "newest",
+    cursor: str = None,
+    latest: int = Query(3, ge=0, le=10)
 ):
-
-    # O P T I M İ Z A S Y O N EKLENDİ (N+1 Sorunu Çözümü)
-    from sqlalchemy.orm import selectinload
-
-    query = db.query(models.Webtoon).filter(models.Webtoon.is_published == True).options(
-        selectinload(models.Webtoon.episodes.and_(models.WebtoonEpisode.is_published == True)),
-        selectinload(models.Webtoon.categories)
-    )
-
-    if sort_by == "newest":
-        query = query.order_by(desc(models.Webtoon.created_at))
-    elif sort_by == "alphabetical":
-        query = query.order_by(models.Webtoon.title.asc())
-    elif sort_by == "popular":
-        query = query.order_by(desc(models.Webtoon.view_count))
-
-    webtoons = query.offset(skip).limit(limit).all()
-    return webtoons
+    return get_webtoons_logic(db, limit, skip, latest, cursor, response, sort_by)
 
 # 2. DETAY GÖSTERME (Bölümlerle Birlikte) - HERKESE AÇIK
 # 2. DETAY GÖSTERME (Hem ID hem Slug destekler) - HERKESE AÇIK
 @router.get("/{id_or_slug}", response_model=schemas.WebtoonDetail)
 def webtoon_detay(id_or_slug: str, response: Response, request: Request, db: Session = Depends(get_db)):
-    # Gelen veri sayı mı? (Örn: "1", "5")
+    from utils.view_tracker import view_tracker
+
+    # Gelen veri sayı mı? (Örn: "1", "5") Yoksa yazı mı? (Örn: "shadow-slave")
     if id_or_slug.isdigit():
-        webtoon = db.query(models.Webtoon).filter(models.Webtoon.id == int(id_or_slug), models.Webtoon.is_published == True).first()
-    
-    # Yoksa yazı mı? (Örn: "shadow-slave")
+        lookup = models.Webtoon.id == int(id_or_slug)
     else:
-        webtoon = db.query(models.Webtoon).filter(models.Webtoon.slug == id_or_slug, models.Webtoon.is_published == True).first()
-    
-    if not webtoon:
-        raise HTTPException(status_code=404, detail="Webtoon bulunamadı")
-    
-    
+        lookup = models.Webtoon.slug == id_or_slug
+
+    # Koşullu istek: 304 kararı (id, updated_at) + bölüm indeksiyle, içerik yüklenmeden verilir
+    if has_conditions(request):
+        row = db.query(models.Webtoon.id, func.coalesce(models.Webtoon.updated_at, models.Webtoon.created_at))\
+                .filter(lookup, models.Webtoon.is_published == True).first()
+        if row:
+            etag, modified = series_validators(db, "webtoon", row[0], row[1])
+            if is_not_modified(request, etag, modified):
+                view_tracker.record_view(request.client.host, "webtoon", row[0])
+                return not_modified(etag, modified, "series")
+
+    def load():
+        webtoon = db.query(models.Webtoon).filter(lookup, models.Webtoon.is_published == True).first()
+        if not webtoon:
+            raise HTTPException(status_code=404, detail="Webtoon bulunamadı")
+
+        # Tüm bölüm listesi yerine sadece ilk ve son sayfa; aradakiler /webtoons/{slug}/episodes'tan
+        episodes, episode_count = edge_chapters(db, "webtoon", webtoon.id, DETAIL_EDGE)
+        etag, modified = series_validators(db, "webtoon", webtoon.id, webtoon.updated_at or webtoon.created_at)
+        detail = {attr.key: getattr(webtoon, attr.key) for attr in sa_inspect(models.Webtoon).column_attrs}
+        return {**detail, "episodes": episodes, "episode_count": episode_count}, etag, modified
+
+    # Aynı seri için eşzamanlı istekler tek yüklemeyi bekler (sonuç salt okunur paylaşılır)
+    payload, etag, modified = single_flight.do(("webtoon", id_or_slug), load)
+
     # 🔥 YENİ SİSTEM: IP Tabanlı View Count Rate Limiting
-    from utils.view_tracker import view_tracker
-    
     client_ip = request.client.host
     
     # ViewTracker ile kontrol: Bu IP son 1 saat içinde bu webtoon'u gördü mü?
-    if view_tracker.should_count_view(client_ip, "webtoon", webtoon.id):
-        # İlk defa görüntüleniyor (veya 1 saat geçmiş), sayacı artır
-        if webtoon.view_count is None:
-            webtoon.view_count = 0
-        webtoon.view_count += 1
-        db.commit()
-    
-    return webtoon
+    # Sayılırsa artış write-behind sayaca gider, istek içinde DB'ye yazılmaz
+    view_tracker.record_view(client_ip, "webtoon", payload["id"])
+    # Yanıt önbellekten sunulduğunda da görüntülenme sayılsın
+    request.state.view_key = ("webtoon", payload["id"])
+
+    set_validators(response, etag, modified, "series")
+    return payload
+
+# 2.1 BÖLÜM LİSTESİ (Sayfalı, iki yönlü) - HERKESE AÇIK
+@router.get("/{id_or_slug}/episodes")
+def webtoon_bolumleri(
+    id_or_slug: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=500),
+    after: float = None,
+    before: float = None,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    format: str = Query("rows", pattern="^(rows|columnar)$"),
+):
+    if id_or_slug.isdigit():
+        webtoon_id = db.query(models.Webtoon.id).filter(
+            models.Webtoon.id == int(id_or_slug), models.Webtoon.is_published == True
+        ).scalar()
+    else:
+        webtoon_id = chapter_index.series_id(db, "webtoon", id_or_slug, published_only=True)
+
+    if webtoon_id is None:
+        raise HTTPException(status_code=404, detail="Webtoon bulunamadı")
+
+    # Liste sadece bölüm kümesine bağlı: doğrulayıcılar indeksten, 304 satır okunmadan
+    etag, modified = series_validators(db, "webtoon", webtoon_id)
+    if is_not_modified(request, etag, modified):
+        return not_modified(etag, modified, "series")
+    set_validators(response, etag, modified, "series")
+    return chapter_page(db, "webtoon", webtoon_id, limit, after, before, order, columnar=format == "columnar")
 
 # 3. WEBTOON EKLE (Resim Yüklemeli & Admin Korumalı) - KİLİTLİ 🔒
 @router.post("/ekle", status_code=status.HTTP_201_CREATED)
@@ -77,6 +77,8 @@ class WebtoonCard(BaseModel):
 
     # Anasayfada son bölümleri göstermek için
     episodes: List[EpisodeListSchema] = [] 
+    # Yayınlanmış toplam bölüm sayısı (kartlarda episodes sadece son N bölümü içerir)
+    episode_count: Optional[int] = None
     
     class Config:
         from_attributes = True
@@ -109,6 +111,8 @@ class NovelCard(BaseModel):
     
     # Anasayfada son bölümleri göstermek için
     chapters: List[NovelChapterListSchema] = []
+    # Yayınlanmış toplam bölüm sayısı (kartlarda chapters sadece son N bölümü içerir)
+    chapter_count: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -146,7 +150,9 @@ class NovelDetail(BaseModel):
     source_url: Optional[str] = None 
     
     # 🔥 DÜZELTİLDİ: NovelChapterBase yerine NovelChapterListSchema
+    # Sadece ilk ve son sayfa; tam liste /novels/{slug}/chapters
     chapters: List[NovelChapterListSchema] = [] 
+    chapter_count: Optional[int] = None
 
     class Config:
         from_attributes = True
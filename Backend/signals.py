@@ -30,4 +30,118 @@ def delete_novel_media(mapper, connection, target):
 def delete_episode_image_file(mapper, connection, target):
     delete_file(target.image_url)
 
+# --- 4. COMMIT SONRASI ÖNBELLEK KANCALARI ---
+# Bellek içi önbellekler (HTTP yanıtı, vitrin, öneri, faset, bölüm indeksi) kendi
+# session.info + after_flush/after_commit/after_rollback üçlüsünü kurmaz; `on_commit`
+# ile kayıt olur. Flush'ta değişen model sınıfları (ve istenirse nesne başına kayıtlar)
+# toplanır, commit olunca ilgili callback'ler çağrılır, rollback'te atılır.
+from sqlalchemy.orm import Session
+
+_CHANGES_KEY = "committed_changes"
+_commit_hooks = []
+
+def on_commit(watched, callback, collect=None):
+    """
+    Commit sonrası çalışacak bir önbellek callback'i kaydeder.
+
+    Args:
+        watched: İzlenen model sınıfları
+        callback: Commit sonrası çağrılır; `collect` verildiyse toplanan kayıtların listesiyle
+        collect: (nesne, "new" | "dirty" | "deleted") → kayıt ya da None. Flush anında çalışır
+                 (öznitelik geçmişi ve id'ler hazırdır); verilmezse izlenen modellerden biri değişince callback argümansız çağrılır
+    """
+    _commit_hooks.append((tuple(watched), callback, collect))
+
+@event.listens_for(Session, 'after_flush')
+def collect_changes(session, flush_context):
+    changes = session.info.setdefault(_CHANGES_KEY, {"models": set(), "items": {}})
+    for op, objs in (("new", session.new), ("dirty", session.dirty), ("deleted", session.deleted)):
+        for obj in objs:
+            changes["models"].add(type(obj))
+            for i, (watched, _, collect) in enumerate(_commit_hooks):
+                if collect is not None and isinstance(obj, watched):
+                    item = collect(obj, op)
+                    if item is not None:
+                        changes["items"].setdefault(i, []).append(item)
+
+@event.listens_for(Session, 'after_commit')
+def run_commit_hooks(session):
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if not changes:
+        return
+    for i, (watched, callback, collect) in enumerate(_commit_hooks):
+        try:
+            if collect is not None:
+                if i in changes["items"]:
+                    callback(changes["items"][i])
+            elif any(issubclass(model, watched) for model in changes["models"]):
+                callback()
+        except Exception as e:
+            # Veri zaten commit oldu; bir önbelleğin hatası diğerlerini ve isteği düşürmesin
+            print(f"⚠️ Commit sonrası önbellek güncellenemedi ({callback.__qualname__}): {e}")
+
+@event.listens_for(Session, 'after_rollback')
+def drop_changes(session):
+    session.info.pop(_CHANGES_KEY, None)
+
+# --- 5. İÇERİK DEĞİŞİNCE: HTTP YANIT ÖNBELLEĞİ ---
+# Flush'ta değişen modellerin grupları toplanır, commit olunca versiyonları artırılır.
+# (view_counter'ın Core UPDATE'leri Session'dan geçmez; view sayıları TTL kadar eski kalabilir)
+from utils.response_cache import response_cache
+
+CACHE_GROUPS = {
+    models.Webtoon: "webtoon",
+    models.WebtoonEpisode: "webtoon",
+    models.EpisodeImage: "webtoon",
+    models.WebtoonCategory: "webtoon",
+    models.Category: "webtoon",
+    models.Novel: "novel",
+    models.NovelChapter: "novel",
+    models.NovelChapterContent: "novel",
+}
+
+on_commit(CACHE_GROUPS, response_cache.bump, collect=lambda obj, op: CACHE_GROUPS.get(type(obj)))
+
+# --- 6. ALT KAYIT DEĞİŞİNCE: ÜST KAYDIN updated_at'I ---
+# ETag / Last-Modified üst kaydın updated_at'ından türetilir; bölüm, sayfa veya metin
+# değişince bağlı bölüm ve seri de "değişmiş" sayılmalı. onupdate sadece satırın kendisi
+# güncellenince çalıştığı için üst kayıtlar flush sonrası tek UPDATE ile dokunulur.
+import datetime
+from sqlalchemy import select, update
+
+# model → (FK alanı, üst model, üstün üstü için (FK kolonu, model) | None)
+TOUCH_PARENTS = {
+    models.WebtoonEpisode: ("webtoon_id", models.Webtoon, None),
+    models.EpisodeImage: ("episode_id", models.WebtoonEpisode, ("webtoon_id", models.Webtoon)),
+    models.NovelChapter: ("novel_id", models.Novel, None),
+    models.NovelChapterContent: ("chapter_id", models.NovelChapter, ("novel_id", models.Novel)),
+}
+
+@event.listens_for(Session, 'after_flush')
+def touch_parents(session, flush_context):
+    targets = {}
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        rule = TOUCH_PARENTS.get(type(obj))
+        if rule is None or (obj in session.dirty and not session.is_modified(obj, include_collections=False)):
+            continue
+        parent_id = getattr(obj, rule[0])
+        if parent_id is not None:
+            targets.setdefault((rule[1], rule[2]), set()).add(parent_id)
+
+    if not targets:
+        return
+    # Core UPDATE: identity map'e dokunmaz, yeni flush tetiklemez
+    conn = session.connection()
+    now = datetime.datetime.utcnow()
+    for (parent, grandparent), ids in targets.items():
+        table = parent.__table__
+        conn.execute(update(table).where(table.c.id.in_(ids)).values(updated_at=now))
+        if grandparent is not None:
+            fk, model = grandparent
+            conn.execute(
+                update(model.__table__)
+                .where(model.__table__.c.id.in_(select(table.c[fk]).where(table.c.id.in_(ids))))
+                .values(updated_at=now)
+            )
+
 print("✅ File Cleanup Signals Registered")
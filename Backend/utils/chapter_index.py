@@ -0,0 +1,345 @@
+import datetime
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+import models
+import signals
+from utils.http_cache import make_etag
+
+
+# ==========================================
+# 🔢 SERİ BÖLÜM İNDEKSİ (Süreç içi)
+# ==========================================
+# tür → (bölüm modeli, seri FK, numara kolonu, seri modeli)
+SOURCES = {
+    "webtoon": (models.WebtoonEpisode, "webtoon_id", "episode_number", models.Webtoon),
+    "novel": (models.NovelChapter, "novel_id", "chapter_number", models.Novel),
+}
+
+# Bölüm listesi sayfalarında dönen kolonlar (metin/resim gibi büyük alanlar hariç)
+LIST_ATTRS = ("id", "title", "is_published", "created_at")
+
+# Detay yanıtlarında gömülen baştaki ve sondaki bölüm sayısı
+DETAIL_EDGE = int(os.getenv("DETAIL_CHAPTER_EDGE", "50"))
+
+Entry = Tuple[float, int]  # (bölüm numarası, bölüm id)
+
+
+class SeriesIndex:
+    """
+    Tek serinin numaraya göre sıralı bölüm dizisi.
+    Tüm bölümler ve sadece yayınlananlar için ayrı diziler tutulur,
+    böylece iki modda da prev/next tek bisect ile bulunur.
+    """
+
+    __slots__ = ("numbers", "ids", "pub_numbers", "pub_ids", "positions", "modified", "loaded_at")
+
+    def __init__(self, rows: List[Tuple[float, int, bool]], loaded_at: float,
+                 modified: Optional[datetime.datetime] = None):
+        # Numarasız bölümler sıralanamaz, navigasyona da girmez
+        rows = sorted((r for r in rows if r[0] is not None), key=lambda r: (r[0], r[1]))
+        self.numbers = [r[0] for r in rows]
+        self.ids = [r[1] for r in rows]
+        self.pub_numbers = [r[0] for r in rows if r[2]]
+        self.pub_ids = [r[1] for r in rows if r[2]]
+        self.positions = {chapter_id: i for i, chapter_id in enumerate(self.ids)}
+        self.modified = modified  # serideki en son bölüm değişikliği (updated_at, yoksa created_at)
+        self.loaded_at = loaded_at
+
+    def _arrays(self, published_only: bool):
+        return (self.pub_numbers, self.pub_ids) if published_only else (self.numbers, self.ids)
+
+    def resolve(self, number: float) -> Optional[int]:
+        """Bölüm numarası → bölüm id (yoksa None)."""
+        i = bisect_left(self.numbers, number)
+        if i < len(self.numbers) and self.numbers[i] == number:
+            return self.ids[i]
+        return None
+
+    def number_of(self, chapter_id: int) -> Optional[float]:
+        """Bölüm id → bölüm numarası (bu seriye ait değilse None)."""
+        i = self.positions.get(chapter_id)
+        return None if i is None else self.numbers[i]
+
+    def neighbours(self, number: float, published_only: bool = True) -> Tuple[Optional[Entry], Optional[Entry]]:
+        """Verilen numaradan önceki ve sonraki bölüm (numara, id)."""
+        numbers, ids = self._arrays(published_only)
+        lo = bisect_left(numbers, number)
+        hi = bisect_right(numbers, number)
+        prev = (numbers[lo - 1], ids[lo - 1]) if lo > 0 else None
+        nxt = (numbers[hi], ids[hi]) if hi < len(numbers) else None
+        return prev, nxt
+
+    def latest(self, published_only: bool = True) -> Optional[Entry]:
+        numbers, ids = self._arrays(published_only)
+        return (numbers[-1], ids[-1]) if numbers else None
+
+    def fingerprint(self) -> tuple:
+        """Bölüm kümesinin kısa özeti (ETag parçası): eklenen/silinen/düzenlenen bölümde değişir."""
+        return (len(self.ids), len(self.pub_ids),
+                self.ids[-1] if self.ids else None, self.pub_ids[-1] if self.pub_ids else None, self.modified)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class ChapterIndex:
+    """
+    Seri → sıralı bölüm dizisi önbelleği.
+
+    Bölüm listesi sadece bot/admin yeni bölüm eklediğinde değişir; okuyucu
+    navigasyonu ve numara → id çözümlemesi için her istekte DB'ye gitmek yerine
+    seri başına bir kez (id, numara, is_published) okunur ve bisect ile aranır.
+
+    Invalidation: WebtoonEpisode / NovelChapter insert/update/delete olayları
+    commit sonrası ilgili seriyi düşürür (router'lar, admin ve SQLAdmin aynı
+    ORM yolundan geçer). Başka süreçlerin (bot, diğer worker'lar) yazdıkları
+    için `ttl` saniye sonra seri zaten yeniden yüklenir.
+
+    Args:
+        ttl: Bir serinin yeniden okunmadan kullanılacağı süre (saniye)
+        max_series: Bellekte tutulacak en fazla seri (LRU)
+    """
+
+    def __init__(self, ttl: float = 60.0, max_series: int = 5000):
+        self.ttl = ttl
+        self.max_series = max_series
+        self._lock = threading.Lock()
+        self._series: "OrderedDict[Tuple[str, int], SeriesIndex]" = OrderedDict()
+        self._slugs: Dict[Tuple[str, str], Tuple[int, bool, float]] = {}
+        self._hits = 0
+        self._loads = 0
+
+    # ---------- Okuma ----------
+    def series(self, db: Session, kind: str, series_id: int) -> SeriesIndex:
+        key = (kind, series_id)
+        now = time.monotonic()
+        with self._lock:
+            index = self._series.get(key)
+            if index is not None and now - index.loaded_at < self.ttl:
+                self._series.move_to_end(key)
+                self._hits += 1
+                return index
+
+        model, series_attr, number_attr, _ = SOURCES[kind]
+        rows = db.query(getattr(model, number_attr), model.id, model.is_published,
+                        func.coalesce(model.updated_at, model.created_at))\
+                 .filter(getattr(model, series_attr) == series_id).all()
+        stamps = [r[3] for r in rows if r[3] is not None]
+        index = SeriesIndex([(n, i, bool(p)) for n, i, p, _ in rows], now, max(stamps) if stamps else None)
+
+        with self._lock:
+            self._loads += 1
+            self._series[key] = index
+            self._series.move_to_end(key)
+            while len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+        return index
+
+    def refresh(self, db: Session, kind: str, series_id: int, min_age: float = 2.0) -> SeriesIndex:
+        """
+        Aranan bölüm bulunamadığında seriyi yeniden yükler. `min_age` saniyeden
+        yeni indeksler yeniden okunmaz ki olmayan bölüm istekleri DB'ye yüklenmesin.
+        """
+        with self._lock:
+            index = self._series.get((kind, series_id))
+            if index is not None and time.monotonic() - index.loaded_at < min_age:
+                return index
+            self._series.pop((kind, series_id), None)
+        return self.series(db, kind, series_id)
+
+    def series_id(self, db: Session, kind: str, slug: str, published_only: bool = False) -> Optional[int]:
+        """Slug → seri id (seri yoksa None, None sonuçlar önbelleğe alınmaz)."""
+        key = (kind, slug)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._slugs.get(key)
+        if cached is None or now - cached[2] >= self.ttl:
+            series_model = SOURCES[kind][3]
+            row = db.query(series_model.id, series_model.is_published).filter(series_model.slug == slug).first()
+            if row is None:
+                return None
+            cached = (row[0], bool(row[1]), now)
+            with self._lock:
+                if len(self._slugs) >= self.max_series:
+                    self._slugs.clear()
+                self._slugs[key] = cached
+
+        series_id, is_published, _ = cached
+        if published_only and not is_published:
+            return None
+        return series_id
+
+    # ---------- Invalidation ----------
+    def invalidate(self, kind: str, series_id: Optional[int] = None):
+        """Seriyi (veya series_id verilmezse o türün tamamını) düşürür."""
+        with self._lock:
+            if series_id is None:
+                for key in [k for k in self._series if k[0] == kind]:
+                    del self._series[key]
+                for key in [k for k in self._slugs if k[0] == kind]:
+                    del self._slugs[key]
+                return
+            self._series.pop((kind, series_id), None)
+            for key in [k for k, v in self._slugs.items() if k[0] == kind and v[0] == series_id]:
+                del self._slugs[key]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": "chapter_index",
+                "series": len(self._series),
+                "chapters": sum(len(i) for i in self._series.values()),
+                "slugs": len(self._slugs),
+                "hits": self._hits,
+                "loads": self._loads,
+                "ttl": self.ttl,
+            }
+
+
+# ==========================================
+# 📚 BÖLÜM LİSTESİ SAYFALARI
+# ==========================================
+def _load_rows(db: Session, kind: str, series_id: int, *ranges: Tuple[float, float]) -> List[dict]:
+    """Yayınlanmış bölümlerden numarası verilen [lo, hi] aralıklarındakiler (series, is_published, number index'i)."""
+    model, series_attr, number_attr, _ = SOURCES[kind]
+    number_col = getattr(model, number_attr)
+    columns = [getattr(model, a) for a in LIST_ATTRS] + [number_col]
+    rows = db.query(*columns).filter(
+        getattr(model, series_attr) == series_id,
+        model.is_published == True,
+        or_(*(number_col.between(lo, hi) for lo, hi in ranges)),
+    ).order_by(number_col.asc(), model.id.asc()).all()
+    return [row._asdict() for row in rows]
+
+
+def chapter_page(db: Session, kind: str, series_id: int, limit: int = 100,
+                 after: Optional[float] = None, before: Optional[float] = None,
+                 order: str = "desc", columnar: bool = False) -> dict:
+    """
+    Serinin yayınlanmış bölüm listesinden bir sayfa.
+
+    Sınırlar bölüm indeksinde bisect ile bulunur, sayfa satırları tek aralık
+    sorgusuyla okunur. İki yönde de gezilebilir: `after` verilirse numarası
+    ondan büyük ilk `limit` bölüm, `before` verilirse ondan küçük son `limit`
+    bölüm döner. İkisi de yoksa `order`a göre baştan (asc) veya sondan (desc).
+
+    Args:
+        kind: "webtoon" / "novel"
+        series_id: Seri ID
+        limit: Sayfa boyutu
+        after / before: Numara cursor'ları (önceki yanıtın `cursors` alanından)
+        order: Sayfa içi sıralama ("asc" / "desc")
+        columnar: True ise satırlar yerine paralel diziler döner
+
+    Returns:
+        {"total", "order", "items" | "columns", "cursors": {"before", "after"}}
+    """
+    index = chapter_index.series(db, kind, series_id)
+    numbers = index.pub_numbers
+    total = len(numbers)
+
+    if after is not None:
+        start = bisect_right(numbers, after)
+        end = min(start + limit, total)
+    elif before is not None:
+        end = bisect_left(numbers, before)
+        start = max(end - limit, 0)
+    elif order == "asc":
+        start, end = 0, min(limit, total)
+    else:
+        start, end = max(total - limit, 0), total
+
+    rows = _load_rows(db, kind, series_id, (numbers[start], numbers[end - 1])) if start < end else []
+    if order == "desc":
+        rows.reverse()
+
+    number_attr = SOURCES[kind][2]
+    page = {
+        "total": total,
+        "order": order,
+        # Daha küçük numaralar için before=, daha büyükler için after= ile devam edilir
+        "cursors": {
+            "before": numbers[start] if start > 0 and start < end else None,
+            "after": numbers[end - 1] if end < total and start < end else None,
+        },
+    }
+    if columnar:
+        page["columns"] = {
+            "ids": [r["id"] for r in rows],
+            "numbers": [r[number_attr] for r in rows],
+            "titles": [r["title"] for r in rows],
+            "created_at": [r["created_at"] for r in rows],
+        }
+    else:
+        page["items"] = rows
+    return page
+
+
+def edge_chapters(db: Session, kind: str, series_id: int, edge: int) -> Tuple[List[dict], int]:
+    """
+    Detay sayfaları için ilk ve son `edge` yayınlanmış bölüm (numara sırasıyla).
+    Aradaki bölümler `chapter_page` uç noktasından sayfa sayfa çekilir.
+
+    Returns:
+        (bölümler, yayınlanmış toplam bölüm sayısı)
+    """
+    index = chapter_index.series(db, kind, series_id)
+    numbers = index.pub_numbers
+    total = len(numbers)
+    if total == 0:
+        return [], 0
+    if total <= 2 * edge:
+        return _load_rows(db, kind, series_id, (numbers[0], numbers[-1])), total
+
+    ranges = ((numbers[0], numbers[edge - 1]), (numbers[total - edge], numbers[-1]))
+    return _load_rows(db, kind, series_id, *ranges), total
+
+
+def series_validators(db: Session, kind: str, series_id: int,
+                      updated_at: Optional[datetime.datetime] = None) -> Tuple[str, Optional[datetime.datetime]]:
+    """
+    Seri detayı / bölüm listesi için (ETag, Last-Modified).
+    Bölüm kümesi indeksten gelir (sorgu yok); `updated_at` verilirse serinin kendi alanları da dahil olur.
+    """
+    index = chapter_index.series(db, kind, series_id)
+    stamps = [s for s in (updated_at, index.modified) if s is not None]
+    return make_etag(kind, series_id, updated_at, *index.fingerprint()), max(stamps) if stamps else None
+
+
+# ==========================================
+# 🔔 ORM OLAYLARI → COMMIT SONRASI INVALIDATION
+# ==========================================
+def _register(kind: str):
+    model, series_attr, _, series_model = SOURCES[kind]
+
+    def chapter_changed(obj, op: str):
+        return kind, getattr(obj, series_attr)
+
+    def series_changed(obj, op: str):
+        # Slug değişimi / seri silme slug önbelleğini de etkiler
+        return (kind, obj.id) if op != "new" else None
+
+    signals.on_commit((model,), _invalidate, collect=chapter_changed)
+    signals.on_commit((series_model,), _invalidate, collect=series_changed)
+
+
+def _invalidate(changes: List[Tuple[str, Optional[int]]]):
+    for kind, series_id in set(changes):
+        chapter_index.invalidate(kind, series_id)
+
+
+for _kind in SOURCES:
+    _register(_kind)
+
+chapter_index = ChapterIndex(
+    ttl=float(os.getenv("CHAPTER_INDEX_TTL", "60")),
+    max_series=int(os.getenv("CHAPTER_INDEX_MAX_SERIES", "5000")),
+)
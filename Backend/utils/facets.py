@@ -0,0 +1,167 @@
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import String, cast, delete, func, insert, literal, select, text, union_all
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+import models
+import signals
+from utils.single_flight import single_flight
+
+
+# ==========================================
+# 🧭 KEŞFET FASET SAYAÇLARI (explore_facet_counts)
+# ==========================================
+# Yayındaki webtoon sayısı (kategori, tür, durum) kırılımında tutulur; category_id = 0
+# satırları kategoriden bağımsız toplamlardır (çok kategorili seri bir kez sayılır).
+# Her faset, kendi boyutu hariç diğer filtreler uygulanmış sayılardır
+# (ör. status=completed seçiliyken kategori sayıları tamamlanmış seriler üzerinden).
+ALL_CATEGORIES = 0
+DEFAULT_STATUS = "ongoing"
+DEFAULT_TYPE = models.ContentType.MANGA.value
+
+# Bu modellerden biri ORM ile değişip commit olunca tablo yeniden hesaplanır
+FACET_MODELS = (models.Webtoon, models.WebtoonCategory, models.Category)
+
+
+def _facet_rows():
+    W, WC = models.Webtoon, models.WebtoonCategory
+    type_col = func.coalesce(cast(W.type, String), DEFAULT_TYPE)
+    status_col = func.coalesce(W.status, DEFAULT_STATUS)
+    catalog = select(literal(ALL_CATEGORIES), type_col, status_col, func.count(W.id))\
+        .where(W.is_published == True)\
+        .group_by(type_col, status_col)
+    # Aynı (webtoon, kategori) bağı iki kez eklenmişse seri yine bir kez sayılır
+    per_category = select(WC.category_id, type_col, status_col, func.count(func.distinct(W.id)))\
+        .join(W, W.id == WC.webtoon_id)\
+        .where(W.is_published == True)\
+        .group_by(WC.category_id, type_col, status_col)
+    return union_all(catalog, per_category)
+
+
+class FacetCounter:
+    """
+    explore_facet_counts tablosunun bakımı ve okunması.
+
+    Webtoon / WebtoonCategory / Category ORM ile değişip commit olunca tablo "eski"
+    işaretlenir ve bu süreçteki bir sonraki keşfet isteği (ensure) yeniden hesaplar;
+    yazma isteği katalog çapındaki GROUP BY'ı beklemez. ORM dışı yazmalar (bot) ve
+    diğer worker'lardaki değişiklikler için `ttl` saniyede bir de tazelenir. İstekler
+    sadece birkaç yüz satırlık sayaç tablosunu okur.
+
+    Args:
+        ttl: Bu süreçte tabloyu en fazla bu kadar saniye tazelemeden okur
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self.engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+        self.refreshed_at: Optional[float] = None
+        self.stale = False
+        self.last_duration = 0.0
+        self.refreshes = 0
+
+    def refresh(self, engine: Optional[Engine] = None) -> int:
+        """
+        Sayaçları tek transaction'da yeniden yazar (okuyucular eski ya da yeni halin tamamını görür).
+
+        Returns:
+            Yazılan satır sayısı
+        """
+        if engine is None:
+            from database import engine as default_engine
+            engine = self.engine or default_engine
+        started = time.perf_counter()
+        # Okumadan önce temizlenir: hesaplama sırasında gelen commit tekrar işaretler
+        self.stale = False
+        table = models.ExploreFacetCount.__table__
+        with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                # Aynı anda tazeleyen worker'lar sırayla yazsın (DELETE + INSERT çakışmasın)
+                conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('explore_facet_counts'))"))
+            conn.execute(delete(table))
+            result = conn.execute(
+                insert(table).from_select(["category_id", "type", "status", "count"], _facet_rows())
+            )
+        with self._lock:
+            self.refreshed_at = time.monotonic()
+            self.last_duration = time.perf_counter() - started
+            self.refreshes += 1
+        return result.rowcount
+
+    def mark_stale(self):
+        """Sayaçları bir sonraki ensure()'da yeniden hesaplanacak olarak işaretler (commit sonrası)."""
+        self.stale = True
+
+    def ensure(self):
+        """Eskiyse, hiç tazelenmediyse ya da `ttl` dolduysa tazeler (eşzamanlı istekler tek tazelemeyi bekler)."""
+        if self.stale or self.refreshed_at is None or time.monotonic() - self.refreshed_at > self.ttl:
+            single_flight.do(("explore_facets", "refresh"), self.refresh)
+
+    def facets(self, db: Session, category_id: Optional[int] = None, type: Optional[str] = None,
+               status: Optional[str] = None) -> dict:
+        """
+        Seçili filtrelere göre faset sayıları ve toplam; sayaç tablosundan tek sorgu.
+
+        Returns:
+            {"total": int, "categories": [{"id", "name", "count"}], "status": [{"value", "count"}],
+             "type": [{"value", "count"}]}
+        """
+        F, C = models.ExploreFacetCount, models.Category
+        rows = db.query(F.category_id, F.type, F.status, F.count, C.name)\
+                 .outerjoin(C, C.id == F.category_id)\
+                 .all()
+
+        scope = category_id if category_id is not None else ALL_CATEGORIES
+        categories: Dict[int, list] = {}
+        statuses: Dict[str, int] = {}
+        types: Dict[str, int] = {}
+        total = 0
+        for row in rows:
+            type_ok = type is None or row.type == type
+            status_ok = status is None or row.status == status
+            # Kategori faseti: tür/durum filtreli, kategori filtresiz (silinmiş kategori atlanır)
+            if row.category_id != ALL_CATEGORIES and type_ok and status_ok and row.name is not None:
+                entry = categories.setdefault(row.category_id, [row.name, 0])
+                entry[1] += row.count
+            if row.category_id != scope:
+                continue
+            if type_ok:
+                statuses[row.status] = statuses.get(row.status, 0) + row.count
+            if status_ok:
+                types[row.type] = types.get(row.type, 0) + row.count
+            if type_ok and status_ok:
+                total += row.count
+
+        return {
+            "total": total,
+            "categories": sorted(
+                ({"id": cid, "name": name, "count": count} for cid, (name, count) in categories.items()),
+                key=lambda c: (-c["count"], c["name"]),
+            ),
+            "status": sorted(({"value": k, "count": v} for k, v in statuses.items()), key=lambda s: -s["count"]),
+            "type": sorted(({"value": k, "count": v} for k, v in types.items()), key=lambda t: -t["count"]),
+        }
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": "explore_facets",
+                "age": round(time.monotonic() - self.refreshed_at, 1) if self.refreshed_at else None,
+                "last_duration_ms": round(self.last_duration * 1000, 2),
+                "stale": self.stale,
+                "refreshes": self.refreshes,
+                "ttl": self.ttl,
+            }
+
+
+# ==========================================
+# 🔔 ORM OLAYLARI → COMMIT SONRASI "ESKİ" İŞARETİ
+# ==========================================
+facet_counter = FacetCounter(ttl=float(os.getenv("EXPLORE_FACETS_TTL", "300")))
+
+signals.on_commit(FACET_MODELS, facet_counter.mark_stale)
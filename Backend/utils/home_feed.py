@@ -0,0 +1,147 @@
+import gzip
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from utils.response_cache import response_cache
+from utils.single_flight import render_json, single_flight
+
+
+# ==========================================
+# 🏠 ANASAYFA AKIŞI (Bölümleri paralel toplayan tek istek)
+# ==========================================
+class Section:
+    """
+    Anasayfanın bir bölümü.
+
+    Args:
+        name: Yanıttaki anahtar ve Server-Timing metriği adı
+        loader: db → JSON'a çevrilebilir veri
+        ttl: Serileştirilmiş bölümün bellekte tutulma süresi (0: her istekte yükle)
+        groups: Bağlı içerik grupları; grup versiyonu artınca (commit) bölüm TTL'i beklemeden yenilenir
+        needs_db: False ise loader'a oturum açılmaz (bellekteki yapılardan okuyan bölümler)
+    """
+
+    __slots__ = ("name", "loader", "ttl", "groups", "needs_db")
+
+    def __init__(self, name: str, loader: Callable[[Optional[Session]], object], ttl: float,
+                 groups: Tuple[str, ...] = (), needs_db: bool = True):
+        self.name = name
+        self.loader = loader
+        self.ttl = ttl
+        self.groups = groups
+        self.needs_db = needs_db
+
+
+class HomeFeed:
+    """
+    Bölümleri thread havuzunda eşzamanlı yükleyip tek JSON gövdesinde birleştirir.
+
+    Her bölüm kendi TTL'iyle serileştirilmiş byte olarak önbellekte durur; gövde
+    bölüm byte'larının birleştirilmesidir (önbellekteki bölüm yeniden serileştirilmez).
+    Kaçan bölümler kendi oturumlarıyla paralel yüklenir, aynı bölümün eşzamanlı
+    yüklemeleri single_flight ile birleşir. Hata veren bölüm `null` döner, diğerleri etkilenmez.
+
+    Args:
+        workers: Eşzamanlı yüklenebilecek bölüm sayısı
+        gzip_level: Sıkıştırma seviyesi (1-9)
+        gzip_min_size: Bu boyutun altındaki gövdeler sıkıştırılmaz
+    """
+
+    def __init__(self, workers: int = 4, gzip_level: int = 6, gzip_min_size: int = 1024):
+        self.gzip_level = gzip_level
+        self.gzip_min_size = gzip_min_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="home-feed")
+        self._lock = threading.Lock()
+        # bölüm adı → (gövde, son geçerlilik, grup versiyonları)
+        self._cache: Dict[str, Tuple[bytes, float, tuple]] = {}
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, name: str, field: str):
+        with self._lock:
+            counters = self._metrics.setdefault(name, {"hits": 0, "misses": 0, "errors": 0})
+            counters[field] += 1
+
+    def _load(self, section: Section) -> bytes:
+        if not section.needs_db:
+            return render_json(section.loader(None))
+        from database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            return render_json(section.loader(db))
+        finally:
+            db.close()
+
+    def _render(self, section: Section) -> Tuple[bytes, str, float]:
+        started = time.perf_counter()
+        versions = response_cache.versions(section.groups)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(section.name)
+        if cached is not None and cached[1] > now and cached[2] == versions:
+            self._count(section.name, "hits")
+            return cached[0], "hit", time.perf_counter() - started
+
+        try:
+            if section.ttl > 0:
+                body = single_flight.do(("home", section.name), lambda: self._load(section))
+            else:
+                # Önbelleksiz bölüm (ör. her istekte karışan vitrin) istek başına ayrı yüklenir
+                body = self._load(section)
+        except Exception as e:
+            self._count(section.name, "errors")
+            print(f"⚠️ Anasayfa bölümü yüklenemedi ({section.name}): {e}")
+            return b"null", "error", time.perf_counter() - started
+
+        if section.ttl <= 0:
+            return body, "live", time.perf_counter() - started
+        # Versiyonlar yüklemeden ÖNCE okundu: yükleme sırasında commit olursa sonraki istek yeniler
+        with self._lock:
+            self._cache[section.name] = (body, now + section.ttl, versions)
+        self._count(section.name, "misses")
+        return body, "miss", time.perf_counter() - started
+
+    def assemble(self, sections: List[Section]) -> Tuple[bytes, List[str]]:
+        """
+        Returns:
+            (JSON gövdesi, Server-Timing girdileri)
+        """
+        started = time.perf_counter()
+        futures = [(section, self._executor.submit(self._render, section)) for section in sections]
+        parts, timings = [], []
+        for section, future in futures:
+            body, state, duration = future.result()
+            parts.append(json.dumps(section.name).encode() + b":" + body)
+            timings.append(f'{section.name};dur={duration * 1000:.2f};desc="{state}"')
+        timings.append(f"total;dur={(time.perf_counter() - started) * 1000:.2f}")
+        return b"{" + b",".join(parts) + b"}", timings
+
+    def compress(self, body: bytes, accept_encoding: str) -> Tuple[bytes, Optional[str], float]:
+        """İstemci kabul ediyorsa gzip; (gövde, Content-Encoding, süre)."""
+        if len(body) < self.gzip_min_size or "gzip" not in (accept_encoding or "").lower():
+            return body, None, 0.0
+        started = time.perf_counter()
+        compressed = gzip.compress(body, compresslevel=self.gzip_level)
+        return compressed, "gzip", time.perf_counter() - started
+
+    def get_stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "mode": "home_feed",
+                "sections": {name: dict(counters) for name, counters in self._metrics.items()},
+                "cached": {name: round(entry[1] - now, 1) for name, entry in self._cache.items() if entry[1] > now},
+                "gzip_level": self.gzip_level,
+            }
+
+
+home_feed = HomeFeed(
+    workers=int(os.getenv("HOME_FEED_WORKERS", "4")),
+    gzip_level=int(os.getenv("HOME_FEED_GZIP_LEVEL", "6")),
+)
@@ -0,0 +1,95 @@
+import datetime
+import hashlib
+import os
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+# ==========================================
+# 🏷️ KOŞULLU GET (ETag / Last-Modified)
+# ==========================================
+# Uç nokta sınıfı → Cache-Control. Okuyucu sayfaları nadiren değişir, uzun tutulur;
+# seri detayı yeni bölümle değişir, kısa tutulup arka planda tazelenir.
+CACHE_POLICIES = {
+    "list": os.getenv("CACHE_CONTROL_LIST", "public, max-age=30, stale-while-revalidate=60"),
+    "series": os.getenv("CACHE_CONTROL_SERIES", "public, max-age=60, stale-while-revalidate=300"),
+    "reader": os.getenv("CACHE_CONTROL_READER", "public, max-age=300, stale-while-revalidate=86400"),
+    "sitemap": os.getenv("CACHE_CONTROL_SITEMAP", "public, max-age=3600"),
+}
+
+
+def make_etag(*parts) -> str:
+    """
+    Versiyon parçalarından (id, updated_at, komşu bölümler...) güçlü ETag üretir.
+    view_count parçalara dahil değildir: sayaç değişimi yeni sürüm sayılmaz.
+    """
+    raw = "|".join("" if p is None else (p.isoformat() if isinstance(p, datetime.datetime) else str(p)) for p in parts)
+    return '"' + hashlib.blake2b(raw.encode(), digest_size=12).hexdigest() + '"'
+
+
+def last_modified_of(*stamps) -> Optional[datetime.datetime]:
+    """Verilen (naive UTC) zamanların en yenisi; hepsi boşsa None."""
+    stamps = [s for s in stamps if s is not None]
+    return max(stamps) if stamps else None
+
+
+def parse_http_date(value: Optional[str]) -> Optional[datetime.datetime]:
+    """HTTP tarihi → naive UTC datetime (geçersizse None)."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def has_conditions(request: Request) -> bool:
+    """İstek koşullu mu? Değilse ön kontrol sorgusu hiç atılmaz."""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag: Optional[str], last_modified: Optional[datetime.datetime]) -> bool:
+    """
+    RFC 9110 sırası: If-None-Match varsa sadece ona bakılır, yoksa If-Modified-Since.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # If-None-Match zayıf karşılaştırma kullanır
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return any(t == etag or t == "W/" + etag for t in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        since = parse_http_date(if_modified_since)
+        # HTTP tarihi saniye hassasiyetinde
+        return since is not None and last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def validator_headers(etag: Optional[str], last_modified: Optional[datetime.datetime], policy: str) -> dict:
+    headers = {"Cache-Control": CACHE_POLICIES[policy]}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=datetime.timezone.utc), usegmt=True)
+    return headers
+
+
+def not_modified(etag: Optional[str], last_modified: Optional[datetime.datetime], policy: str) -> Response:
+    """Gövdesiz 304 yanıtı (doğrulayıcı header'larıyla birlikte)."""
+    return Response(status_code=304, headers=validator_headers(etag, last_modified, policy))
+
+
+def set_validators(response: Response, etag: Optional[str], last_modified: Optional[datetime.datetime], policy: str):
+    """200 yanıtına ETag / Last-Modified / Cache-Control ekler."""
+    response.headers.update(validator_headers(etag, last_modified, policy))
@@ -0,0 +1,197 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from utils.slug import slug_olustur
+
+IMAGE_EXTENSIONS = (".webp", ".jpg", ".png", ".jpeg")
+MANIFEST_NAME = "manifest.json"
+
+# Okuyucunun episode_images satırı olmayan bölümlerde bot klasörüne bakması.
+# migrations.m004_backfill_episode_images çalıştıktan sonra kapatılabilir.
+FOLDER_FALLBACK = os.getenv("READER_FOLDER_FALLBACK", "1") not in ("0", "false", "False")
+
+
+# --- YARDIMCI: DOĞAL SIRALAMA (1, 2, 10 SORUNU İÇİN) ---
+def natural_sort_key(s):
+    return [int(text) if text.isdigit() else text.lower() for text in re.split('([0-9]+)', s)]
+
+
+@lru_cache(maxsize=4096)
+def _title_slug(title: str) -> str:
+    return slug_olustur(title)
+
+
+# ==========================================
+# 🗂️ BOT KLASÖRÜ RESİM MANİFEST ÖNBELLEĞİ
+# ==========================================
+class ImageManifestCache:
+    """
+    Bot klasörlerindeki (static/images/{slug}/bolum-{n}) sayfa listesinin önbelleği.
+
+    Anahtar klasör yolu, geçerlilik klasörün mtime'ı ile kontrol edilir.
+    mtime kontrolü de en fazla `revalidate` saniyede bir yapılır; bu sürede
+    sıcak bölümler hiç dosya sistemi çağrısı yapmadan çözülür.
+    Klasör listesi değişmişse `manifest.json` yeniden yazılır; süreç yeniden
+    başladığında listdir + sıralama yerine bu dosya okunur.
+
+    Args:
+        revalidate: mtime'ın yeniden kontrol edilme aralığı (saniye)
+        persist: manifest.json okunsun/yazılsın mı
+        max_entries: Bellekte tutulacak en fazla klasör (LRU)
+    """
+
+    def __init__(self, revalidate: float = 30.0, persist: bool = True, max_entries: int = 20000):
+        self.revalidate = revalidate
+        self.persist = persist
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # klasör → (mtime | None, dosyalar | None, son kontrol zamanı)
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Optional[List[str]], float]]" = OrderedDict()
+        # seri klasörü → (var mı, son kontrol zamanı); içerik listelenmez
+        self._dirs: "OrderedDict[str, Tuple[bool, float]]" = OrderedDict()
+        self._hits = 0
+        self._stats = 0
+        self._scans = 0
+        self._manifest_reads = 0
+
+    def _remember(self, folder: str, entry):
+        with self._lock:
+            self._entries[folder] = entry
+            self._entries.move_to_end(folder)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def exists(self, folder: str) -> bool:
+        """Klasör var mı (sonuç `revalidate` süresince önbellekte)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._dirs.get(folder)
+            if entry is not None and now - entry[1] < self.revalidate:
+                self._hits += 1
+                return entry[0]
+
+        found = os.path.isdir(folder)
+        with self._lock:
+            self._dirs[folder] = (found, now)
+            self._dirs.move_to_end(folder)
+            while len(self._dirs) > self.max_entries:
+                self._dirs.popitem(last=False)
+        return found
+
+    def files(self, folder: str) -> Optional[List[str]]:
+        """
+        Klasördeki resim dosyaları (doğal sıralı). Klasör yoksa None.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(folder)
+            if entry is not None and now - entry[2] < self.revalidate:
+                self._entries.move_to_end(folder)
+                self._hits += 1
+                return entry[1]
+
+        self._stats += 1
+        try:
+            mtime = os.stat(folder).st_mtime
+        except OSError:
+            self._remember(folder, (None, None, now))
+            return None
+
+        if entry is not None and entry[0] == mtime:
+            self._remember(folder, (mtime, entry[1], now))
+            return entry[1]
+
+        files = self._read_manifest(folder, mtime)
+        if files is None:
+            files, mtime = self._scan(folder)
+        self._remember(folder, (mtime, files, now))
+        return files
+
+    def _read_manifest(self, folder: str, mtime: float) -> Optional[List[str]]:
+        if not self.persist:
+            return None
+        try:
+            with open(os.path.join(folder, MANIFEST_NAME), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("mtime") != mtime or not isinstance(data.get("files"), list):
+            return None
+        self._manifest_reads += 1
+        return data["files"]
+
+    def _scan(self, folder: str) -> Tuple[List[str], float]:
+        """listdir + doğal sıralama; manifest yazılırsa klasör mtime'ı değiştiği için yeni mtime döner."""
+        self._scans += 1
+        files = [f for f in os.listdir(folder) if f.endswith(IMAGE_EXTENSIONS)]
+        try:
+            files.sort(key=natural_sort_key)
+        except TypeError:
+            files.sort()
+
+        mtime = os.stat(folder).st_mtime
+        if self.persist:
+            path = os.path.join(folder, MANIFEST_NAME)
+            try:
+                # Dosya oluşturmak klasör mtime'ını değiştirir, içeriği yazmak değiştirmez:
+                # önce boş dosyayı oluştur, sonra son mtime'ı içine yaz
+                if not os.path.exists(path):
+                    open(path, "a").close()
+                    mtime = os.stat(folder).st_mtime
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump({"mtime": mtime, "files": files}, f)
+            except OSError as e:
+                # Salt okunur dosya sistemi vb.: sadece bellek önbelleği kullanılır
+                print(f"⚠️ Manifest yazılamadı ({folder}): {e}")
+        return files, mtime
+
+    def episode_images(self, slug: Optional[str], title: str, episode_number: float) -> Tuple[Optional[str], List[str]]:
+        """
+        Bot klasöründeki bölüm sayfaları.
+        Slug klasörü yoksa başlıktan üretilen slug denenir (eski bot klasörleri).
+
+        Returns:
+            (static'e göre klasör yolu, dosya adları) — klasör yoksa (None, [])
+        """
+        if not slug or not self.exists(f"static/images/{slug}"):
+            slug = _title_slug(title)
+
+        chap_num = str(int(episode_number)) if episode_number % 1 == 0 else str(episode_number)
+        folder = f"static/images/{slug}/bolum-{chap_num}"
+        files = self.files(folder)
+        if files is None:
+            return None, []
+        return folder, files
+
+    def invalidate(self, folder: Optional[str] = None):
+        with self._lock:
+            if folder is None:
+                self._entries.clear()
+                self._dirs.clear()
+            else:
+                self._entries.pop(folder, None)
+                self._dirs.pop(folder, None)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": "image_manifest",
+                "folders": len(self._entries),
+                "hits": self._hits,
+                "stats": self._stats,
+                "scans": self._scans,
+                "manifest_reads": self._manifest_reads,
+                "revalidate": self.revalidate,
+            }
+
+
+image_manifest = ImageManifestCache(
+    revalidate=float(os.getenv("IMAGE_MANIFEST_REVALIDATE", "30")),
+    persist=os.getenv("IMAGE_MANIFEST_PERSIST", "1") not in ("0", "false", "False"),
+)
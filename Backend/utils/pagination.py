@@ -0,0 +1,153 @@
+import base64
+import datetime
+import json
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+
+
+# ==========================================
+# 1. CURSOR (Opak sayfa imleci)
+# ==========================================
+def _dump(value: Any):
+    if isinstance(value, datetime.datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _load(value: Any):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(sort: str, value: Any, last_id: int) -> str:
+    """Son satırın (sıralama değeri, id) ikilisini opak bir string'e çevirir."""
+    raw = json.dumps({"s": sort, "v": _dump(value), "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """
+    Cursor'ı çözer.
+
+    Raises:
+        HTTPException(400): Cursor bozuksa veya başka bir sıralamaya aitse
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if data["s"] != sort:
+            raise ValueError("sort uyuşmuyor")
+        return _load(data["v"]), int(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Geçersiz cursor")
+
+
+# ==========================================
+# 2. KEYSET (created_at, id) / (view_count, id) / (title, id)
+# ==========================================
+def keyset_order(col, id_col, descending: bool) -> list:
+    """
+    Keyset sıralaması. NULL yerleşimi PostgreSQL varsayılanıyla aynıdır
+    (DESC → NULLS FIRST, ASC → NULLS LAST) ki btree index kullanılabilsin.
+    """
+    if descending:
+        return [col.desc().nulls_first(), id_col.desc()]
+    return [col.asc().nulls_last(), id_col.asc()]
+
+
+def keyset_filter(col, id_col, value: Any, last_id: int, descending: bool):
+    """`keyset_order` sırasında (value, last_id) satırından SONRA gelen satırlar."""
+    if descending:
+        # NULL'lar başta: NULL grubundan sonra dolu değerler gelir
+        if value is None:
+            return or_(and_(col.is_(None), id_col < last_id), col.isnot(None))
+        return or_(col < value, and_(col == value, id_col < last_id))
+    # NULL'lar sonda
+    if value is None:
+        return and_(col.is_(None), id_col > last_id)
+    return or_(col > value, and_(col == value, id_col > last_id), col.is_(None))
+
+
+def paginate_keyset(query: Query, col, id_col, sort: str, descending: bool,
+                    cursor: Optional[str], limit: int, offset: int = 0) -> Tuple[list, Optional[str]]:
+    """
+    Sorguyu keyset ile sayfalar; OFFSET kullanılmadığı için derin sayfalar da
+    ilk sayfa kadar hızlıdır.
+
+    Args:
+        query: Filtreleri uygulanmış, sıralanmamış sorgu
+        col: Sıralama kolonu
+        id_col: Eşitlik bozucu (primary key) kolonu
+        sort: Sıralama modunun adı (cursor'a gömülür)
+        descending: Azalan sıralama mı
+        cursor: Önceki sayfanın next_cursor değeri (ilk sayfa için None)
+        limit: Sayfa boyutu
+        offset: Eski skip/page parametreleri için; cursor varsa yok sayılır
+
+    Returns:
+        (satırlar, next_cursor) — son sayfada next_cursor None
+    """
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort)
+        query = query.filter(keyset_filter(col, id_col, value, last_id, descending))
+
+    query = query.order_by(*keyset_order(col, id_col, descending))
+    if offset and not cursor:
+        query = query.offset(offset)
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(sort, getattr(last, col.key), getattr(last, id_col.key))
+
+
+# ==========================================
+# 3. TAHMİNİ TOPLAM (COUNT(*) yerine)
+# ==========================================
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON) <sorgu>`; iç sorgunun parametreleri normal bind olarak gider."""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def estimated_count(db: Session, query: Query) -> int:
+    """
+    Admin listeleri için ucuz toplam tahmini.
+    Filtresiz sorguda pg_class.reltuples, filtreli sorguda planner'ın satır
+    tahmini (EXPLAIN) kullanılır. PostgreSQL dışı motorlarda gerçek COUNT yapılır.
+    """
+    if db.bind.dialect.name != "postgresql":
+        return query.order_by(None).count()
+
+    if query.whereclause is None:
+        table_name = query.column_descriptions[0]["entity"].__tablename__
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"), {"t": table_name}
+        ).scalar()
+        # Hiç ANALYZE edilmemiş tablolarda reltuples -1 döner
+        if estimate is not None and estimate >= 0:
+            return int(estimate)
+        return query.order_by(None).count()
+
+    # Arama terimi / tsquery SQL'e gömülmez, sürücüye parametre olarak bağlanır
+    plan = db.execute(Explain(query.order_by(None).statement)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,65 @@
+from typing import Dict, List, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+
+def latest_per_series(db: Session, model, series_col, number_col, series_ids: Sequence[int],
+                      per_series: int, columns: Sequence) -> Dict[int, List[dict]]:
+    """
+    Her seri için yayınlanmış son N bölümü tek sorguda getirir.
+
+        SELECT ... FROM (
+            SELECT <kart kolonları>, ROW_NUMBER() OVER (PARTITION BY seri ORDER BY numara DESC) AS rn
+            FROM bolumler WHERE seri IN (...) AND is_published
+        ) WHERE rn <= N
+
+    Sadece kart kolonları okunur (roman `content` gibi büyük kolonlar hariç),
+    böylece maliyet serinin bölüm sayısına değil sayfa boyutuna bağlı kalır.
+
+    Args:
+        db: Oturum
+        model: Bölüm modeli (WebtoonEpisode / NovelChapter)
+        series_col: Seri FK kolonu (webtoon_id / novel_id)
+        number_col: Sıralama kolonu (episode_number / chapter_number)
+        series_ids: Sayfadaki seri ID'leri
+        per_series: Seri başına bölüm sayısı
+        columns: Döndürülecek kolonlar
+
+    Returns:
+        {seri_id: [bölüm dict, ...]} (büyükten küçüğe numara sırasıyla)
+    """
+    if not series_ids or per_series <= 0:
+        return {}
+
+    rn = func.row_number().over(partition_by=series_col, order_by=number_col.desc().nulls_last()).label("rn")
+    ranked = (
+        select(series_col.label("series_id"), rn, *columns)
+        .where(series_col.in_(series_ids), model.is_published == True)
+        .subquery()
+    )
+    rows = db.execute(
+        select(ranked).where(ranked.c.rn <= per_series).order_by(ranked.c.series_id, ranked.c.rn)
+    ).mappings()
+
+    result: Dict[int, List[dict]] = {}
+    keys = [c.key for c in columns]
+    for row in rows:
+        result.setdefault(row["series_id"], []).append({k: row[k] for k in keys})
+    return result
+
+
+def count_per_series(db: Session, model, series_col, series_ids: Sequence[int]) -> Dict[int, int]:
+    """
+    Sayfadaki seriler için yayınlanmış bölüm sayıları.
+    (series_id, is_published, number) index'i üzerinden index-only scan ile sayılır.
+    """
+    if not series_ids:
+        return {}
+    rows = db.execute(
+        select(series_col, func.count())
+        .where(series_col.in_(series_ids), model.is_published == True)
+        .group_by(series_col)
+    )
+    return {series_id: count for series_id, count in rows}
+
@@ -0,0 +1,148 @@
+import datetime
+import os
+from heapq import merge
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+import models
+from utils.pagination import decode_cursor, encode_cursor
+
+
+# ==========================================
+# 🆕 YENİ ÇIKANLAR (Bölümler + roman bölümleri, created_at sırasıyla)
+# ==========================================
+# tür → (bölüm modeli, seri modeli, FK kolonu, numara kolonu, eşitlikte sabit sıra)
+RELEASE_SOURCES = {
+    "webtoon": (models.WebtoonEpisode, models.Webtoon, "webtoon_id", "episode_number", 0),
+    "novel": (models.NovelChapter, models.Novel, "novel_id", "chapter_number", 1),
+}
+# Gruplama penceresi: aynı serinin bu aralıktaki (UTC, sabit sınırlı) bölümleri tek kayıt olur
+GROUP_WINDOW = datetime.timedelta(hours=float(os.getenv("RELEASES_GROUP_HOURS", "24")))
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+# Sıralama anahtarı (azalan): (created_at, tür sırası, id)
+Key = Tuple[datetime.datetime, int, int]
+
+
+def _published(kind: str, query):
+    chapter, series, fk, _, _ = RELEASE_SOURCES[kind]
+    return query.join(series, series.id == getattr(chapter, fk))\
+                .filter(chapter.is_published == True, series.is_published == True, chapter.created_at.isnot(None))
+
+
+def _decode(cursor: str, sort: str) -> Key:
+    value, last_id = decode_cursor(cursor, sort)
+    try:
+        return datetime.datetime.fromisoformat(value[0]), int(value[1]), last_id
+    except (TypeError, ValueError, IndexError):
+        raise HTTPException(status_code=400, detail="Geçersiz cursor")
+
+
+def _encode(sort: str, key: Key) -> str:
+    return encode_cursor(sort, [key[0].isoformat(), key[1]], key[2])
+
+
+def _after(kind: str, after: Key):
+    """(created_at, sıra, id) azalan sırasında `after`'dan sonra gelen satırlar; tek tür için sıra sabit."""
+    chapter, _, _, _, order = RELEASE_SOURCES[kind]
+    created_at, after_order, after_id = after
+    if order < after_order:
+        return chapter.created_at <= created_at
+    if order > after_order:
+        return chapter.created_at < created_at
+    return or_(chapter.created_at < created_at, and_(chapter.created_at == created_at, chapter.id < after_id))
+
+
+# ---------- Düz akış: k-yollu birleştirme ----------
+def release_page(db: Session, kinds: List[str], cursor: Optional[str], limit: int) -> Tuple[list, Optional[str]]:
+    """
+    Her türden (is_published, created_at, id) index'i üzerinde en fazla `limit + 1`
+    satır okunur ve sıralı listeler heapq.merge ile birleştirilir; OFFSET yok.
+
+    Returns:
+        ([{"content_type", "id", "number", "title", "created_at", "series_id"}], next_cursor)
+    """
+    after = _decode(cursor, "releases") if cursor else None
+    streams = []
+    for kind in kinds:
+        chapter, _, fk, number, order = RELEASE_SOURCES[kind]
+        query = _published(kind, db.query(
+            chapter.id, chapter.title, getattr(chapter, number).label("number"),
+            chapter.created_at, getattr(chapter, fk).label("series_id"),
+        ))
+        if after is not None:
+            query = query.filter(_after(kind, after))
+        rows = query.order_by(chapter.created_at.desc(), chapter.id.desc()).limit(limit + 1).all()
+        streams.append([((row.created_at, order, row.id), kind, row) for row in rows])
+
+    merged = list(merge(*streams, key=lambda entry: entry[0], reverse=True))[:limit + 1]
+    items = [{**row._asdict(), "content_type": kind} for _, kind, row in merged[:limit]]
+    next_cursor = _encode("releases", merged[limit - 1][0]) if len(merged) > limit else None
+    return items, next_cursor
+
+
+# ---------- Seri bazında gruplanmış akış ----------
+def _bucket_start(moment: datetime.datetime) -> datetime.datetime:
+    return _EPOCH + ((moment - _EPOCH) // GROUP_WINDOW) * GROUP_WINDOW
+
+
+def _newest_before(db: Session, kinds: List[str], before: Optional[datetime.datetime]) -> Optional[datetime.datetime]:
+    """`before`'dan önceki en yeni yayın anı (tür başına index'te tek adım)."""
+    newest = None
+    for kind in kinds:
+        chapter = RELEASE_SOURCES[kind][0]
+        query = _published(kind, db.query(func.max(chapter.created_at)))
+        if before is not None:
+            query = query.filter(chapter.created_at < before)
+        value = query.scalar()
+        if value is not None and (newest is None or value > newest):
+            newest = value
+    return newest
+
+
+def _bucket_groups(db: Session, kinds: List[str], start: datetime.datetime) -> list:
+    groups = []
+    for kind in kinds:
+        chapter, _, fk, number, order = RELEASE_SOURCES[kind]
+        series_col, number_col = getattr(chapter, fk), getattr(chapter, number)
+        rows = _published(kind, db.query(
+            series_col.label("series_id"), func.count(chapter.id).label("count"),
+            func.max(chapter.created_at).label("latest_at"), func.max(chapter.id).label("latest_id"),
+            func.min(number_col).label("first_number"), func.max(number_col).label("last_number"),
+        )).filter(chapter.created_at >= start, chapter.created_at < start + GROUP_WINDOW)\
+          .group_by(series_col)\
+          .all()
+        groups.extend(((row.latest_at, order, row.series_id), kind, row) for row in rows)
+    groups.sort(key=lambda group: group[0], reverse=True)
+    return groups
+
+
+def grouped_release_page(db: Session, kinds: List[str], cursor: Optional[str], limit: int) -> Tuple[list, Optional[str]]:
+    """
+    Aynı serinin aynı pencere (RELEASES_GROUP_HOURS, varsayılan gün) içindeki bölümleri tek kayıt:
+    50 bölümlük toplu bot yüklemesi akışı doldurmaz.
+
+    Pencereler yeniden eskiye gezilir; her pencere created_at aralığında index'li bir
+    GROUP BY, boş pencereler max(created_at) ile atlanır. Gruplar pencere içinde en son
+    bölüm zamanına göre sıralanır, cursor son grubun (zaman, tür, seri) anahtarıdır.
+
+    Returns:
+        ([{"content_type", "series_id", "count", "latest_at", "latest_id", "first_number", "last_number"}], next_cursor)
+    """
+    after = _decode(cursor, "releases_series") if cursor else None
+    newest = _newest_before(db, kinds, _bucket_start(after[0]) + GROUP_WINDOW if after else None)
+
+    groups = []
+    while newest is not None and len(groups) <= limit:
+        start = _bucket_start(newest)
+        for group in _bucket_groups(db, kinds, start):
+            if after is None or group[0] < after:
+                groups.append(group)
+        newest = _newest_before(db, kinds, start)
+
+    items = [{**row._asdict(), "content_type": kind} for _, kind, row in groups[:limit]]
+    next_cursor = _encode("releases_series", groups[limit - 1][0]) if len(groups) > limit else None
+    return items, next_cursor
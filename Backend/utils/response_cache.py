@@ -0,0 +1,208 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from utils.http_cache import is_not_modified, parse_http_date
+
+
+# ==========================================
+# 🧊 HTTP YANIT ÖNBELLEĞİ
+# ==========================================
+# Önbelleğe alınan public GET yolları → bağlı oldukları içerik grupları.
+# Grubun versiyonu değişince (commit sonrası) o gruba bağlı tüm anahtarlar geçersiz olur.
+CACHE_RULES = [
+    (re.compile(r"^/webtoons/?$"), ("webtoon",)),
+    (re.compile(r"^/webtoons/[^/]+/?$"), ("webtoon",)),
+    (re.compile(r"^/webtoons/[^/]+/episodes/?$"), ("webtoon",)),
+    (re.compile(r"^/novels/?$"), ("novel",)),
+    (re.compile(r"^/novels/[^/]+/?$"), ("novel",)),
+    (re.compile(r"^/novels/[^/]+/chapters/?$"), ("novel",)),
+    (re.compile(r"^/trending/?$"), ("webtoon", "novel")),
+    (re.compile(r"^/search/?$"), ("webtoon", "novel")),
+    (re.compile(r"^/explore/?$"), ("webtoon",)),
+    (re.compile(r"^/releases/?$"), ("webtoon", "novel")),
+]
+
+# Yanıtla birlikte saklanmayan (isteğe özel) header'lar
+_SKIP_HEADERS = {"content-length", "set-cookie", "date", "server"}
+# 304 yanıtında tekrarlanan header'lar
+_VALIDATOR_HEADERS = {"etag", "last-modified", "cache-control"}
+
+
+class CacheEntry:
+    __slots__ = ("body", "status", "headers", "expires", "view_key")
+
+    def __init__(self, body: bytes, status: int, headers: dict, expires: float,
+                 view_key: Optional[Tuple[str, int]]):
+        self.body = body
+        self.status = status
+        self.headers = headers
+        self.expires = expires
+        self.view_key = view_key
+
+
+class ResponseCache:
+    """
+    Serileştirilmiş yanıt byte'larını tutan LRU önbellek.
+
+    Anahtar: (yol, sıralı query, bağlı grupların versiyonları). Yazma olunca
+    grup versiyonu artar ve eski anahtarlar bir daha eşleşmez; LRU onları
+    zamanla dışarı atar. Aynı veritabanına başka süreçlerin (bot, diğer
+    worker'lar) yazdıkları için `ttl` üst sınırdır.
+
+    Args:
+        max_bytes: Toplam gövde boyutu bütçesi
+        ttl: Bir yanıtın en fazla kaç saniye sunulacağı
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 30.0):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, CacheEntry]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def versions(self, groups: Iterable[str]) -> tuple:
+        """Grupların güncel versiyonları (başka önbellekler de geçerlilik anahtarı olarak kullanır)."""
+        with self._lock:
+            return tuple(self._versions.get(g, 0) for g in groups)
+
+    def key(self, path: str, query: str, groups: Iterable[str]) -> tuple:
+        versions = self.versions(groups)
+        params = "&".join(sorted(query.split("&"))) if query else ""
+        return path, params, versions
+
+    def get(self, key: tuple) -> Optional[CacheEntry]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires <= now:
+                if entry is not None:
+                    self._drop(key)
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key: tuple, entry: CacheEntry):
+        size = len(entry.body)
+        # Bütçenin onda birinden büyük yanıtlar önbelleği tek başına boşaltmasın
+        if size > self.max_bytes // 10:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _drop(self, key: tuple):
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.body)
+
+    def bump(self, groups: Iterable[str]):
+        """Grupların versiyonunu artırır (commit sonrası çağrılır)."""
+        with self._lock:
+            for group in groups:
+                self._versions[group] = self._versions.get(group, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "mode": "response_cache",
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / total, 4) if total else 0.0,
+                "evictions": self._evictions,
+                "versions": dict(self._versions),
+                "ttl": self.ttl,
+            }
+
+
+def match_rule(path: str) -> Optional[tuple]:
+    for pattern, groups in CACHE_RULES:
+        if pattern.match(path):
+            return groups
+    return None
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    CACHE_RULES'a uyan GET isteklerini önbellekten sunar.
+    CORS/Session middleware'lerinin İÇİNDE kalmalıdır (origin'e özel header'lar saklanmasın).
+
+    Detay uç noktaları `request.state.view_key = (tür, id)` bırakır; önbellekten
+    sunulan isteklerde de görüntülenme bu anahtarla sayılır (view_count değeri
+    yanıtta biraz eski kalabilir, sayım kaybolmaz).
+    """
+
+    def __init__(self, app, cache: ResponseCache):
+        super().__init__(app)
+        self.cache = cache
+
+    async def dispatch(self, request: Request, call_next):
+        if request.method != "GET" or "authorization" in request.headers:
+            return await call_next(request)
+
+        path = request.url.path
+        root_path = request.scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        groups = match_rule(path)
+        if groups is None:
+            return await call_next(request)
+
+        key = self.cache.key(path, request.url.query, groups)
+        entry = self.cache.get(key)
+        if entry is not None:
+            if entry.view_key is not None and request.client:
+                from utils.view_tracker import view_tracker
+                # redis/sqlite/shm backend'leri bloklayan I/O yapar; event loop'u tutmasın
+                await run_in_threadpool(view_tracker.record_view, request.client.host, *entry.view_key)
+            # Saklanan doğrulayıcılar istemcinin elindekiyle aynıysa gövde hiç gönderilmez
+            if is_not_modified(request, entry.headers.get("etag"), parse_http_date(entry.headers.get("last-modified"))):
+                validators = {k: v for k, v in entry.headers.items() if k in _VALIDATOR_HEADERS}
+                return Response(status_code=304, headers={**validators, "X-Cache": "HIT"})
+            return Response(entry.body, status_code=entry.status, headers={**entry.headers, "X-Cache": "HIT"})
+
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _SKIP_HEADERS}
+        self.cache.put(key, CacheEntry(
+            body, response.status_code, headers,
+            time.monotonic() + self.cache.ttl, getattr(request.state, "view_key", None),
+        ))
+        return Response(body, status_code=response.status_code, headers={**headers, "X-Cache": "MISS"})
+
+
+response_cache = ResponseCache(
+    max_bytes=int(float(os.getenv("RESPONSE_CACHE_MB", "64")) * 1024 * 1024),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "30")),
+)
@@ -0,0 +1,220 @@
+import html
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, literal_column, or_, text
+from sqlalchemy.orm import Session
+
+import models
+
+
+# ==========================================
+# 🔎 BAŞLIK / ÖZET ARAMASI (PostgreSQL FTS + pg_trgm)
+# ==========================================
+# migrations.m006_search_indexes şunları kurar:
+#   - turkish_unaccent: turkish kök bulucu + unaccent (ş→s, ı→i ...) text search config
+#   - immutable_unaccent(text): index ifadelerinde kullanılabilen unaccent sarmalayıcısı
+#   - search_vector: title (A) + summary (B) üretilen (GENERATED STORED) tsvector kolonu + GIN
+#   - lower(immutable_unaccent(title)) üzerinde gin_trgm_ops index'i (yazım hatası toleransı)
+# Kurulum yoksa (SQLite geliştirme ortamı, migration çalışmamış) ILIKE'a düşülür.
+SEARCH_CONFIG = "turkish_unaccent"
+SEARCH_MODELS = {"webtoon": models.Webtoon, "novel": models.Novel}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_backend: Optional[str] = None
+_chapter_backend: Optional[str] = None
+
+
+def fold(value: str) -> str:
+    """
+    Aksan ve büyük/küçük harf katlama (Türkçe İ/ı dahil): "Şövalye İZİ" → "sovalye izi".
+    DB tarafındaki lower(immutable_unaccent(...)) ile aynı sonucu verir.
+    """
+    value = value.replace("İ", "i").replace("I", "i").replace("ı", "i").lower()
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def search_backend(db: Session) -> str:
+    """
+    "fts": PostgreSQL + search_vector kolonu mevcut, "like": ILIKE yedeği.
+    Sonuç süreç boyunca önbellekte (migration sonrası yeniden başlatma gerekir).
+    """
+    global _backend
+    if _backend is None:
+        backend = "like"
+        if db.get_bind().dialect.name == "postgresql":
+            has_column = db.execute(text(
+                "SELECT 1 FROM information_schema.columns "
+                "WHERE table_name = 'webtoons' AND column_name = 'search_vector'"
+            )).first()
+            if has_column:
+                backend = "fts"
+            else:
+                print("⚠️ search_vector yok (m006 çalışmamış): arama ILIKE ile yapılıyor")
+        _backend = backend
+    return _backend
+
+
+def tsquery_text(term: str) -> Optional[str]:
+    """Kullanıcı girdisi → güvenli prefix tsquery metni: "kılıç ustası" → "kılıç:* & ustası:*"."""
+    tokens = _TOKEN_RE.findall(term)
+    return " & ".join(f"{t}:*" for t in tokens) if tokens else None
+
+
+def _folded_title(model):
+    return func.lower(func.immutable_unaccent(model.title))
+
+
+def search_filter(db: Session, model, term: str):
+    """
+    Başlık/özet arama koşulu. FTS'de `search_vector @@ tsquery OR başlık % terim`
+    (ikisi de index'li, BitmapOr; `%` eşiği pg_trgm.similarity_threshold, varsayılan 0.3);
+    yedekte başlık/özet ILIKE.
+    """
+    if search_backend(db) == "fts":
+        conditions = [_folded_title(model).op("%")(fold(term))]
+        query_text = tsquery_text(term)
+        if query_text:
+            conditions.append(literal_column(f"{model.__tablename__}.search_vector").op("@@")(
+                func.to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), query_text)
+            ))
+        return or_(*conditions)
+    return or_(model.title.ilike(f"%{term}%"), model.summary.ilike(f"%{term}%"))
+
+
+def search_rank(db: Session, model, term: str):
+    """Sıralama skoru: FTS'de ts_rank_cd + başlık trigram benzerliği; yedekte başlık eşleşmesi önde."""
+    if search_backend(db) == "fts":
+        rank = func.similarity(_folded_title(model), fold(term))
+        query_text = tsquery_text(term)
+        if query_text:
+            rank = rank + func.ts_rank_cd(
+                literal_column(f"{model.__tablename__}.search_vector"),
+                func.to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), query_text),
+            )
+        return rank
+    return case((model.title.ilike(f"%{term}%"), 1.0), else_=0.0)
+
+
+def search_series(db: Session, kind: str, term: str, columns: tuple, limit: int) -> List[Tuple[float, object]]:
+    """
+    Tek türde yayınlanmış serileri skora göre arar.
+
+    Returns:
+        [(skor, satır), ...] skor azalan, eşitlikte id azalan
+    """
+    model = SEARCH_MODELS[kind]
+    rank = search_rank(db, model, term).label("rank")
+    rows = db.query(rank, *columns)\
+             .filter(and_(model.is_published == True, search_filter(db, model, term)))\
+             .order_by(rank.desc(), model.id.desc())\
+             .limit(limit)\
+             .all()
+    return [(float(row.rank or 0), row) for row in rows]
+
+
+# ==========================================
+# 📖 BÖLÜM METNİ ARAMASI (novel_chapter_contents.search_vector)
+# ==========================================
+# migrations.m007_chapter_content_search kurar: search_vector kolonu (trigger ile
+# bot INSERT'lerinde dolar), paralel backfill ve GIN index.
+CHAPTER_SEARCH_INDEX = "ix_novel_chapter_contents_search_vector"
+SNIPPET_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=12, MaxFragments=2, FragmentDelimiter= … "
+SNIPPET_RADIUS = 80
+
+
+def chapter_search_backend(db: Session) -> str:
+    """
+    Bölüm metni için "fts" ya da "like"; süreç boyunca önbellekte.
+
+    "fts" için search_vector kolonu yetmez: kolon m007'nin başında eklenir, vektörler
+    sonra doldurulur. GIN index sadece backfill hatasız bitince kurulduğundan, geçerli
+    index varsa tüm bölümlerin vektörü dolu demektir (yoksa NULL vektörlü bölümler
+    aramadan sessizce düşerdi).
+    """
+    global _chapter_backend
+    if _chapter_backend is None:
+        backend = "like"
+        if db.get_bind().dialect.name == "postgresql":
+            has_index = db.execute(text(
+                "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name AND i.indisvalid"
+            ), {"name": CHAPTER_SEARCH_INDEX}).first()
+            if has_index:
+                backend = "fts"
+            else:
+                print(f"⚠️ {CHAPTER_SEARCH_INDEX} yok (m007 çalışmamış / bitmemiş): bölüm araması ILIKE ile yapılıyor")
+        _chapter_backend = backend
+    return _chapter_backend
+
+
+def safe_snippet(snippet: str) -> str:
+    """Bölüm metnini HTML-escape eder, sadece vurgu etiketlerini (<mark>) bırakır."""
+    return html.escape(snippet or "", quote=False).replace("&lt;mark&gt;", "<mark>").replace("&lt;/mark&gt;", "</mark>")
+
+
+def _like_snippet(content: str, term: str) -> str:
+    # Yedek: ilk eşleşmenin çevresi, eşleşme <mark> içinde
+    index = (content or "").lower().find(term.lower())
+    if index < 0:
+        return ""
+    start, end = max(index - SNIPPET_RADIUS, 0), index + len(term)
+    return (
+        ("… " if start else "") + html.escape(content[start:index], quote=False)
+        + "<mark>" + html.escape(content[index:end], quote=False) + "</mark>"
+        + html.escape(content[end:end + SNIPPET_RADIUS], quote=False) + (" …" if end + SNIPPET_RADIUS < len(content) else "")
+    )
+
+
+def search_chapters(db: Session, novel_id: int, term: str, limit: int, skip: int = 0) -> Tuple[str, list]:
+    """
+    Romanın yayındaki bölümlerinde metin araması, bölüm numarasına göre artan
+    (terimin ilk geçtiği bölüm önce).
+
+    FTS'de önce GIN index ile eşleşen bölümlerin sayfası seçilir, ts_headline
+    (pahalı, tüm metni okur) sadece o sayfadaki satırlar için hesaplanır.
+
+    Returns:
+        (backend, [{"id", "chapter_number", "title", "snippet"}, ...]) — en fazla limit + 1 satır
+    """
+    C, T = models.NovelChapter, models.NovelChapterContent
+    backend = chapter_search_backend(db)
+    page_filter = and_(C.novel_id == novel_id, C.is_published == True)
+
+    if backend == "fts":
+        query_text = tsquery_text(term)
+        if not query_text:
+            return backend, []
+        rows = db.execute(text(f"""
+            WITH q AS (SELECT to_tsquery('{SEARCH_CONFIG}'::regconfig, :query) AS query),
+            page AS (
+                SELECT c.id, c.chapter_number, c.title
+                FROM novel_chapter_contents t
+                JOIN novel_chapters c ON c.id = t.chapter_id, q
+                WHERE c.novel_id = :novel_id AND c.is_published = TRUE AND t.search_vector @@ q.query
+                ORDER BY c.chapter_number
+                LIMIT :limit OFFSET :skip
+            )
+            SELECT page.id, page.chapter_number, page.title,
+                   ts_headline('{SEARCH_CONFIG}'::regconfig, t.content, q.query, :options) AS snippet
+            FROM page JOIN novel_chapter_contents t ON t.chapter_id = page.id, q
+            ORDER BY page.chapter_number
+        """), {"query": query_text, "novel_id": novel_id, "limit": limit + 1, "skip": skip, "options": SNIPPET_OPTIONS}).all()
+        return backend, [
+            {"id": row.id, "chapter_number": row.chapter_number, "title": row.title, "snippet": safe_snippet(row.snippet)}
+            for row in rows
+        ]
+
+    rows = db.query(C.id, C.chapter_number, C.title, T.content)\
+             .join(T, T.chapter_id == C.id)\
+             .filter(page_filter, T.content.ilike(f"%{term}%"))\
+             .order_by(C.chapter_number)\
+             .offset(skip)\
+             .limit(limit + 1)\
+             .all()
+    return backend, [
+        {"id": row.id, "chapter_number": row.chapter_number, "title": row.title, "snippet": _like_snippet(row.content, term)}
+        for row in rows
+    ]
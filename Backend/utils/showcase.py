@@ -0,0 +1,140 @@
+import os
+import random
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+import models
+import signals
+from utils.single_flight import single_flight
+
+
+# ==========================================
+# 🎠 VİTRİN (Anasayfa slider'ı, bellekte hazır liste)
+# ==========================================
+# Slider açıklamayı 2-3 satırla kırpıyor; tam özet taşınmaz
+SUMMARY_LIMIT = 300
+
+# tür → (model, slider'da gösterilen kolonlar, sabit alanlar)
+SHOWCASE_SOURCES = {
+    "webtoon": (
+        models.Webtoon,
+        ("id", "title", "slug", "banner_image", "cover_image", "summary", "view_count", "status"),
+        {"type": "webtoon", "typeLabel": "WEBTOON", "bg_color": "blue"},
+    ),
+    "novel": (
+        models.Novel,
+        ("id", "title", "slug", "cover_image", "summary", "view_count", "status"),
+        {"type": "novel", "typeLabel": "NOVEL", "bg_color": "purple"},
+    ),
+}
+
+# Bu modellerde vitrin alanlarından biri ORM ile değişirse (ya da seri eklenip silinirse) liste yeniden hazırlanır
+SHOWCASE_MODELS = (models.Webtoon, models.Novel)
+SHOWCASE_FIELDS = {"is_featured", "is_published", "title", "slug", "banner_image", "cover_image", "summary", "status"}
+
+
+def _trim(summary: Optional[str]) -> Optional[str]:
+    if not summary or len(summary) <= SUMMARY_LIMIT:
+        return summary
+    return summary[:SUMMARY_LIMIT].rsplit(" ", 1)[0] + "…"
+
+
+class Showcase:
+    """
+    Öne çıkarılmış (is_featured) ve yayındaki seriler, değişiklik başına bir kez
+    hazırlanıp bellekte tutulan kompakt liste olarak.
+
+    İstek sadece hazır dizinin karıştırılmış kopyasını döner, DB'ye gitmez.
+    Liste admin router'ı veya SQLAdmin'de vitrinle ilgili bir alan değişip commit
+    olunca düşürülür; ORM dışı yazmalar (bot) ve view_count için `ttl` saniyede bir yenilenir.
+
+    Args:
+        ttl: Değişiklik olmasa da listenin yeniden hazırlanma aralığı (saniye)
+    """
+
+    def __init__(self, ttl: float = 600.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._items: Optional[Tuple[dict, ...]] = None
+        self.built_at: Optional[float] = None
+        self.builds = 0
+        self.invalidations = 0
+        self.served = 0
+
+    def build(self, db: Session) -> Tuple[dict, ...]:
+        items = []
+        for model, fields, extra in SHOWCASE_SOURCES.values():
+            rows = db.query(*(getattr(model, f) for f in fields))\
+                     .filter(model.is_featured == True, model.is_published == True)\
+                     .all()
+            for row in rows:
+                item = row._asdict()
+                item.setdefault("banner_image", item["cover_image"])
+                item["summary"] = _trim(item["summary"])
+                item["view_count"] = item["view_count"] or 0
+                item["status"] = item["status"] or "ongoing"
+                items.append({**item, **extra})
+        items = tuple(items)
+        with self._lock:
+            self._items = items
+            self.built_at = time.monotonic()
+            self.builds += 1
+        return items
+
+    def _load(self) -> Tuple[dict, ...]:
+        from database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            return self.build(db)
+        finally:
+            db.close()
+
+    def items(self) -> List[dict]:
+        """Vitrin listesi, her istekte farklı sırayla (öğeler salt okunur paylaşılır)."""
+        with self._lock:
+            items, built_at = self._items, self.built_at
+            self.served += 1
+        if items is None or time.monotonic() - built_at > self.ttl:
+            # Eşzamanlı istekler tek hazırlamayı bekler
+            items = single_flight.do(("showcase", "build"), self._load)
+        return random.sample(items, len(items))
+
+    def invalidate(self):
+        with self._lock:
+            self._items = None
+            self.invalidations += 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": "showcase",
+                "items": len(self._items) if self._items is not None else None,
+                "age": round(time.monotonic() - self.built_at, 1) if self.built_at else None,
+                "builds": self.builds,
+                "invalidations": self.invalidations,
+                "served": self.served,
+                "ttl": self.ttl,
+            }
+
+
+# ==========================================
+# 🔔 ORM OLAYLARI → COMMIT SONRASI DÜŞÜRME
+# ==========================================
+def _touches_showcase(obj) -> bool:
+    state = sa_inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in SHOWCASE_FIELDS if field in state.attrs)
+
+
+def _collect(obj, op: str) -> Optional[bool]:
+    # Flush anında öznitelik geçmişi henüz sıfırlanmamıştır
+    return True if op != "dirty" or _touches_showcase(obj) else None
+
+
+showcase = Showcase(ttl=float(os.getenv("VITRIN_TTL", "600")))
+
+signals.on_commit(SHOWCASE_MODELS, lambda changed: showcase.invalidate(), collect=_collect)
@@ -0,0 +1,110 @@
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+# ==========================================
+# 🛫 SINGLE-FLIGHT (Eşzamanlı yükleme birleştirme)
+# ==========================================
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Aynı anahtar için eşzamanlı yüklemeleri tek yüklemede birleştirir.
+
+    İlk gelen istek (lider) yükleyiciyi çalıştırır; o sürerken aynı anahtarı
+    isteyenler sonucu bekler ve aynı nesneyi paylaşır. Yükleme bitince anahtar
+    silinir, yani bu bir önbellek değildir: sadece aynı anda uçuşta olan
+    istekler birleşir. Lider hata verirse (404 dahil) bekleyenler aynı hatayı alır.
+
+    Senkron endpoint'ler thread havuzunda çalıştığı için bekleme threading.Event
+    ile yapılır. Bekleyen `timeout` saniyede sonuç alamazsa yükleyiciyi kendisi çalıştırır.
+
+    Args:
+        timeout: Bekleyenlerin lideri en fazla bekleme süresi (saniye)
+    """
+
+    def __init__(self, timeout: float = 10.0):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        # anahtarın ilk elemanı (tür) → sayaçlar
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, key: Hashable, field: str, amount: int = 1):
+        kind = str(key[0]) if isinstance(key, tuple) and key else str(key)
+        counters = self._metrics.setdefault(kind, {"leaders": 0, "coalesced": 0, "errors": 0, "timeouts": 0, "max_waiters": 0})
+        if field == "max_waiters":
+            counters[field] = max(counters[field], amount)
+        else:
+            counters[field] += amount
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._count(key, "leaders")
+            else:
+                call.waiters += 1
+                self._count(key, "coalesced")
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                with self._lock:
+                    self._count(key, "timeouts")
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self._count(key, "errors")
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                self._count(key, "max_waiters", call.waiters)
+            call.done.set()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            by_kind = {kind: dict(counters) for kind, counters in self._metrics.items()}
+            in_flight = len(self._calls)
+        leaders = sum(c["leaders"] for c in by_kind.values())
+        coalesced = sum(c["coalesced"] for c in by_kind.values())
+        return {
+            "mode": "single_flight",
+            "in_flight": in_flight,
+            "leaders": leaders,
+            "coalesced": coalesced,
+            # Yüklemelerin yüzde kaçı başka bir isteğin sonucundan karşılandı
+            "coalesce_rate": round(coalesced / (leaders + coalesced), 4) if leaders + coalesced else 0.0,
+            "by_kind": by_kind,
+            "timeout": self.timeout,
+        }
+
+
+def render_json(payload: Any) -> bytes:
+    """Yanıt gövdesini bir kez JSON'a çevirir (FastAPI'nin varsayılan JSONResponse çıktısıyla aynı)."""
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+single_flight = SingleFlight(timeout=float(os.getenv("SINGLE_FLIGHT_TIMEOUT", "10")))
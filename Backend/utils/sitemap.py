@@ -0,0 +1,265 @@
+import datetime
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Iterator, List, Optional, Tuple
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+from sqlalchemy import func, select
+
+import models
+from utils.response_cache import response_cache
+from utils.single_flight import single_flight
+
+
+# ==========================================
+# 🗺️ SITEMAP (Index + id aralığına bölünmüş parçalar)
+# ==========================================
+SITE_URL = (os.getenv("SITE_URL") or "https://kaosmanga.net").rstrip("/")
+# Protokol sınırı parça başına 50.000 URL
+SHARD_SIZE = min(int(os.getenv("SITEMAP_SHARD_SIZE", "10000")), 50000)
+STATIC_PAGES = ("/", "/kesfet", "/seriler", "/yeniler")
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XMLNS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def _chapter_number(value) -> str:
+    """5.0 → "5", 1.5 → "1.5" (frontend'in bölüm linkleriyle aynı)."""
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+def _path(*parts) -> str:
+    return "/" + "/".join(quote(str(p), safe="") for p in parts)
+
+
+def _webtoons():
+    W = models.Webtoon
+    return W.id, select(W.id, W.slug, func.coalesce(W.updated_at, W.created_at).label("lastmod"))\
+        .where(W.is_published == True, W.slug.isnot(None))
+
+
+def _novels():
+    N = models.Novel
+    return N.id, select(N.id, N.slug, func.coalesce(N.updated_at, N.created_at).label("lastmod"))\
+        .where(N.is_published == True, N.slug.isnot(None))
+
+
+def _episodes():
+    E, W = models.WebtoonEpisode, models.Webtoon
+    return E.id, select(E.id, W.slug, func.coalesce(E.updated_at, E.created_at).label("lastmod"))\
+        .join(W, W.id == E.webtoon_id)\
+        .where(E.is_published == True, W.is_published == True, W.slug.isnot(None))
+
+
+def _chapters():
+    C, N = models.NovelChapter, models.Novel
+    return C.id, select(C.id, N.slug, C.chapter_number, func.coalesce(C.updated_at, C.created_at).label("lastmod"))\
+        .join(N, N.id == C.novel_id)\
+        .where(C.is_published == True, N.is_published == True, N.slug.isnot(None), C.chapter_number.isnot(None))
+
+
+# tür → (sorgu kurucu, satır → URL yolu, bağlı önbellek grupları)
+SITEMAP_SOURCES = {
+    "webtoons": (_webtoons, lambda row: _path("webtoon", row.slug), ("webtoon",)),
+    "novels": (_novels, lambda row: _path("novel", row.slug), ("novel",)),
+    "episodes": (_episodes, lambda row: _path("webtoon", row.slug, "bolum", row.id), ("webtoon",)),
+    "chapters": (_chapters, lambda row: _path("novel", row.slug, "bolum", _chapter_number(row.chapter_number)), ("novel",)),
+}
+PAGES = "pages"
+INDEX_GROUPS = ("webtoon", "novel")
+
+
+def _url(loc: str, lastmod: Optional[datetime.datetime]) -> str:
+    if lastmod is None:
+        return f"<url><loc>{escape(loc)}</loc></url>\n"
+    return f"<url><loc>{escape(loc)}</loc><lastmod>{lastmod.date().isoformat()}</lastmod></url>\n"
+
+
+class SitemapBuilder:
+    """
+    Sitemap index'i ve parçaları, gzip'li olarak.
+
+    Parçalar id aralıklarıdır (`{tür}-{n}` = id ∈ [n·shard_size + 1, (n+1)·shard_size]):
+    parça sınırı için OFFSET gerekmez, yeni eklenen satırlar eski parçaları kaydırmaz.
+    Parça, sunucu tarafı cursor'dan (yield_per) satır satır okunup artımlı gzip'lenerek
+    yayınlanır; katalog belleğe alınmaz, sadece bitmiş parçanın sıkıştırılmış hali
+    önbelleğe yazılır. Önbellek ilgili içerik grubu (webtoon / novel) commit ile
+    değişince geçersiz olur; ORM dışı yazmalar (bot) için `ttl` saniyede bir yenilenir.
+
+    Args:
+        shard_size: Parça başına id aralığı (≤ 50.000)
+        ttl: Değişiklik olmasa da index/parçaların yeniden üretilme aralığı (saniye)
+        max_bytes: Sıkıştırılmış parçalar için bellek bütçesi
+        yield_per: Sunucu tarafı cursor'dan tek seferde çekilen satır sayısı
+        gzip_level: Sıkıştırma seviyesi (1-9)
+    """
+
+    def __init__(self, shard_size: int = SHARD_SIZE, ttl: float = 3600.0, max_bytes: int = 32 * 1024 * 1024,
+                 yield_per: int = 1000, gzip_level: int = 6):
+        self.shard_size = shard_size
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.yield_per = yield_per
+        self.gzip_level = gzip_level
+        self._lock = threading.Lock()
+        # (tür, n) → (gzip gövdesi, son geçerlilik, grup versiyonları)
+        self._cache: "OrderedDict[tuple, Tuple[bytes, float, tuple]]" = OrderedDict()
+        self._bytes = 0
+        # Index: (gzip gövdesi, mevcut parçalar, son geçerlilik, versiyonlar)
+        self._index: Optional[Tuple[bytes, frozenset, float, tuple]] = None
+        self.hits = 0
+        self.streams = 0
+        self.index_builds = 0
+        self.last_stream_duration = 0.0
+
+    # ---------- Önbellek ----------
+    def _get(self, key: tuple, groups: tuple) -> Optional[bytes]:
+        versions = response_cache.versions(groups)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or entry[1] <= time.monotonic() or entry[2] != versions:
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def _put(self, key: tuple, body: bytes, versions: tuple):
+        with self._lock:
+            old = self._cache.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[0])
+            self._cache[key] = (body, time.monotonic() + self.ttl, versions)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes and len(self._cache) > 1:
+                _, (evicted, _, _) = self._cache.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    # ---------- Index ----------
+    def _shard_lastmods(self, conn) -> List[Tuple[str, int, Optional[datetime.datetime]]]:
+        """Her türün dolu parçaları ve parça içindeki en son değişiklik (id'ye göre GROUP BY, satır taşınmaz)."""
+        shards = []
+        for kind, (build, _, _) in SITEMAP_SOURCES.items():
+            subquery = build()[1].subquery()
+            shard = ((subquery.c.id - 1) // self.shard_size).label("shard")
+            rows = conn.execute(
+                select(shard, func.max(subquery.c.lastmod)).group_by(shard).order_by(shard)
+            ).all()
+            shards.extend((kind, int(n), lastmod) for n, lastmod in rows)
+        return shards
+
+    def _build_index(self) -> Tuple[bytes, frozenset, float, tuple]:
+        from database import engine
+
+        # Versiyonlar sorgudan ÖNCE okunur: bu sırada commit olursa sonraki istek yeniler
+        versions = response_cache.versions(INDEX_GROUPS)
+        with engine.connect() as conn:
+            shards = [(PAGES, 0, None)] + self._shard_lastmods(conn)
+
+        parts = [XML_HEADER, f"<sitemapindex {XMLNS}>\n"]
+        for kind, n, lastmod in shards:
+            loc = escape(f"{SITE_URL}/sitemaps/{kind}-{n}.xml")
+            mod = f"<lastmod>{lastmod.date().isoformat()}</lastmod>" if lastmod else ""
+            parts.append(f"<sitemap><loc>{loc}</loc>{mod}</sitemap>\n")
+        parts.append("</sitemapindex>\n")
+
+        body = zlib.compress("".join(parts).encode(), self.gzip_level, wbits=31)
+        index = (body, frozenset((kind, n) for kind, n, _ in shards), time.monotonic() + self.ttl, versions)
+        with self._lock:
+            self._index = index
+            self.index_builds += 1
+        return index
+
+    def _current_index(self) -> Tuple[bytes, frozenset, float, tuple]:
+        index = self._index
+        if index is None or index[2] <= time.monotonic() or index[3] != response_cache.versions(INDEX_GROUPS):
+            # Eşzamanlı crawler istekleri tek index sorgusunu bekler
+            index = single_flight.do(("sitemap", "index"), self._build_index)
+        return index
+
+    def index(self) -> bytes:
+        """Sitemap index'i (gzip)."""
+        return self._current_index()[0]
+
+    def has_shard(self, kind: str, n: int) -> bool:
+        return (kind, n) in self._current_index()[1]
+
+    # ---------- Parçalar ----------
+    def cached(self, kind: str, n: int) -> Optional[bytes]:
+        """Önbellekteki parça (gzip) ya da None."""
+        groups = SITEMAP_SOURCES[kind][2] if kind in SITEMAP_SOURCES else ()
+        return self._get((kind, n), groups)
+
+    def _lines(self, kind: str, n: int) -> Iterator[str]:
+        yield XML_HEADER
+        yield f"<urlset {XMLNS}>\n"
+        if kind == PAGES:
+            for page in STATIC_PAGES:
+                yield _url(SITE_URL + page, None)
+        else:
+            from database import engine
+
+            build, to_path, _ = SITEMAP_SOURCES[kind]
+            id_col, query = build()
+            query = query.where(id_col > n * self.shard_size, id_col <= (n + 1) * self.shard_size).order_by(id_col)
+            with engine.connect() as conn:
+                # yield_per: Postgres'te sunucu tarafı (named) cursor, satırlar parti parti gelir
+                for row in conn.execution_options(yield_per=self.yield_per).execute(query):
+                    yield _url(SITE_URL + to_path(row), row.lastmod)
+        yield "</urlset>\n"
+
+    def stream(self, kind: str, n: int, compress: bool = True) -> Iterator[bytes]:
+        """
+        Parçayı üretirken yayınlar. Sıkıştırılmış akış sonuna kadar okunursa
+        gövde önbelleğe yazılır (yarıda kopan bağlantı önbelleğe bir şey bırakmaz).
+        """
+        groups = SITEMAP_SOURCES[kind][2] if kind in SITEMAP_SOURCES else ()
+        versions = response_cache.versions(groups)
+        started = time.perf_counter()
+        if not compress:
+            for line in self._lines(kind, n):
+                yield line.encode()
+            return
+
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        chunks = []
+        for line in self._lines(kind, n):
+            chunk = compressor.compress(line.encode())
+            if chunk:
+                chunks.append(chunk)
+                yield chunk
+        chunk = compressor.flush()
+        chunks.append(chunk)
+        yield chunk
+
+        self._put((kind, n), b"".join(chunks), versions)
+        with self._lock:
+            self.streams += 1
+            self.last_stream_duration = time.perf_counter() - started
+
+    def get_stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            index = self._index
+            return {
+                "mode": "sitemap",
+                "shard_size": self.shard_size,
+                "shards": len(index[1]) if index else None,
+                "index_age": round(self.ttl - (index[2] - now), 1) if index else None,
+                "cached_shards": len(self._cache),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "streams": self.streams,
+                "index_builds": self.index_builds,
+                "last_stream_ms": round(self.last_stream_duration * 1000, 2),
+            }
+
+
+sitemap_builder = SitemapBuilder(
+    ttl=float(os.getenv("SITEMAP_TTL", "3600")),
+    max_bytes=int(float(os.getenv("SITEMAP_CACHE_MB", "32")) * 1024 * 1024),
+)
@@ -0,0 +1,11 @@
+import re
+
+
+# --- YARDIMCI FONKSİYON: SLUG OLUŞTURUCU ---
+def slug_olustur(text: str):
+    text = text.lower() # Küçük harfe çevir
+    # Türkçe karakterleri İngilizce karşılıklarına çevir
+    text = text.replace("ı", "i").replace("ğ", "g").replace("ü", "u").replace("ş", "s").replace("ö", "o").replace("ç", "c")
+    text = re.sub(r'[^a-z0-9\s-]', '', text) # Harf, sayı ve tire dışındakileri sil
+    text = re.sub(r'[\s-]+', '-', text)      # Boşlukları tire yap
+    return text.strip('-')
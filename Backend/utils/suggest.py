@@ -0,0 +1,213 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from heapq import nsmallest
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+import models
+import signals
+from utils.single_flight import single_flight
+from utils.slug import slug_olustur
+
+
+# ==========================================
+# ⌨️ ARAMA ÖNERİLERİ (Süreç içi prefix index)
+# ==========================================
+# tür → seri modeli; sonuçta dönen alanlar
+SUGGEST_MODELS = {"webtoon": models.Webtoon, "novel": models.Novel}
+SUGGEST_FIELDS = ("id", "title", "slug", "cover_image", "view_count")
+
+Ref = Tuple[str, int]  # (tür, id)
+
+
+def normalize(title: str) -> List[str]:
+    """Başlık → slug_olustur ile katlanmış kelimeler: "Kılıç Ustası" → ["kilic", "ustasi"]."""
+    return [word for word in slug_olustur(title or "").split("-") if word]
+
+
+class SuggestIndex:
+    """
+    Yayındaki seri başlıklarının sıralı dizi (sorted array) index'i.
+
+    İki sıralı dizi çifti tutulur: başlığın her kelimesi (`_tokens` / `_refs`) ve
+    başlığın tamamı (`_heads` / `_head_refs`, kelimeler boşlukla). Bir prefix'in
+    eşleşmeleri iki bisect ile bulunan bitişik bir dilimdir; en iyi `limit` öğe
+    önceden hesaplanmış sıralama anahtarıyla `heapq.nsmallest` ile seçilir.
+    Önce başlığı sorguyla başlayanlar, yetmezse kelimelerinden biri başlayanlar gelir;
+    çok kelimeli sorguda kelime dilimlerinin kesişimi alınır.
+
+    Değişiklikler (ORM insert/update/delete) commit sonrası tek seri için
+    uygulanır; ORM dışı yazmalar (bot) için `ttl` saniyede bir tamamen yeniden kurulur.
+
+    Args:
+        ttl: Tam yeniden kurma aralığı (saniye)
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tokens: List[str] = []
+        self._refs: List[Ref] = []
+        self._heads: List[str] = []
+        self._head_refs: List[Ref] = []
+        self._docs: Dict[Ref, dict] = {}
+        self._words: Dict[Ref, List[str]] = {}
+        # ref → (-view_count, katlanmış başlık, ref): küçük olan önde
+        self._rank: Dict[Ref, tuple] = {}
+        self.built_at: Optional[float] = None
+        self._rebuilds = 0
+        self._updates = 0
+        self._queries = 0
+
+    # ---------- Kurma / güncelleme ----------
+    @staticmethod
+    def _rank_key(ref: Ref, doc: dict, words: List[str]) -> tuple:
+        return (-(doc.get("view_count") or 0), " ".join(words), ref)
+
+    def build(self, docs: Dict[Ref, dict], now: Optional[float] = None):
+        """Tüm index'i verilen {(tür, id): alanlar} ile baştan kurar."""
+        words = {ref: normalize(doc["title"]) for ref, doc in docs.items()}
+        tokens = sorted({(word, ref) for ref, w in words.items() for word in w})
+        heads = sorted((" ".join(w), ref) for ref, w in words.items() if w)
+        rank = {ref: self._rank_key(ref, docs[ref], w) for ref, w in words.items()}
+        with self._lock:
+            self._tokens = [t for t, _ in tokens]
+            self._refs = [r for _, r in tokens]
+            self._heads = [h for h, _ in heads]
+            self._head_refs = [r for _, r in heads]
+            self._docs, self._words, self._rank = docs, words, rank
+            self.built_at = time.monotonic() if now is None else now
+            self._rebuilds += 1
+
+    def rebuild(self, db: Session):
+        docs = {}
+        for kind, model in SUGGEST_MODELS.items():
+            rows = db.query(*(getattr(model, f) for f in SUGGEST_FIELDS)).filter(model.is_published == True).all()
+            for row in rows:
+                docs[(kind, row.id)] = row._asdict()
+        self.build(docs)
+
+    @staticmethod
+    def _position(keys: List[str], refs: List[Ref], key: str, ref: Ref) -> int:
+        i = bisect_left(keys, key)
+        while i < len(keys) and keys[i] == key and refs[i] < ref:
+            i += 1
+        return i
+
+    def _insert(self, keys: List[str], refs: List[Ref], key: str, ref: Ref):
+        i = self._position(keys, refs, key, ref)
+        keys.insert(i, key)
+        refs.insert(i, ref)
+
+    def _delete(self, keys: List[str], refs: List[Ref], key: str, ref: Ref):
+        i = self._position(keys, refs, key, ref)
+        if i < len(keys) and keys[i] == key and refs[i] == ref:
+            del keys[i]
+            del refs[i]
+
+    def upsert(self, ref: Ref, doc: Optional[dict]):
+        """Tek seriyi günceller; `doc` None ise (silindi / yayından kalktı) çıkarır."""
+        with self._lock:
+            old = self._words.pop(ref, None)
+            if old is not None:
+                for word in set(old):
+                    self._delete(self._tokens, self._refs, word, ref)
+                if old:
+                    self._delete(self._heads, self._head_refs, " ".join(old), ref)
+                self._docs.pop(ref, None)
+                self._rank.pop(ref, None)
+            if doc is not None:
+                words = normalize(doc["title"])
+                for word in set(words):
+                    self._insert(self._tokens, self._refs, word, ref)
+                if words:
+                    self._insert(self._heads, self._head_refs, " ".join(words), ref)
+                self._docs[ref] = doc
+                self._words[ref] = words
+                self._rank[ref] = self._rank_key(ref, doc, words)
+            self._updates += 1
+
+    def ensure(self, db: Session):
+        """Hiç kurulmadıysa ya da `ttl` dolduysa yeniden kurar (eşzamanlı istekler tek kurulumu bekler)."""
+        if self.built_at is None or time.monotonic() - self.built_at > self.ttl:
+            single_flight.do(("suggest", "rebuild"), lambda: self.rebuild(db))
+
+    # ---------- Sorgu ----------
+    @staticmethod
+    def _span(keys: List[str], prefix: str) -> Tuple[int, int]:
+        # Katlanmış metin sadece [a-z0-9 ] içerir, "\uffff" her devamdan büyüktür
+        return bisect_left(keys, prefix), bisect_left(keys, prefix + "\uffff")
+
+    def suggest(self, query: str, limit: int = 8, kind: Optional[str] = None) -> List[dict]:
+        """
+        Sorgu kelimelerinin hepsi başlık kelimelerinde prefix olan seriler.
+        Sıra: başlığın tamamı sorguyla başlayanlar önce, sonra view_count, sonra başlık.
+        """
+        terms = normalize(query)
+        if not terms:
+            return []
+        with self._lock:
+            # build() _rank'i dizilerle birlikte değiştirir: ikisi aynı kilit altında okunmalı
+            rank = self._rank.__getitem__
+            self._queries += 1
+            lo, hi = self._span(self._heads, " ".join(terms))
+            starts = self._head_refs[lo:hi]
+            if kind:
+                starts = [ref for ref in starts if ref[0] == kind]
+            best = nsmallest(limit, starts, key=rank)
+
+            if len(best) < limit:
+                # Her kelimenin dilimi bir aday kümesi; en dardan başlayıp kesiştirilir (C seviyesinde küme işlemleri)
+                spans = sorted((self._span(self._tokens, t) for t in set(terms)), key=lambda s: s[1] - s[0])
+                lo, hi = spans[0]
+                candidates = set(self._refs[lo:hi])
+                for lo, hi in spans[1:]:
+                    if not candidates:
+                        break
+                    candidates.intersection_update(self._refs[lo:hi])
+                candidates.difference_update(starts)
+                if kind:
+                    candidates = [ref for ref in candidates if ref[0] == kind]
+                best += nsmallest(limit - len(best), candidates, key=rank)
+
+            return [{**self._docs[ref], "content_type": ref[0]} for ref in best]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": "suggest_index",
+                "series": len(self._docs),
+                "keys": len(self._tokens) + len(self._heads),
+                "rebuilds": self._rebuilds,
+                "updates": self._updates,
+                "queries": self._queries,
+                "age": round(time.monotonic() - self.built_at, 1) if self.built_at else None,
+                "ttl": self.ttl,
+            }
+
+
+# ==========================================
+# 🔔 ORM OLAYLARI → COMMIT SONRASI ARTIMLI GÜNCELLEME
+# ==========================================
+def _collect(kind: str):
+    def collect(obj, op: str):
+        # Doküman flush anında alınır; commit sonrası nesne expire olmuştur
+        doc = {f: getattr(obj, f) for f in SUGGEST_FIELDS} if op != "deleted" and obj.is_published else None
+        return (kind, obj.id), doc
+    return collect
+
+
+def _apply(changes: List[Tuple[Tuple[str, int], Optional[dict]]]):
+    # Index henüz kurulmadıysa ilk istek zaten güncel hali okuyacak
+    if suggest_index.built_at is not None:
+        for ref, doc in dict(changes).items():
+            suggest_index.upsert(ref, doc)
+
+
+suggest_index = SuggestIndex(ttl=float(os.getenv("SUGGEST_INDEX_TTL", "300")))
+
+for _kind, _model in SUGGEST_MODELS.items():
+    signals.on_commit((_model,), _apply, collect=_collect(_kind))
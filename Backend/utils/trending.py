@@ -0,0 +1,275 @@
+import datetime
+import math
+import os
+import threading
+import time
+from bisect import bisect_right
+from heapq import merge
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Query
+
+import models
+from utils.pagination import decode_cursor, encode_cursor
+from utils.single_flight import single_flight
+
+
+# ==========================================
+# 📈 TRENDING SIRALAMASI (Zamanla sönümlenen skor)
+# ==========================================
+# tür → (seri modeli, sıralamada eşitlik için sabit sıra)
+KINDS = {
+    "webtoon": (models.Webtoon, 0),
+    "novel": (models.Novel, 1),
+}
+
+# Sıralama anahtarı (artan sıralanır): (-skor, -toplam view, tür sırası, -id)
+Key = Tuple[float, int, int, int]
+Item = Tuple[str, int, float]  # (tür, id, skor)
+
+
+class Ranking:
+    """Tek bir sıralamanın (webtoon / novel / hepsi) sıralı anahtar ve öğe dizileri."""
+
+    __slots__ = ("keys", "items")
+
+    def __init__(self, entries: List[Tuple[Key, Item]]):
+        self.keys = [e[0] for e in entries]
+        self.items = [e[1] for e in entries]
+
+    def page(self, after: Optional[Key], limit: int, offset: int = 0) -> Tuple[List[Item], Optional[Key]]:
+        """
+        `after` anahtarından sonraki `limit` öğe; bisect + dilim, yani O(log n + sayfa).
+        Sıralama yeniden hesaplanmış olsa da cursor anahtarı yeni dizide doğru yere düşer.
+        """
+        start = bisect_right(self.keys, after) if after is not None else 0
+        start += offset
+        end = min(start + limit, len(self.keys))
+        items = self.items[start:end]
+        next_key = self.keys[end - 1] if end < len(self.keys) and items else None
+        return items, next_key
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+def decayed_scores(ids: list, ages_hours: list, views: list, half_life: float) -> Dict[int, float]:
+    """
+    skor(id) = Σ görüntülenme · 2^(-yaş / yarı ömür)
+
+    Vektörel: np.exp ile ağırlıklar, np.bincount ile seri başına toplam.
+    """
+    if not ids:
+        return {}
+    rate = math.log(2) / half_life
+    id_arr = np.asarray(ids, dtype=np.int64)
+    weights = np.asarray(views, dtype=np.float64) * np.exp(-rate * np.asarray(ages_hours, dtype=np.float64))
+    unique_ids, inverse = np.unique(id_arr, return_inverse=True)
+    totals = np.bincount(inverse, weights=weights)
+    return dict(zip(unique_ids.tolist(), totals.tolist()))
+
+
+class TrendingRanker:
+    """
+    Periyodik trending hesaplayıcı.
+
+    view_counter her flush'ta artışları `content_view_buckets` tablosuna saatlik
+    kovalar halinde yazar. Bu iş her `interval` saniyede son `window_hours`
+    saatin kovalarını okur, yarı ömrü `half_life_hours` olan üstel sönümle
+    seri başına skor hesaplar ve sonucu bellekte sıralı dizilere koyar.
+    Roman skoru roman detay + bölüm okumalarından oluşur.
+
+    Kovalar DB'de olduğundan her worker aynı sıralamayı hesaplar; istekler
+    DB'ye gitmeden sadece dizi dilimi okur.
+
+    Args:
+        half_life_hours: Bir görüntülenmenin ağırlığının yarıya indiği süre
+        window_hours: Hesaba katılan (ve saklanan) kova penceresi
+        interval: Yeniden hesaplama aralığı (saniye)
+    """
+
+    def __init__(self, half_life_hours: float = 24.0, window_hours: int = 168, interval: float = 300.0):
+        self.half_life_hours = half_life_hours
+        self.window_hours = window_hours
+        self.interval = interval
+        self.engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+        self._compute_lock = threading.Lock()
+        self._rankings: Dict[str, Ranking] = {}
+        self.computed_at: Optional[datetime.datetime] = None
+        self.last_duration = 0.0
+        self.runs = 0
+        self.failures = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---------- Hesaplama ----------
+    def _load(self, conn, now: datetime.datetime):
+        """Pencere içindeki kovalar → {tür: (ids, yaşlar, görüntülenmeler)}."""
+        B = models.ContentViewBucket.__table__
+        since = now - datetime.timedelta(hours=self.window_hours)
+        hour = datetime.timedelta(hours=1)
+        data = {kind: ([], [], []) for kind in KINDS}
+
+        def add(kind, rows):
+            ids, ages, views = data[kind]
+            for series_id, bucket, count in rows:
+                ids.append(series_id)
+                # Kova ortası: saat başında yazılan kova yarım saat yaşında sayılır
+                ages.append(max((now - bucket - hour / 2) / hour, 0.0))
+                views.append(count)
+
+        add("webtoon", conn.execute(
+            select(B.c.content_id, B.c.bucket, B.c.views)
+            .where(B.c.content_type == "webtoon", B.c.bucket >= since)
+        ))
+        add("novel", conn.execute(
+            select(B.c.content_id, B.c.bucket, B.c.views)
+            .where(B.c.content_type == "novel", B.c.bucket >= since)
+        ))
+        chapters = models.NovelChapter.__table__
+        add("novel", conn.execute(
+            select(chapters.c.novel_id, B.c.bucket, B.c.views)
+            .join(chapters, chapters.c.id == B.c.content_id)
+            .where(B.c.content_type == "novel_chapter", B.c.bucket >= since)
+        ))
+        return data
+
+    def compute(self, engine: Optional[Engine] = None) -> dict:
+        """
+        Sıralamayı yeniden hesaplar ve pencere dışındaki kovaları siler.
+
+        Returns:
+            Tür başına sıralanan seri sayısı
+        """
+        if engine is None:
+            from database import engine as default_engine
+            engine = self.engine or default_engine
+        with self._compute_lock:
+            started = time.perf_counter()
+            now = datetime.datetime.utcnow()
+            per_kind: Dict[str, List[Tuple[Key, Item]]] = {}
+
+            with engine.begin() as conn:
+                data = self._load(conn, now)
+                for kind, (model, order) in KINDS.items():
+                    scores = decayed_scores(*data[kind], self.half_life_hours)
+                    # Yayındaki tüm seriler sıralamada: son pencerede okunmayanlar toplam view ile sona dizilir
+                    series = conn.execute(
+                        select(model.id, model.view_count).where(model.is_published == True)
+                    ).all()
+                    entries = []
+                    for series_id, view_count in series:
+                        score = round(scores.get(series_id, 0.0), 6)
+                        entries.append(((-score, -(view_count or 0), order, -series_id), (kind, series_id, score)))
+                    entries.sort()
+                    per_kind[kind] = entries
+
+                conn.execute(delete(models.ContentViewBucket.__table__).where(
+                    models.ContentViewBucket.__table__.c.bucket < now - datetime.timedelta(hours=self.window_hours + 1)
+                ))
+
+            rankings = {kind: Ranking(entries) for kind, entries in per_kind.items()}
+            rankings["all"] = Ranking(list(merge(*per_kind.values())))
+            with self._lock:
+                self._rankings = rankings
+                self.computed_at = now
+                self.runs += 1
+                self.last_duration = time.perf_counter() - started
+            return {kind: len(r) for kind, r in rankings.items()}
+
+    # ---------- Okuma ----------
+    def ranking(self, kind: str) -> Ranking:
+        """Tür ("webtoon", "novel", "all") sıralaması; hiç hesaplanmadıysa ilk istekte hesaplanır."""
+        with self._lock:
+            ranking = self._rankings.get(kind)
+        if ranking is None:
+            # Eşzamanlı ilk istekler tek hesaplamayı bekler
+            single_flight.do(("trending", "compute"), self.compute)
+            with self._lock:
+                ranking = self._rankings[kind]
+        return ranking
+
+    # ---------- Arka plan ----------
+    def start(self, engine: Engine):
+        self.engine = engine
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="trending-ranker", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                self.compute()
+            except Exception as e:
+                self.failures += 1
+                print(f"⚠️ Trending sıralaması hesaplanamadı: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": "trending",
+                "ranked": {kind: len(r) for kind, r in self._rankings.items()},
+                "computed_at": self.computed_at.isoformat() if self.computed_at else None,
+                "last_duration_ms": round(self.last_duration * 1000, 2),
+                "runs": self.runs,
+                "failures": self.failures,
+                "half_life_hours": self.half_life_hours,
+                "window_hours": self.window_hours,
+                "interval": self.interval,
+            }
+
+
+def trending_page(kind: str, cursor: Optional[str], limit: int, offset: int = 0) -> Tuple[List[Item], Optional[str]]:
+    """
+    Sıralamadan bir sayfa ve sonraki sayfanın opak cursor'ı.
+    Cursor son öğenin sıralama anahtarını taşır (keyset), sıralama yenilense de kaymaz.
+    """
+    after = None
+    if cursor:
+        value, last_id = decode_cursor(cursor, "trending")
+        try:
+            after = (float(value[0]), int(value[1]), int(value[2]), -last_id)
+        except (TypeError, ValueError, IndexError):
+            raise HTTPException(status_code=400, detail="Geçersiz cursor")
+    items, next_key = trending_ranker.ranking(kind).page(after, limit, offset)
+    if next_key is None:
+        return items, None
+    return items, encode_cursor("trending", list(next_key[:3]), -next_key[3])
+
+
+def trending_rows(query: Query, id_col, kind: str, cursor: Optional[str], limit: int, offset: int = 0):
+    """
+    Kart sorgusunu trending sırasıyla sayfalar: sadece sayfadaki id'ler DB'den okunur.
+
+    Returns:
+        (satırlar, sonraki cursor) — satırlar `paginate_keyset` ile aynı biçimde
+    """
+    items, next_cursor = trending_page(kind, cursor, limit, offset)
+    ids = [series_id for _, series_id, _ in items]
+    if not ids:
+        return [], next_cursor
+    by_id = {row.id: row for row in query.filter(id_col.in_(ids)).all()}
+    # Sıralama hesaplandıktan sonra yayından kaldırılanlar sayfadan düşer
+    return [by_id[i] for i in ids if i in by_id], next_cursor
+
+
+trending_ranker = TrendingRanker(
+    half_life_hours=float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24")),
+    window_hours=int(os.getenv("TRENDING_WINDOW_HOURS", "168")),
+    interval=float(os.getenv("TRENDING_INTERVAL", "300")),
+)
@@ -0,0 +1,185 @@
+import datetime
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import Integer, bindparam, column, func, table, update, values
+from sqlalchemy.engine import Engine
+
+
+# İçerik tipi -> view_count kolonu olan tablo
+CONTENT_TABLES = {
+    "webtoon": "webtoons",
+    "novel": "novels",
+    "episode": "webtoon_episodes",
+    "novel_chapter": "novel_chapters",
+}
+
+# Trending için saatlik kovaya da yazılan tipler (bölüm görüntülenmesi webtoon'a parent olarak zaten sayılır)
+BUCKET_TYPES = ("webtoon", "novel", "novel_chapter")
+
+
+class ViewCountAggregator:
+    """
+    Write-behind view sayacı.
+    Okuma endpoint'leri veritabanına yazmaz; artışlar bellekte (content_type, id)
+    bazında toplanır ve her `flush_interval` saniyede bir, tablo başına tek bir
+    set-based `UPDATE ... SET view_count = view_count + delta` ile yazılır.
+    """
+
+    def __init__(self, flush_interval: float = 10.0):
+        """
+        Args:
+            flush_interval: Bekleyen artışların veritabanına yazılma aralığı (saniye).
+        """
+        self.flush_interval = flush_interval
+        self.pending: Dict[Tuple[str, int], int] = {}  # {(content_type, content_id): delta}
+        self.lock = threading.Lock()
+        self.engine: Optional[Engine] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.flushed_rows = 0
+        self.failed_flushes = 0
+
+    def increment(self, content_type: str, content_id: int, delta: int = 1):
+        """
+        Bir içeriğin sayacını bellekte artırır (DB'ye dokunmaz).
+
+        Args:
+            content_type: "webtoon", "novel", "episode" veya "novel_chapter"
+            content_id: İçerik ID'si
+            delta: Artış miktarı
+        """
+        if content_type not in CONTENT_TABLES:
+            raise ValueError(f"Bilinmeyen içerik tipi: {content_type}")
+        key = (content_type, content_id)
+        with self.lock:
+            self.pending[key] = self.pending.get(key, 0) + delta
+
+    def pending_for(self, content_type: str, content_id: int) -> int:
+        """Henüz yazılmamış artış miktarını döndürür."""
+        with self.lock:
+            return self.pending.get((content_type, content_id), 0)
+
+    def flush(self) -> int:
+        """
+        Bekleyen artışları veritabanına yazar.
+
+        Returns:
+            Güncellenen satır sayısı (bekleyen yoksa veya engine yoksa 0)
+        """
+        if self.engine is None:
+            return 0
+
+        with self.lock:
+            if not self.pending:
+                return 0
+            batch, self.pending = self.pending, {}
+
+        by_table: Dict[str, list] = {}
+        for (content_type, content_id), delta in batch.items():
+            by_table.setdefault(CONTENT_TABLES[content_type], []).append((content_id, delta))
+
+        try:
+            with self.engine.begin() as conn:
+                for table_name, rows in by_table.items():
+                    self._apply(conn, table_name, rows)
+                self._record_buckets(conn, batch)
+        except Exception as e:
+            # Yazılamayan artışları kaybetme, bir sonraki turda tekrar dene
+            with self.lock:
+                for key, delta in batch.items():
+                    self.pending[key] = self.pending.get(key, 0) + delta
+            self.failed_flushes += 1
+            print(f"⚠️ View sayaçları yazılamadı, tekrar denenecek: {e}")
+            return 0
+
+        self.flushed_rows += len(batch)
+        return len(batch)
+
+    def _apply(self, conn, table_name: str, rows: list):
+        t = table(table_name, column("id", Integer), column("view_count", Integer))
+
+        if conn.dialect.name == "postgresql":
+            # Tek ifade: UPDATE t SET view_count = COALESCE(view_count, 0) + v.delta
+            #            FROM (VALUES ...) AS v(id, delta) WHERE t.id = v.id
+            v = values(column("id", Integer), column("delta", Integer), name="v").data(rows)
+            conn.execute(
+                update(t)
+                .values(view_count=func.coalesce(t.c.view_count, 0) + v.c.delta)
+                .where(t.c.id == v.c.id)
+            )
+        else:
+            # VALUES join desteklemeyen motorlar için executemany
+            conn.execute(
+                update(t)
+                .values(view_count=func.coalesce(t.c.view_count, 0) + bindparam("delta"))
+                .where(t.c.id == bindparam("row_id")),
+                [{"row_id": content_id, "delta": delta} for content_id, delta in rows],
+            )
+
+    def _record_buckets(self, conn, batch: Dict[Tuple[str, int], int]):
+        """Artışları (içerik, saat) kovalarına ekler; trending işi bu pencereyi okur."""
+        bucket = datetime.datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        rows = [
+            {"content_type": content_type, "content_id": content_id, "bucket": bucket, "views": delta}
+            for (content_type, content_id), delta in batch.items() if content_type in BUCKET_TYPES
+        ]
+        if not rows:
+            return
+        if conn.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif conn.dialect.name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            return
+
+        from models import ContentViewBucket
+        t = ContentViewBucket.__table__
+        stmt = insert(t)
+        conn.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[t.c.content_type, t.c.content_id, t.c.bucket],
+                set_={"views": t.c.views + stmt.excluded.views},
+            ),
+            rows,
+        )
+
+    def start(self, engine: Engine):
+        """Arka plan flush thread'ini başlatır."""
+        self.engine = engine
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="view-count-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Thread'i durdurur ve kalan artışları son kez yazar (shutdown)."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            pending = len(self.pending)
+        return {
+            "pending_keys": pending,
+            "flushed_rows": self.flushed_rows,
+            "failed_flushes": self.failed_flushes,
+            "flush_interval": self.flush_interval,
+        }
+
+
+# ==========================================
+# 🌐 GLOBAL INSTANCE
+# ==========================================
+view_counter = ViewCountAggregator(
+    flush_interval=float(os.getenv("VIEW_FLUSH_INTERVAL", "10"))
+)
@@ -0,0 +1,360 @@
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+try:
+    import redis
+except ImportError:  # Opsiyonel bağımlılık: sadece VIEW_TRACKER_MODE=redis için gerekli
+    redis = None
+
+
+class ViewStore(ABC):
+    """
+    Process dışı (paylaşımlı) view dedupe depolarının ortak arayüzü.
+    Tüm depolar duvar saati (time.time) kullanır ki kayıtlar process'ler ve
+    yeniden başlatmalar arasında anlamlı kalsın.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def check_and_set_many(self, keys: List[str], ttl: float) -> List[bool]:
+        """
+        Birden fazla key'i tek seferde kontrol eder ve yoksa TTL ile kaydeder.
+
+        Args:
+            keys: Dedupe key'leri
+            ttl: Kayıt süresi (saniye)
+
+        Returns:
+            Her key için True (yeni kaydedildi, sayılmalı) / False (zaten var)
+        """
+
+    def snapshot(self):
+        """Durumu kalıcı hale getirir (warm restart için). Varsayılan: gerek yok."""
+
+    def stats(self) -> dict:
+        return {"backend": self.name}
+
+    def close(self):
+        self.snapshot()
+
+
+# ==========================================
+# 1. REDIS (Çoklu container / çoklu sunucu)
+# ==========================================
+class RedisViewStore(ViewStore):
+    """
+    Redis protokolü üzerinden paylaşımlı dedupe.
+    Her key için `SET key 1 NX EX ttl`; bir batch tek pipeline round-trip'i ile gider.
+    Kalıcılık Redis'in kendi RDB/AOF ayarlarıyla sağlanır.
+    """
+
+    name = "redis"
+
+    def __init__(self, client=None, url: Optional[str] = None, prefix: str = "view:"):
+        """
+        Args:
+            client: redis-py uyumlu istemci (testlerde sahte istemci verilebilir)
+            url: İstemci verilmezse bağlanılacak adres, örn. redis://redis:6379/0
+            prefix: Key ön eki
+        """
+        if client is None:
+            if redis is None:
+                raise RuntimeError("Redis view store için 'redis' paketi kurulu olmalı (pip install redis)")
+            client = redis.Redis.from_url(url or "redis://localhost:6379/0")
+        self.client = client
+        self.prefix = prefix
+
+    def check_and_set_many(self, keys: List[str], ttl: float) -> List[bool]:
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.set(self.prefix + key, 1, nx=True, ex=max(1, int(ttl)))
+        return [bool(r) for r in pipe.execute()]
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "prefix": self.prefix}
+
+
+# ==========================================
+# 2. STAND-IN DEPOLAR (Test / Tek makine)
+# ==========================================
+class InMemoryViewStore(ViewStore):
+    """
+    Redis yerine geçen process içi depo (testler ve tek worker için).
+    `snapshot_path` verilirse durum JSON olarak yazılır ve açılışta geri yüklenir.
+    """
+
+    name = "memory"
+
+    def __init__(self, snapshot_path: Optional[str] = None):
+        self.snapshot_path = snapshot_path
+        self.lock = threading.Lock()
+        self.entries = {}  # {key: expires_at}
+        self._ops = 0
+
+        if snapshot_path and os.path.exists(snapshot_path):
+            now = time.time()
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                self.entries = {k: v for k, v in json.load(f).items() if v > now}
+
+    def check_and_set_many(self, keys: List[str], ttl: float) -> List[bool]:
+        now = time.time()
+        results = []
+        with self.lock:
+            for key in keys:
+                expires = self.entries.get(key)
+                if expires is not None and expires > now:
+                    results.append(False)
+                else:
+                    self.entries[key] = now + ttl
+                    results.append(True)
+
+            # Ara sıra süresi dolanları temizle
+            self._ops += len(keys)
+            if self._ops >= 10_000:
+                self._ops = 0
+                self.entries = {k: v for k, v in self.entries.items() if v > now}
+        return results
+
+    def snapshot(self):
+        if not self.snapshot_path:
+            return
+        with self.lock:
+            data = dict(self.entries)
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.snapshot_path)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"backend": self.name, "total_entries": len(self.entries)}
+
+
+class SQLiteViewStore(ViewStore):
+    """
+    Dosya tabanlı SQLite deposu. Aynı makinedeki worker'lar arasında paylaşılır
+    ve diskte durduğu için yeniden başlatmalarda durum korunur.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = "view_store.sqlite3"):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS views (key TEXT PRIMARY KEY, expires_at REAL NOT NULL)")
+        self._ops = 0
+
+    def check_and_set_many(self, keys: List[str], ttl: float) -> List[bool]:
+        now = time.time()
+        results = []
+        with self.lock:
+            cur = self.conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                for key in keys:
+                    # Yoksa ekle, süresi dolmuşsa yenile; aksi halde hiçbir satır değişmez
+                    cur.execute(
+                        "INSERT INTO views (key, expires_at) VALUES (?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET expires_at = excluded.expires_at "
+                        "WHERE views.expires_at <= ?",
+                        (key, now + ttl, now),
+                    )
+                    results.append(cur.rowcount > 0)
+
+                self._ops += len(keys)
+                if self._ops >= 10_000:
+                    self._ops = 0
+                    cur.execute("DELETE FROM views WHERE expires_at <= ?", (now,))
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+        return results
+
+    def stats(self) -> dict:
+        with self.lock:
+            total = self.conn.execute("SELECT COUNT(*) FROM views").fetchone()[0]
+        return {"backend": self.name, "path": self.path, "total_entries": total}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+# ==========================================
+# 3. PAYLAŞIMLI BELLEK (Tek makinede çoklu uvicorn worker)
+# ==========================================
+_SLOT = struct.Struct("<Qd")  # (key parmak izi, bitiş zamanı)
+
+
+class SharedMemoryViewStore(ViewStore):
+    """
+    Aynı makinedeki worker'ların ortak kullandığı sabit boyutlu hash tablosu.
+
+    Tablo `multiprocessing.shared_memory` segmentinde durur; her slot 16 byte
+    (8 byte key parmak izi + 8 byte bitiş zamanı). Slotlar şeritlere bölünür ve
+    her şerit, kilit dosyası üzerinde kendi byte aralığı ile (fcntl.lockf)
+    process'ler arası kilitlenir. Şerit dolarsa süresi en yakın kayıt atılır,
+    yani bellek asla büyümez. Kapanışta tablo `snapshot_path` dosyasına yazılır
+    ve segment yeniden oluşturulduğunda oradan yüklenir.
+    """
+
+    name = "shm"
+
+    def __init__(self, name: str = "kaos_views", slots: int = 1 << 20, stripes: int = 256,
+                 probe: int = 8, snapshot_path: Optional[str] = None, lock_path: Optional[str] = None):
+        """
+        Args:
+            name: Paylaşımlı bellek segmentinin adı (tüm worker'larda aynı olmalı)
+            slots: Toplam slot sayısı (bellek = slots * 16 byte)
+            stripes: Kilit şeridi sayısı
+            probe: Bir key için bakılan ardışık slot sayısı
+            snapshot_path: Warm restart için tablonun yazılacağı dosya
+            lock_path: Process'ler arası kilit dosyası
+        """
+        import fcntl
+        from multiprocessing import shared_memory
+
+        self._fcntl = fcntl
+        self.stripes = stripes
+        self.per_stripe = max(probe, slots // stripes)
+        self.slots = self.per_stripe * stripes
+        self.probe = probe
+        self.snapshot_path = snapshot_path
+        self.thread_lock = threading.Lock()  # fcntl kilitleri aynı process'in thread'lerini ayırmaz
+        self.lock_file = open(lock_path or f"/tmp/{name}.lock", "a+b")
+
+        size = self.slots * _SLOT.size
+        try:
+            self.shm = self._open_shm(shared_memory, name, create=True, size=size)
+            created = True
+        except FileExistsError:
+            self.shm = self._open_shm(shared_memory, name, create=False, size=size)
+            created = False
+        self.buf = self.shm.buf
+
+        if created and snapshot_path and os.path.exists(snapshot_path):
+            self._restore()
+
+    @staticmethod
+    def _open_shm(shared_memory, name: str, create: bool, size: int):
+        try:
+            # Python 3.13+: segmenti process çıkışında silme (diğer worker'lar kullanıyor)
+            return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+            return shm
+
+    def _lock(self, start: int = 0, length: int = 0):
+        self._fcntl.lockf(self.lock_file, self._fcntl.LOCK_EX, length, start)
+
+    def _unlock(self, start: int = 0, length: int = 0):
+        self._fcntl.lockf(self.lock_file, self._fcntl.LOCK_UN, length, start)
+
+    @staticmethod
+    def _fingerprint(key: str) -> int:
+        fp = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+        return fp or 1  # 0 = boş slot
+
+    def check_and_set_many(self, keys: List[str], ttl: float) -> List[bool]:
+        now = time.time()
+        results = [False] * len(keys)
+
+        # Aynı şeride düşen key'leri grupla, her şerit kilidini bir kez al
+        by_stripe = {}
+        for i, key in enumerate(keys):
+            fp = self._fingerprint(key)
+            by_stripe.setdefault(fp % self.stripes, []).append((i, fp))
+
+        buf = self.buf
+        with self.thread_lock:
+            for stripe, items in by_stripe.items():
+                base = stripe * self.per_stripe
+                self._lock(stripe, 1)
+                try:
+                    for i, fp in items:
+                        start = (fp >> 16) % self.per_stripe
+                        match = free = oldest = None
+                        for p in range(self.probe):
+                            offset = (base + (start + p) % self.per_stripe) * _SLOT.size
+                            slot_fp, expires = _SLOT.unpack_from(buf, offset)
+                            if slot_fp == fp:
+                                match = (offset, expires)
+                                break
+                            if free is None and (slot_fp == 0 or expires <= now):
+                                free = offset
+                            if oldest is None or expires < oldest[1]:
+                                oldest = (offset, expires)
+
+                        if match is not None:
+                            if match[1] > now:
+                                continue  # Yakın zamanda sayılmış
+                            target = match[0]
+                        else:
+                            # Şerit doluysa süresi en yakın kaydı at
+                            target = free if free is not None else oldest[0]
+
+                        _SLOT.pack_into(buf, target, fp, now + ttl)
+                        results[i] = True
+                finally:
+                    self._unlock(stripe, 1)
+        return results
+
+    def snapshot(self):
+        if not self.snapshot_path:
+            return
+        tmp = self.snapshot_path + ".tmp"
+        with self.thread_lock:
+            self._lock()
+            try:
+                data = bytes(self.buf)
+            finally:
+                self._unlock()
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self.snapshot_path)
+
+    def _restore(self):
+        with open(self.snapshot_path, "rb") as f:
+            data = f.read()
+        if len(data) != self.slots * _SLOT.size:
+            print("⚠️ View snapshot boyutu uyuşmuyor, yüklenmedi")
+            return
+        self._lock()
+        try:
+            self.buf[:len(data)] = data
+        finally:
+            self._unlock()
+
+    def stats(self) -> dict:
+        now = time.time()
+        live = 0
+        for offset in range(0, self.slots * _SLOT.size, _SLOT.size):
+            fp, expires = _SLOT.unpack_from(self.buf, offset)
+            if fp and expires > now:
+                live += 1
+        return {
+            "backend": self.name,
+            "total_entries": live,
+            "slots": self.slots,
+            "memory_bytes": self.slots * _SLOT.size,
+        }
+
+    def close(self):
+        self.snapshot()
+        self.buf = None
+        self.shm.close()
+        self.lock_file.close()
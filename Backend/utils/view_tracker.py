@@ -1,100 +1,491 @@
-from datetime import datetime, timedelta
+import hashlib
+import math
+import os
 import threading
-from typing import Tuple
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
 
+from utils.view_counter import ViewCountAggregator, view_counter
+from utils.view_store import (
+    InMemoryViewStore, RedisViewStore, SharedMemoryViewStore, SQLiteViewStore, ViewStore,
+)
 
-class ViewTracker:
+
+class _Stripe:
+    """
+    ViewTracker'ın tek bir kilit şeridi.
+    Kayıtlar, zaman dilimlerine (bucket) ayrılmış bir "time wheel" içinde tutulur;
+    süresi dolan dilimler bütün halinde silinir, tüm sözlük taranmaz.
+    """
+
+    __slots__ = ("lock", "views", "buckets", "oldest_bucket")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views: Dict[tuple, float] = {}        # {key: son sayılma zamanı (monotonic)}
+        self.buckets: Dict[int, List[tuple]] = {}  # {dilim no: o dilimde kaydedilen key'ler}
+        self.oldest_bucket: Optional[int] = None
+
+
+class BaseViewTracker(ABC):
+    """
+    View tracker'ların ortak arayüzü.
+    Alt sınıflar `should_count_view` ve `get_stats` metodlarını sağlar
+    (eksikse sınıf örneklenirken TypeError, istek sırasında değil).
+    """
+
+    counter: Optional[ViewCountAggregator] = None
+
+    @abstractmethod
+    def should_count_view(self, ip: str, content_type: str, content_id: int) -> bool:
+        ...
+
+    @abstractmethod
+    def get_stats(self) -> dict:
+        ...
+
+    def close(self):
+        """Kapanışta çağrılır (snapshot, bağlantı kapatma vb.)."""
+
+    def record_view(self, ip: str, content_type: str, content_id: int,
+                    parent: Optional[Tuple[str, int]] = None) -> bool:
+        """
+        View sayılacaksa artışı write-behind sayaca aktarır (DB'ye yazmaz).
+
+        Args:
+            ip: Kullanıcının IP adresi
+            content_type: İçerik tipi
+            content_id: İçerik ID'si
+            parent: Aynı view ile birlikte artırılacak üst içerik, örn. ("webtoon", 5)
+
+        Returns:
+            True: View sayıldı
+            False: View sayılmadı (yakın zamanda sayılmış)
+        """
+        if not self.should_count_view(ip, content_type, content_id):
+            return False
+
+        if self.counter is not None:
+            self.counter.increment(content_type, content_id)
+            if parent is not None:
+                self.counter.increment(*parent)
+        return True
+
+
+class ViewTracker(BaseViewTracker):
     """
     IP tabanlı view count rate limiting sistemi.
     Aynı IP'nin belirli bir süre içinde aynı içeriği tekrar izlemesini engeller.
+
+    Kayıtlar key hash'ine göre kilit şeritlerine (lock striping) dağıtılır ve
+    her şeritte zaman dilimli bir süre dolumu yapısında tutulur. Kontrol başına
+    maliyet, takip edilen toplam kayıt sayısından bağımsızdır (amortize O(1)).
     """
-    
-    def __init__(self, ttl_seconds: int = 3600):
+
+    def __init__(self, ttl_seconds: int = 3600, counter: Optional[ViewCountAggregator] = None,
+                 stripes: int = 64, buckets_per_ttl: int = 60,
+                 clock: Callable[[], float] = time.monotonic):
         """
         Args:
             ttl_seconds: View kaydının geçerli olacağı süre (saniye). Varsayılan 1 saat.
+            counter: Sayılan view'ların aktarılacağı write-behind sayaç (opsiyonel)
+            stripes: Kilit şeridi sayısı (2'nin kuvveti olmalı)
+            buckets_per_ttl: Bir TTL süresinin bölündüğü zaman dilimi sayısı
+            clock: Zaman kaynağı (monotonic saniye)
         """
+        if stripes <= 0 or stripes & (stripes - 1):
+            raise ValueError("stripes 2'nin kuvveti olmalı")
         self.ttl = ttl_seconds
-        self.views = {}  # {(ip, content_type, content_id): timestamp}
-        self.lock = threading.Lock()
-    
+        self.counter = counter
+        self.clock = clock
+        self.bucket_width = ttl_seconds / buckets_per_ttl
+        self._mask = stripes - 1
+        self._stripes = [_Stripe() for _ in range(stripes)]
+
     def should_count_view(self, ip: str, content_type: str, content_id: int) -> bool:
         """
         Belirtilen IP'nin bu içerik için view sayılıp sayılmayacağını kontrol eder.
-        
+
         Args:
             ip: Kullanıcının IP adresi
             content_type: İçerik tipi ("webtoon", "novel", "episode", "chapter")
             content_id: İçerik ID'si
-            
+
         Returns:
             True: View sayılmalı (ilk kez veya TTL süresi geçmiş)
             False: View sayılmamalı (yakın zamanda sayılmış)
         """
         key = (ip, content_type, content_id)
-        now = datetime.now()
-        
-        with self.lock:
-            # Önce eski kayıtları temizle (memory optimization)
-            self._cleanup_old_entries(now)
-            
+        stripe = self._stripes[hash(key) & self._mask]
+        now = self.clock()
+
+        with stripe.lock:
+            # Sadece süresi tamamen dolmuş dilimleri sil (memory optimization)
+            self._expire(stripe, now)
+
             # Bu IP bu içeriği son TTL süresi içinde izledi mi?
-            if key in self.views:
-                last_view = self.views[key]
-                elapsed = (now - last_view).total_seconds()
-                
-                if elapsed < self.ttl:
-                    # Süre dolmamış, sayma
-                    return False
-                else:
-                    # Süre dolmuş, kayıt güncelle
-                    self.views[key] = now
-                    return True
-            
-            # İlk kez izleniyor, kaydet ve say
-            self.views[key] = now
+            last_view = stripe.views.get(key)
+            if last_view is not None and now - last_view < self.ttl:
+                # Süre dolmamış, sayma
+                return False
+
+            # İlk kez izleniyor veya süre dolmuş, kaydet ve say
+            stripe.views[key] = now
+            bucket = int(now // self.bucket_width)
+            stripe.buckets.setdefault(bucket, []).append(key)
+            if stripe.oldest_bucket is None or bucket < stripe.oldest_bucket:
+                stripe.oldest_bucket = bucket
             return True
-    
-    def _cleanup_old_entries(self, now: datetime):
+
+    def _expire(self, stripe: _Stripe, now: float):
         """
-        TTL süresi geçmiş eski kayıtları siler (memory leak önleme).
-        
+        Tamamen TTL dışına düşmüş zaman dilimlerini siler (memory leak önleme).
+        Her key en fazla bir kez silindiği için toplam maliyet amortize O(1)'dir.
+
         Args:
-            now: Şu anki zaman
-        """
-        expired_keys = [
-            k for k, v in self.views.items()
-            if (now - v).total_seconds() > self.ttl
-        ]
-        
-        for k in expired_keys:
-            del self.views[k]
-    
+            stripe: Kilidi alınmış şerit
+            now: Şu anki monotonic zaman
+        """
+        if stripe.oldest_bucket is None:
+            return
+
+        # Bu dilimden önceki tüm dilimlerin bütün kayıtları TTL'i aşmıştır
+        cutoff = int((now - self.ttl) // self.bucket_width)
+        bucket = stripe.oldest_bucket
+        while stripe.buckets:
+            if bucket not in stripe.buckets:
+                # Boş dilimleri tek tek gezme (canlı dilim sayısı ~buckets_per_ttl)
+                bucket = min(stripe.buckets)
+            if bucket >= cutoff:
+                break
+            for k in stripe.buckets.pop(bucket):
+                last_view = stripe.views.get(k)
+                # Key daha sonra yenilendiyse başka bir dilimde yaşıyordur
+                if last_view is not None and int(last_view // self.bucket_width) == bucket:
+                    del stripe.views[k]
+            bucket += 1
+        stripe.oldest_bucket = bucket if stripe.buckets else None
+
     def get_stats(self) -> dict:
         """
         Debugging için istatistikler döndürür.
-        
+
         Returns:
             Dict containing: total_entries, content_types_breakdown
         """
+        total = 0
+        breakdown = {}
+        now = self.clock()
+        for stripe in self._stripes:
+            with stripe.lock:
+                self._expire(stripe, now)
+                total += len(stripe.views)
+                for (ip, content_type, content_id) in stripe.views:
+                    breakdown[content_type] = breakdown.get(content_type, 0) + 1
+
+        return {
+            "total_entries": total,
+            "content_types": breakdown,
+            "mode": "exact",
+            "ttl_seconds": self.ttl,
+            "stripes": len(self._stripes),
+        }
+
+
+class _BloomFilter:
+    """Sabit boyutlu bit dizisi üzerinde basit Bloom filtresi."""
+
+    __slots__ = ("bits", "size", "items")
+
+    def __init__(self, size_bits: int):
+        self.size = size_bits
+        self.bits = bytearray((size_bits + 7) // 8)
+        self.items = 0  # Eklenen (tahmini) farklı key sayısı
+
+    def contains(self, positions: List[int]) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in positions)
+
+    def add(self, positions: List[int]):
+        bits = self.bits
+        for p in positions:
+            bits[p >> 3] |= 1 << (p & 7)
+        self.items += 1
+
+
+class BloomViewTracker(BaseViewTracker):
+    """
+    Sabit bellekli, olasılıksal view dedupe modu.
+
+    TTL `windows` pencereye bölünür; yazılan filtreye ek olarak son `windows` pencerenin
+    filtreleri canlı tutulur, pencere dolunca en eski filtre atılıp başa boş filtre
+    açılır. Bir view [TTL, TTL + TTL / windows) süre tekrar sayılmaz. Bellek kullanımı
+    kayıt sayısından bağımsızdır (`memory_bytes`).
+
+    Yanlış pozitif durumunda gerçek bir view sayılmaz. Oranın hedefte kalması için
+    yazılan filtre `capacity` key'e ulaşınca pencere erken döndürülür: trafik
+    kapasiteyi aşarsa view'lar sessizce kaybolmak yerine TTL'den önce yeniden sayılabilir.
+    """
+
+    def __init__(self, ttl_seconds: int = 3600, counter: Optional[ViewCountAggregator] = None,
+                 memory_bytes: int = 16 * 1024 * 1024, false_positive_rate: float = 0.001,
+                 windows: int = 4, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ttl_seconds: View kaydının geçerli olacağı süre (saniye)
+            counter: Sayılan view'ların aktarılacağı write-behind sayaç (opsiyonel)
+            memory_bytes: Tüm filtrelerin toplam bellek bütçesi (byte)
+            false_positive_rate: Hedeflenen yanlış pozitif oranı (kapasite buna göre hesaplanır)
+            windows: TTL'in bölündüğü pencere sayısı (en az 1). Bir filtre ttl / windows
+                     saniye boyunca yazılır; aynı anda windows + 1 filtre tutulur.
+                     Arttıkça dedupe süresi TTL'e yaklaşır, filtre başına bellek azalır.
+            clock: Zaman kaynağı (monotonic saniye)
+        """
+        if windows < 1:
+            raise ValueError("windows en az 1 olmalı")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate 0 ile 1 arasında olmalı")
+
+        self.ttl = ttl_seconds
+        self.counter = counter
+        self.clock = clock
+        self.false_positive_rate = false_positive_rate
+        self.window_seconds = ttl_seconds / windows
+        self.filter_bits = max(64, (memory_bytes * 8) // (windows + 1))
+        # Her kontrol tüm canlı filtrelere bakar: toplam oran hedefte kalsın diye filtre başına payı
+        filter_rate = false_positive_rate / (windows + 1)
+        self.hashes = max(1, round(-math.log2(filter_rate)))
+        # Filtre başına oranı koruyarak sığabilecek key sayısı
+        self.capacity = max(1, int(self.filter_bits * (math.log(2) ** 2) / -math.log(filter_rate)))
+
+        self.lock = threading.Lock()
+        self._filters = [_BloomFilter(self.filter_bits) for _ in range(windows + 1)]
+        self._window = int(clock() // self.window_seconds)
+        self.early_rotations = 0
+
+    def _positions(self, ip: str, content_type: str, content_id: int) -> List[int]:
+        digest = hashlib.blake2b(f"{ip}|{content_type}|{content_id}".encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self.filter_bits
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def _shift(self):
+        # En eski filtreyi at, başa boş filtre koy
+        self._filters.pop()
+        self._filters.insert(0, _BloomFilter(self.filter_bits))
+
+    def _rotate(self, now: float):
+        window = int(now // self.window_seconds)
+        elapsed = window - self._window
+        if elapsed > 0:
+            for _ in range(min(elapsed, len(self._filters))):
+                self._shift()
+            self._window = window
+        if self._filters[0].items >= self.capacity:
+            # Kapasite aşılırsa yanlış pozitif oranı hedefin üstüne çıkar: pencereyi erken kapat
+            self._shift()
+            self.early_rotations += 1
+
+    def should_count_view(self, ip: str, content_type: str, content_id: int) -> bool:
+        """
+        Belirtilen IP'nin bu içerik için view sayılıp sayılmayacağını kontrol eder.
+
+        Returns:
+            True: View sayılmalı (hiçbir canlı filtrede yok)
+            False: View sayılmamalı (yakın zamanda sayılmış veya yanlış pozitif)
+        """
+        positions = self._positions(ip, content_type, content_id)
+        now = self.clock()
+
+        with self.lock:
+            self._rotate(now)
+            if any(f.contains(positions) for f in self._filters):
+                return False
+            self._filters[0].add(positions)
+            return True
+
+    def get_stats(self) -> dict:
+        """
+        Bellek kullanımı ve doluluk istatistikleri.
+
+        Returns:
+            Dict containing: memory_bytes, capacity, estimated_fp_rate (tüm filtreler), filters
+        """
         with self.lock:
-            total = len(self.views)
-            breakdown = {}
-            
-            for (ip, content_type, content_id), timestamp in self.views.items():
-                if content_type not in breakdown:
-                    breakdown[content_type] = 0
-                breakdown[content_type] += 1
-            
-            return {
-                "total_entries": total,
-                "content_types": breakdown,
-                "ttl_seconds": self.ttl
-            }
+            self._rotate(self.clock())
+            filters = []
+            for f in self._filters:
+                fill = 1 - math.exp(-self.hashes * f.items / f.size)
+                filters.append({
+                    "items": f.items,
+                    "estimated_fp_rate": round(fill ** self.hashes, 6),
+                })
+
+        return {
+            "mode": "bloom",
+            "total_entries": sum(f["items"] for f in filters),
+            "memory_bytes": sum(len(f.bits) for f in self._filters),
+            "capacity_per_window": self.capacity,
+            "target_fp_rate": self.false_positive_rate,
+            "estimated_fp_rate": round(1 - math.prod(1 - f["estimated_fp_rate"] for f in filters), 6),
+            "hash_functions": self.hashes,
+            "window_seconds": self.window_seconds,
+            "early_rotations": self.early_rotations,
+            "filters": filters,
+            "ttl_seconds": self.ttl,
+        }
+
+
+class _Waiter:
+    """StoreViewTracker'da sonucunu bekleyen tek bir dedupe kontrolü."""
+
+    __slots__ = ("key", "event", "result", "error", "lead")
+
+    def __init__(self, key: str):
+        self.key = key
+        self.event = threading.Event()
+        self.result: Optional[bool] = None
+        self.error: Optional[BaseException] = None
+        self.lead = False  # Uyandırılınca sıradaki batch'i bu thread gönderir
+
+
+class StoreViewTracker(BaseViewTracker):
+    """
+    Dedupe durumunu process dışında (Redis, paylaşımlı bellek, SQLite) tutan tracker.
+    Birden fazla uvicorn worker'ı / container aynı IP'yi tek kez sayar ve durum
+    yeniden başlatmalarda korunur.
+
+    Eşzamanlı kontroller tek `check_and_set_many` çağrısında birleştirilir: depoya
+    aynı anda tek batch gider, o round-trip sürerken gelen key'ler kuyrukta birikir
+    ve bir sonraki batch'i oluşturur (bekleyenlerden biri gönderir). Boşta ek gecikme
+    yoktur; yük altında round-trip sayısı istek sayısı yerine batch sayısı kadardır.
+    """
+
+    def __init__(self, store: ViewStore, ttl_seconds: int = 3600,
+                 counter: Optional[ViewCountAggregator] = None, max_batch: int = 512):
+        """
+        Args:
+            store: Paylaşımlı dedupe deposu
+            ttl_seconds: View kaydının geçerli olacağı süre (saniye)
+            counter: Sayılan view'ların aktarılacağı write-behind sayaç (opsiyonel)
+            max_batch: Tek çağrıda gönderilen en fazla key
+        """
+        self.store = store
+        self.ttl = ttl_seconds
+        self.counter = counter
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._pending: List[_Waiter] = []
+        self._flushing = False
+        self.batches = 0
+        self.batched_keys = 0
+        self.largest_batch = 0
+
+    @staticmethod
+    def _key(ip: str, content_type: str, content_id: int) -> str:
+        return f"{ip}|{content_type}|{content_id}"
+
+    def should_count_view(self, ip: str, content_type: str, content_id: int) -> bool:
+        waiter = _Waiter(self._key(ip, content_type, content_id))
+        with self._lock:
+            self._pending.append(waiter)
+            lead = not self._flushing
+            self._flushing = True
+
+        if not lead:
+            waiter.event.wait()
+            lead = waiter.lead
+        if lead:
+            # Kendi key'i bu batch'te (kuyruğa önceden girdi)
+            self._flush()
+
+        if waiter.error is not None:
+            raise waiter.error
+        return waiter.result
+
+    def _flush(self):
+        """Kuyruktaki key'leri tek çağrıda gönderir, sonra sırayı bekleyen bir sonraki thread'e devreder."""
+        with self._lock:
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            self.batches += 1
+            self.batched_keys += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+
+        try:
+            results = self.store.check_and_set_many([w.key for w in batch], self.ttl)
+            for waiter, result in zip(batch, results):
+                waiter.result = result
+        except Exception as e:
+            for waiter in batch:
+                waiter.error = e
+        for waiter in batch:
+            waiter.event.set()
+
+        with self._lock:
+            if self._pending:
+                # Her thread en fazla bir batch gönderir; sıradaki bekleyen devralır
+                nxt = self._pending[0]
+                nxt.lead = True
+                nxt.event.set()
+            else:
+                self._flushing = False
+
+    def get_stats(self) -> dict:
+        stats = self.store.stats()
+        with self._lock:
+            stats.update({
+                "mode": "store",
+                "ttl_seconds": self.ttl,
+                "batches": self.batches,
+                "avg_batch": round(self.batched_keys / self.batches, 2) if self.batches else None,
+                "largest_batch": self.largest_batch,
+            })
+        return stats
+
+    def close(self):
+        self.store.close()
+
+
+def build_view_tracker() -> BaseViewTracker:
+    """
+    VIEW_TRACKER_MODE ortam değişkenine göre tracker kurar:
+        exact  (varsayılan) : Process içi, kesin dedupe
+        bloom               : Process içi, sabit bellekli olasılıksal dedupe
+        redis               : REDIS_URL üzerinden paylaşımlı (çoklu container)
+        shm                 : Paylaşımlı bellek (tek makinede çoklu worker)
+        sqlite              : VIEW_TRACKER_SQLITE_PATH dosyası (tek makine)
+    """
+    mode = os.getenv("VIEW_TRACKER_MODE", "exact")
+    ttl = 3600  # 1 saat
+    snapshot_path = os.getenv("VIEW_TRACKER_SNAPSHOT")
+
+    if mode == "bloom":
+        return BloomViewTracker(
+            ttl_seconds=ttl,
+            counter=view_counter,
+            memory_bytes=int(float(os.getenv("VIEW_TRACKER_BLOOM_MB", "16")) * 1024 * 1024),
+            false_positive_rate=float(os.getenv("VIEW_TRACKER_BLOOM_FP_RATE", "0.001")),
+        )
+    if mode == "redis":
+        store = RedisViewStore(url=os.getenv("REDIS_URL"))
+    elif mode == "shm":
+        store = SharedMemoryViewStore(
+            slots=int(os.getenv("VIEW_TRACKER_SHM_SLOTS", str(1 << 20))),
+            snapshot_path=snapshot_path,
+        )
+    elif mode == "sqlite":
+        store = SQLiteViewStore(os.getenv("VIEW_TRACKER_SQLITE_PATH", "view_store.sqlite3"))
+    elif mode == "memory":
+        store = InMemoryViewStore(snapshot_path=snapshot_path)
+    else:
+        return ViewTracker(ttl_seconds=ttl, counter=view_counter)
+    return StoreViewTracker(store, ttl_seconds=ttl, counter=view_counter)
 
 
 # ==========================================
 # 🌐 GLOBAL INSTANCE
 # ==========================================
 # Uygulama genelinde tek bir instance kullanılır (singleton pattern)
-view_tracker = ViewTracker(ttl_seconds=3600)  # 1 saat
+view_tracker = build_view_tracker()
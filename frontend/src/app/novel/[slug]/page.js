@@ -1,6 +1,8 @@
 import Link from "next/link";
 import Image from "next/image";
 import FavoriteButton from "@/components/FavoriteButton";
+import ChapterCard from "@/components/ChapterCard";
+import ChapterGap from "@/components/ChapterGap";
 
 // --- 1. SEO AYARLARI (DİNAMİK METADATA) ---
 export async function generateMetadata({ params }) {
@@ -64,6 +66,14 @@ export default async function NovelDetail({ params }) {
     ? [...novel.chapters].sort((a, b) => a.chapter_number - b.chapter_number)[0]
     : null;
 
+  // Detay yanıtı ilk ve son bölümleri içerir; aradakiler ChapterGap ile istenince yüklenir
+  const sortedChapters = [...(novel.chapters || [])].sort((a, b) => b.chapter_number - a.chapter_number);
+  const chapterCount = novel.chapter_count ?? sortedChapters.length;
+  const missingChapters = chapterCount - sortedChapters.length;
+  const half = Math.ceil(sortedChapters.length / 2);
+  const newestChapters = missingChapters > 0 ? sortedChapters.slice(0, half) : sortedChapters;
+  const oldestChapters = missingChapters > 0 ? sortedChapters.slice(half) : [];
+
   return (
     <div className="min-h-screen bg-[#121212] pb-20 font-sans">
 
@@ -141,32 +151,26 @@ export default async function NovelDetail({ params }) {
             Bölüm Listesi
           </span>
           <span className="text-sm text-gray-400 bg-[#1e1e1e] px-3 py-1 rounded-full border border-gray-800">
-            {novel.chapters?.length || 0} Bölüm
+            {chapterCount} Bölüm
           </span>
         </h3>
 
         <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
-          {novel.chapters && novel.chapters.length > 0 ? (
+          {sortedChapters.length > 0 ? (
             // Bölümleri numaraya göre tersten sırala (En yeni en üstte)
-            [...novel.chapters].sort((a, b) => b.chapter_number - a.chapter_number).map((ch) => (
-              <Link
-                key={ch.id}
-                href={`/novel/${slug}/bolum/${ch.chapter_number}`}
-                title={`${ch.title || `Bölüm ${ch.chapter_number}`} Oku`}
-                className="bg-[#1e1e1e] p-5 rounded-2xl border border-gray-800 hover:border-purple-500/50 hover:bg-[#252525] transition-all flex items-center justify-between group"
-              >
-                <div className="flex items-center gap-4">
-                  <div className="w-12 h-12 bg-purple-900/20 rounded-xl flex items-center justify-center text-purple-400 font-bold group-hover:bg-purple-600 group-hover:text-white transition-all">
-                    {ch.chapter_number}
-                  </div>
-                  <div>
-                    <h4 className="font-bold text-gray-200 group-hover:text-white transition">{ch.title}</h4>
-                    <span className="text-sm text-gray-500 uppercase tracking-widest group-hover:text-purple-400">Okumak için tıkla</span>
-                  </div>
-                </div>
-                <div className="text-gray-600 group-hover:text-purple-500 transition">➜</div>
-              </Link>
-            ))
+            <>
+              {newestChapters.map((ch) => <ChapterCard key={ch.id} type="novel" slug={slug} item={ch} />)}
+              {missingChapters > 0 && (
+                <ChapterGap
+                  type="novel"
+                  slug={slug}
+                  before={newestChapters[newestChapters.length - 1].chapter_number}
+                  stopAt={oldestChapters[0].chapter_number}
+                  missing={missingChapters}
+                />
+              )}
+              {oldestChapters.map((ch) => <ChapterCard key={ch.id} type="novel" slug={slug} item={ch} />)}
+            </>
           ) : (
             <div className="col-span-full text-center py-10 bg-[#1e1e1e] rounded-xl border border-dashed border-gray-800 text-gray-500">
               Henüz bölüm yüklenmemiş. Bot çalışıyor mu? 🤖
@@ -86,7 +86,7 @@ export default function SerilerPage() {
                   </Link>
                   <div className="flex items-center gap-2 mt-1">
                     <span className="text-sm text-gray-500 bg-[#1e1e1e] border border-gray-800 px-1.5 py-0.5 rounded">
-                      {(w.episodes?.length || 0)} Bölüm
+                      {(w.episode_count ?? w.episodes?.length ?? 0)} Bölüm
                     </span>
                     <span className="text-sm text-gray-500">👁️ {w.view_count || 0}</span>
                   </div>
@@ -4,6 +4,8 @@ import { useEffect, useState } from "react";
 import { useParams } from "next/navigation";
 import Link from "next/link";
 import FavoriteButton from "@/components/FavoriteButton"; // ✅ Button import edildi
+import ChapterCard from "@/components/ChapterCard";
+import ChapterGap from "@/components/ChapterGap";
 
 export default function WebtoonDetail() {
   const params = useParams();
@@ -40,6 +42,14 @@ export default function WebtoonDetail() {
     ? [...webtoon.episodes].sort((a, b) => a.episode_number - b.episode_number)[0]
     : null;
 
+  // Detay yanıtı ilk ve son bölümleri içerir; aradakiler ChapterGap ile istenince yüklenir
+  const sortedEpisodes = [...(webtoon.episodes || [])].sort((a, b) => b.episode_number - a.episode_number);
+  const episodeCount = webtoon.episode_count ?? sortedEpisodes.length;
+  const missingEpisodes = episodeCount - sortedEpisodes.length;
+  const half = Math.ceil(sortedEpisodes.length / 2);
+  const newestEpisodes = missingEpisodes > 0 ? sortedEpisodes.slice(0, half) : sortedEpisodes;
+  const oldestEpisodes = missingEpisodes > 0 ? sortedEpisodes.slice(half) : [];
+
   return (
     <div className="min-h-screen bg-[#121212] pb-20 font-sans">
 
@@ -114,40 +124,26 @@ export default function WebtoonDetail() {
             Bölümler
           </span>
           <span className="text-sm font-medium text-gray-400 bg-[#1e1e1e] px-3 py-1 rounded border border-gray-800">
-            {webtoon.episodes?.length || 0} Bölüm
+            {episodeCount} Bölüm
           </span>
         </h3>
 
         <div className="flex flex-col gap-3">
-          {webtoon.episodes && webtoon.episodes.length > 0 ? (
+          {sortedEpisodes.length > 0 ? (
             // Veritabanındaki bölümleri listele (Ters sıralı: En yeni en üstte)
-            [...webtoon.episodes].sort((a, b) => b.episode_number - a.episode_number).map((ep) => (
-              <Link
-                key={ep.id}
-                href={`/webtoon/${id}/bolum/${ep.id}`}
-                title={`${ep.title || `Bölüm ${ep.episode_number}`} Oku`}
-                className="bg-[#1e1e1e] p-4 rounded-xl border border-gray-800 hover:border-blue-500/50 hover:bg-[#252525] transition flex items-center justify-between group shadow-sm"
-              >
-                <div className="flex items-center gap-5">
-                  <div className="w-14 h-14 bg-[#121212] rounded-lg border border-gray-800 flex items-center justify-center text-gray-400 font-bold text-lg group-hover:text-blue-500 group-hover:border-blue-500/30 transition">
-                    #{ep.episode_number}
-                  </div>
-
-                  <div>
-                    <h4 className="font-bold text-gray-200 text-lg group-hover:text-blue-400 transition">
-                      {ep.title}
-                    </h4>
-                    <span className="text-sm text-gray-500 flex items-center gap-1 mt-1">
-                      📅 {new Date(ep.created_at).toLocaleDateString("tr-TR")}
-                    </span>
-                  </div>
-                </div>
-
-                <div className="text-gray-500 group-hover:text-blue-500 font-medium text-sm flex items-center gap-2 transition px-4 py-2 rounded bg-[#121212] border border-gray-800 group-hover:border-blue-500/30">
-                  Oku <span className="text-lg leading-none">→</span>
-                </div>
-              </Link>
-            ))
+            <>
+              {newestEpisodes.map((ep) => <ChapterCard key={ep.id} type="webtoon" slug={id} item={ep} />)}
+              {missingEpisodes > 0 && (
+                <ChapterGap
+                  type="webtoon"
+                  slug={id}
+                  before={newestEpisodes[newestEpisodes.length - 1].episode_number}
+                  stopAt={oldestEpisodes[0].episode_number}
+                  missing={missingEpisodes}
+                />
+              )}
+              {oldestEpisodes.map((ep) => <ChapterCard key={ep.id} type="webtoon" slug={id} item={ep} />)}
+            </>
           ) : (
             <div className="text-center py-20 bg-[#1e1e1e] rounded-xl border border-dashed border-gray-800 text-gray-500">
               <span className="text-4xl block mb-2">🕸️</span>
@@ -0,0 +1,52 @@
+import Link from "next/link";
+
+// Detay sayfalarındaki ve ChapterGap'teki bölüm kartı (roman: mor kart, webtoon: tarihli mavi satır)
+export default function ChapterCard({ type, slug, item }) {
+  if (type === "novel") {
+    return (
+      <Link
+        href={`/novel/${slug}/bolum/${item.chapter_number}`}
+        title={`${item.title || `Bölüm ${item.chapter_number}`} Oku`}
+        className="bg-[#1e1e1e] p-5 rounded-2xl border border-gray-800 hover:border-purple-500/50 hover:bg-[#252525] transition-all flex items-center justify-between group"
+      >
+        <div className="flex items-center gap-4">
+          <div className="w-12 h-12 bg-purple-900/20 rounded-xl flex items-center justify-center text-purple-400 font-bold group-hover:bg-purple-600 group-hover:text-white transition-all">
+            {item.chapter_number}
+          </div>
+          <div>
+            <h4 className="font-bold text-gray-200 group-hover:text-white transition">{item.title}</h4>
+            <span className="text-sm text-gray-500 uppercase tracking-widest group-hover:text-purple-400">Okumak için tıkla</span>
+          </div>
+        </div>
+        <div className="text-gray-600 group-hover:text-purple-500 transition">➜</div>
+      </Link>
+    );
+  }
+
+  return (
+    <Link
+      href={`/webtoon/${slug}/bolum/${item.id}`}
+      title={`${item.title || `Bölüm ${item.episode_number}`} Oku`}
+      className="bg-[#1e1e1e] p-4 rounded-xl border border-gray-800 hover:border-blue-500/50 hover:bg-[#252525] transition flex items-center justify-between group shadow-sm"
+    >
+      <div className="flex items-center gap-5">
+        <div className="w-14 h-14 bg-[#121212] rounded-lg border border-gray-800 flex items-center justify-center text-gray-400 font-bold text-lg group-hover:text-blue-500 group-hover:border-blue-500/30 transition">
+          #{item.episode_number}
+        </div>
+
+        <div>
+          <h4 className="font-bold text-gray-200 text-lg group-hover:text-blue-400 transition">
+            {item.title}
+          </h4>
+          <span className="text-sm text-gray-500 flex items-center gap-1 mt-1">
+            📅 {new Date(item.created_at).toLocaleDateString("tr-TR")}
+          </span>
+        </div>
+      </div>
+
+      <div className="text-gray-500 group-hover:text-blue-500 font-medium text-sm flex items-center gap-2 transition px-4 py-2 rounded bg-[#121212] border border-gray-800 group-hover:border-blue-500/30">
+        Oku <span className="text-lg leading-none">→</span>
+      </div>
+    </Link>
+  );
+}
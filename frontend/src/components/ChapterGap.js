@@ -0,0 +1,57 @@
+"use client";
+
+import { useState } from "react";
+import ChapterCard from "@/components/ChapterCard";
+import { API } from "@/api";
+
+// Detay yanıtı sadece ilk ve son bölümleri içerir.
+// Aradaki bölümler sayfalı bölüm listesinden (before cursor ile) istenince çekilir.
+export default function ChapterGap({ type, slug, before, stopAt, missing }) {
+  const [items, setItems] = useState([]);
+  const [cursor, setCursor] = useState(before);
+  const [loading, setLoading] = useState(false);
+  const [done, setDone] = useState(false);
+
+  const isNovel = type === "novel";
+  const numberKey = isNovel ? "chapter_number" : "episode_number";
+  const path = isNovel ? `novels/${slug}/chapters` : `webtoons/${slug}/episodes`;
+
+  const loadMore = async () => {
+    setLoading(true);
+    try {
+      const res = await fetch(`${API}/${path}?order=desc&limit=100&before=${cursor}`);
+      const page = await res.json();
+      const fresh = (page.items || []).filter((it) => it[numberKey] > stopAt);
+      setItems((prev) => [...prev, ...fresh]);
+      const next = page.cursors?.before;
+      if (next == null || next <= stopAt || fresh.length < (page.items || []).length) {
+        setDone(true);
+      } else {
+        setCursor(next);
+      }
+    } catch (err) {
+      console.error("Bölümler yüklenemedi:", err);
+    }
+    setLoading(false);
+  };
+
+  const remaining = missing - items.length;
+
+  return (
+    <>
+      {items.map((it) => (
+        <ChapterCard key={it.id} type={type} slug={slug} item={it} />
+      ))}
+
+      {!done && remaining > 0 && (
+        <button
+          onClick={loadMore}
+          disabled={loading}
+          className="col-span-full py-3 rounded-xl border border-dashed border-gray-700 text-gray-400 hover:text-white hover:border-gray-500 transition"
+        >
+          {loading ? "Yükleniyor..." : `${remaining} bölüm daha göster`}
+        </button>
+      )}
+    </>
+  );
+}